@@ -0,0 +1,280 @@
+# benchmarks/gui_flood.py
+# 결과가 빠르게 쏟아질 때 ContactMappingApp 화면이 얼마나 버티는지 재는 벤치마크
+#
+# 실행: python benchmarks/gui_flood.py [--rates 10,100,1000] [--seconds 5] [--output 결과.json]
+#   화면이 없는 서버에서는 Xvfb가 있으면 자동으로 띄워서 돌려요
+#
+# 실제 process_addresses를 그대로 돌리고, 검색만 가짜 제공자(FloodProvider)가
+# 정해진 속도(초당 N행)로 결과를 흘려보내요. 잰 값:
+# - 이벤트 루프 지연: 10ms마다 예약한 심장박동이 실제로 얼마나 늦게 실행됐는지 (p50/p95/최대)
+# - 놓친 프레임: 심장박동이 늦은 만큼 60fps(16.7ms) 프레임을 몇 개 놓쳤는지
+# - 그리는 데 걸린 시간: 결과가 나온 순간 → 결과 표에 행이 들어간 순간 (p50/p95), 마지막 행까지 밀린 시간
+# - 메모리 증가: 프로세스 RSS, 결과 표 행 수, 로그 줄 수
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HEARTBEAT_MS = 10
+FRAME_MS = 1000 / 60
+
+
+def get_percentile(values, percentile):
+    """정렬해서 백분위 값 (없으면 0)"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile))]
+
+
+def get_rss_mb():
+    """지금 프로세스 메모리 (MB, 리눅스 /proc 기준, 못 읽으면 0)"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def ensure_display():
+    """DISPLAY가 없으면 Xvfb 띄우기 (띄운 프로세스 반환, 필요 없으면 None)"""
+    if os.environ.get("DISPLAY") or sys.platform.startswith("win") or sys.platform == "darwin":
+        return None
+
+    if not shutil.which("Xvfb"):
+        print("❌ 화면(DISPLAY)이 없고 Xvfb도 없어요. xvfb를 설치하거나 xvfb-run 으로 실행해주세요")
+        sys.exit(1)
+
+    display = ":97"
+    process = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x800x24"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    time.sleep(1)
+    print(f"🖥️ Xvfb {display} 에서 실행해요")
+    return process
+
+
+def make_rows(count):
+    """가짜 주소 데이터 (load_addresses가 만드는 것과 같은 모양)"""
+    return [
+        {
+            'id': i,
+            'city': "부산광역시",
+            'district': "동래구",
+            'dong': "온천동",
+            'street_number': f"{i}-1",
+            'additional_info': "",
+            'address': f"부산광역시 동래구 온천동 {i}-1",
+            'status': '대기중',
+            'place_name': None,
+            'phone': None,
+            'category': None,
+            'error': None,
+            'address_note': "",
+            'invalid_address': False
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+class FloodProvider:
+    """
+    정해진 속도로 결과를 내보내는 가짜 검색 제공자
+    GatewayClient.run과 같은 모양이라 process_addresses가 그대로 호출해요
+    """
+
+    def __init__(self, rate, error_every=10):
+        self.rate = rate
+        self.error_every = error_every  # 이 간격마다 한 번은 실패 결과
+        self.emitted_at = {}  # 행 id → 결과를 내보낸 시각
+        self.finished_at = None
+
+    def run(self, address_data, on_success=None, on_error=None, on_progress=None,
+            should_stop=None):
+        stats = {'processed': 0, 'success': 0, 'error': 0, 'retried': 0, 'skipped': 0,
+                 'duplicates': 0, 'invalid': 0, 'paused': None, 'cached': 0}
+        started = time.perf_counter()
+
+        for index, addr in enumerate(address_data):
+            if should_stop and should_stop():
+                break
+
+            # 초당 rate행 속도 맞추기 (밀렸으면 쉬지 않고 따라잡기)
+            delay = started + index / self.rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            self.emitted_at[addr['id']] = time.perf_counter()
+            if self.error_every and index % self.error_every == self.error_every - 1:
+                addr['status'] = '실패'
+                addr['error'] = "전화번호를 찾을 수 없어요"
+                stats['error'] += 1
+                if on_error:
+                    on_error(index, addr, addr['error'])
+            else:
+                contact_info = {'place_name': f"가게 {addr['id']}", 'phone': "051-000-0000",
+                                'category': "음식점", 'confidence_label': "높음"}
+                addr.update(place_name=contact_info['place_name'], phone=contact_info['phone'],
+                            category=contact_info['category'], status='성공')
+                stats['success'] += 1
+                if on_success:
+                    on_success(index, addr, contact_info)
+
+            stats['processed'] += 1
+            if on_progress:
+                on_progress(stats['processed'], stats['success'], stats['error'])
+
+        self.finished_at = time.perf_counter()
+        return stats
+
+
+def run_flood(rate, seconds):
+    """한 속도로 한 번 돌리고 측정값 dict 반환"""
+    import tkinter as tk
+    from gui import contact_window
+    from gui.contact_window import ContactMappingApp
+
+    # 완료 알림 창이 벤치마크를 멈추지 않게
+    contact_window.messagebox.showinfo = lambda *args, **kwargs: None
+
+    root = tk.Tk()
+    app = ContactMappingApp(root)
+    root.update()
+
+    rows = make_rows(int(rate * seconds))
+    provider = FloodProvider(rate)
+    rendered_at = {}
+
+    # 결과 표에 행이 들어간 시각 기록 (원래 메서드는 그대로 실행)
+    original_success = app.update_result_success
+    original_error = app.update_result_error
+
+    def timed_success(addr_id, *args):
+        original_success(addr_id, *args)
+        rendered_at[addr_id] = time.perf_counter()
+
+    def timed_error(addr_id, *args):
+        original_error(addr_id, *args)
+        rendered_at[addr_id] = time.perf_counter()
+
+    app.update_result_success = timed_success
+    app.update_result_error = timed_error
+
+    lags = []
+    state = {'expected': None, 'running': True, 'done': False}
+
+    def heartbeat():
+        now = time.perf_counter()
+        if state['expected'] is not None:
+            lags.append(max(0.0, (now - state['expected']) * 1000))
+        state['expected'] = now + HEARTBEAT_MS / 1000
+        if state['running']:
+            root.after(HEARTBEAT_MS, heartbeat)
+
+    original_completed = app.mapping_completed
+
+    def completed(success, error):
+        original_completed(success, error)
+        state['done'] = True
+
+    app.mapping_completed = completed
+
+    rss_before = get_rss_mb()
+    app.address_data = rows
+    app.rows_to_process = rows
+    app.gateway_client = provider
+    app.is_processing = True
+    app.update_button_states()
+
+    started = time.perf_counter()
+    heartbeat()
+    threading.Thread(target=app.process_addresses, daemon=True).start()
+
+    # mainloop 대신 직접 돌려서 끝나면 빠져나오기 (너무 밀리면 시간 제한)
+    deadline = started + seconds * 20 + 30
+    while not state['done'] and time.perf_counter() < deadline:
+        root.update()
+        time.sleep(0.001)
+    finished = time.perf_counter()
+    state['running'] = False
+
+    render_delays = [(rendered_at[row_id] - emitted) * 1000
+                     for row_id, emitted in provider.emitted_at.items() if row_id in rendered_at]
+    tree_rows = len(app.result_tree.get_children())
+    log_lines = int(app.log_text.index("end-1c").split(".")[0])
+    rss_after = get_rss_mb()
+
+    result = {
+        'rate': rate,
+        'rows': len(rows),
+        'rendered': len(rendered_at),
+        'completed': state['done'],
+        'lag_p50_ms': round(get_percentile(lags, 0.5), 1),
+        'lag_p95_ms': round(get_percentile(lags, 0.95), 1),
+        'lag_max_ms': round(max(lags, default=0.0), 1),
+        'dropped_frames': int(sum(lag // FRAME_MS for lag in lags)),
+        'render_p50_ms': round(get_percentile(render_delays, 0.5), 1),
+        'render_p95_ms': round(get_percentile(render_delays, 0.95), 1),
+        # 제공자가 다 내보낸 뒤 화면이 따라잡는 데 걸린 시간
+        'drain_s': round(finished - (provider.finished_at or finished), 2),
+        'total_s': round(finished - started, 2),
+        'rss_growth_mb': round(rss_after - rss_before, 1),
+        'tree_rows': tree_rows,
+        'log_lines': log_lines
+    }
+
+    root.destroy()
+    return result
+
+
+def print_table(results):
+    """결과 표 출력"""
+    columns = ['rate', 'rows', 'lag_p50_ms', 'lag_p95_ms', 'lag_max_ms', 'dropped_frames',
+               'render_p50_ms', 'render_p95_ms', 'drain_s', 'rss_growth_mb', 'tree_rows', 'log_lines']
+    print("\n" + " | ".join(f"{column:>13}" for column in columns))
+    for result in results:
+        print(" | ".join(f"{result[column]:>13}" for column in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI 결과 폭주 벤치마크")
+    parser.add_argument('--rates', default="10,100,1000", help="초당 행 수 (쉼표로 여러 개)")
+    parser.add_argument('--seconds', type=float, default=5, help="속도마다 결과를 내보내는 시간 (초)")
+    parser.add_argument('--output', help="측정값을 JSON으로 저장할 경로 (UI 변경 전후 비교용)")
+    args = parser.parse_args()
+
+    xvfb = ensure_display()
+
+    # 벤치마크가 실제 data 폴더(기록 저장소, 통계 등)를 건드리지 않게
+    from utils import data_paths
+    data_paths.DATA_DIR = tempfile.mkdtemp(prefix="gui_flood_")
+
+    results = []
+    try:
+        for rate in [int(value) for value in args.rates.split(",") if value.strip()]:
+            print(f"🌊 초당 {rate}행으로 {args.seconds:g}초 동안 결과 보내는 중...")
+            results.append(run_flood(rate, args.seconds))
+    finally:
+        shutil.rmtree(data_paths.DATA_DIR, ignore_errors=True)
+        if xvfb:
+            xvfb.terminate()
+
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=1)
+        print(f"💾 측정값 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
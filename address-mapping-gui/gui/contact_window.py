@@ -5,6 +5,7 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
 import os
+import sqlite3
 import sys
 from datetime import datetime
 
@@ -13,8 +14,22 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
-from utils.excel_handler import ExcelHandler
+from utils.excel_handler import ExcelHandler, OperationCancelledError
 from utils.kakao_api import KakaoAPI
+from utils.lookup_scheduler import LookupScheduler, NegativeResultStore
+from utils.keyword_stats import KeywordStats
+from utils.quota import UsageLedger, QuotaPlanner
+from utils.offline_geocoder import OfflineGeocoder, normalize_address_key
+from utils.batch_loader import BatchJob
+from utils.results_store import ResultsStore
+from utils.profiler import SamplingProfiler
+from utils.hedging import HedgedRequester
+from utils.gateway_client import GatewayClient
+from utils.verification import MatchVerifier
+from utils.spatial_clustering import ClusterPlanner
+from utils.response_archive import ResponseArchive
+from utils.prefetch import Prefetcher, PREFETCH_BUDGET
+from utils.row_priority import HitEstimator, TimeBox
 
 class ContactMappingApp:
     """연락처 매핑 애플리케이션"""
@@ -28,8 +43,19 @@ class ContactMappingApp:
         # 필요한 객체들
         self.excel_handler = ExcelHandler()
         self.kakao_api = None
+        self.negative_store = NegativeResultStore()
+        self.keyword_stats = KeywordStats()
+        self.usage_ledger = UsageLedger()
+        self.geocoder = OfflineGeocoder.open_if_exists()
+        self.batch_job = None  # 폴더 일괄 모드일 때만 사용
+        self.results_store = ResultsStore()
+        self.response_archive = ResponseArchive()  # API 원본 응답 보관 (python main.py --rematch 로 재매칭)
+        self.rows_to_process = []
         self.address_data = []
         self.is_processing = False
+        self.is_file_busy = False  # 파일 읽기/저장 중
+        self.file_cancel_event = None
+        self.stop_event = threading.Event()  # 매핑 중단 요청
         
         print("🚀 연락처 매핑 GUI가 준비되었어요!")
     
@@ -52,6 +78,24 @@ class ContactMappingApp:
         self.success_count_var = tk.StringVar(value="0")
         self.error_count_var = tk.StringVar(value="0")
         self.progress_var = tk.IntVar()
+        self.use_history_var = tk.BooleanVar(value=True)
+        self.profile_var = tk.BooleanVar(value=False)
+        self.hedge_var = tk.BooleanVar(value=False)
+        self.hedger = None
+        self.prefetch_var = tk.BooleanVar(value=False)
+        self.prefetcher = None
+        self.use_gateway_var = tk.BooleanVar(value=False)
+        self.use_clusters_var = tk.BooleanVar(value=False)
+        self.prioritize_var = tk.BooleanVar(value=False)
+        self.deadline_minutes_var = tk.StringVar()
+        self.call_budget_var = tk.StringVar()
+        self.time_box = None  # 마감 시간/호출 예산이 있을 때만
+        self.use_clusters = False  # 검색 스레드용 (start_mapping에서 체크박스 값을 옮겨둠)
+        self.baseline_diff = None  # 지난 결과 파일과 비교했을 때만
+        self.gateway_client = None  # 게이트웨이 모드로 실행 중일 때만
+        self.profiler = None
+        self.history_query_var = tk.StringVar()
+        self.quick_query_var = tk.StringVar()
     
     def setup_ui(self):
         """화면 구성"""
@@ -88,7 +132,14 @@ class ContactMappingApp:
         file_section.pack(fill="x", pady=(0, 10))
         
         ttk.Entry(file_section, textvariable=self.file_path_var, state="readonly").pack(fill="x", pady=(0, 5))
-        ttk.Button(file_section, text="파일 선택", command=self.select_file).pack()
+        self.file_buttons = [
+            ttk.Button(file_section, text="파일 선택", command=self.select_file),
+            ttk.Button(file_section, text="폴더 일괄 선택", command=self.select_folder),
+            ttk.Button(file_section, text="지난 결과와 비교 (바뀐 행만 검색)", command=self.select_baseline),
+            ttk.Button(file_section, text="주소 좌표 DB 가져오기", command=self.import_geocoder_file)
+        ]
+        for i, button in enumerate(self.file_buttons):
+            button.pack(pady=(5 if i else 0, 0))
         
         # 2. API 키 섹션
         api_section = ttk.LabelFrame(control_frame, text="🔑 카카오 API 키", padding="10")
@@ -96,6 +147,8 @@ class ContactMappingApp:
         
         ttk.Label(api_section, text="⚠️ 카카오 개발자센터에서 REST API 키 발급", 
                  foreground="orange").pack(pady=(0, 5))
+        ttk.Label(api_section, text="(키가 여러 개면 쉼표로 구분 - 한도가 차면 자동 교체)", 
+                 foreground="gray").pack(pady=(0, 5))
         ttk.Entry(api_section, textvariable=self.api_key_var, show="*").pack(fill="x", pady=(0, 5))
         ttk.Button(api_section, text="API 연결", command=self.connect_api).pack()
         
@@ -131,13 +184,42 @@ class ContactMappingApp:
         action_section = ttk.LabelFrame(control_frame, text="🚀 실행", padding="10")
         action_section.pack(fill="x")
         
+        ttk.Checkbutton(action_section, text="이전 기록에 있는 주소는 검색 안 함", 
+                       variable=self.use_history_var).pack(anchor="w", pady=(0, 5))
+        ttk.Checkbutton(action_section, text="성능 분석 (파일 선택 → 저장까지 기록)", 
+                       variable=self.profile_var, command=self.toggle_profiling).pack(anchor="w", pady=(0, 5))
+        ttk.Checkbutton(action_section, text="느린 응답엔 중복 요청 (헤징)", 
+                       variable=self.hedge_var, command=self.toggle_hedging).pack(anchor="w", pady=(0, 5))
+        ttk.Checkbutton(action_section, text=f"시작 전에 좌표 미리 구하기 (최대 {PREFETCH_BUDGET}번 호출)", 
+                       variable=self.prefetch_var, command=self.maybe_start_prefetch).pack(anchor="w", pady=(0, 5))
+        ttk.Checkbutton(action_section, text="가까운 주소는 묶어서 근처 검색", 
+                       variable=self.use_clusters_var).pack(anchor="w", pady=(0, 5))
+        ttk.Checkbutton(action_section, text="찾을 가능성 높은 주소부터 (시간/호출 제한)", 
+                       variable=self.prioritize_var).pack(anchor="w", pady=(0, 2))
+        limit_frame = ttk.Frame(action_section)
+        limit_frame.pack(fill="x", pady=(0, 5))
+        ttk.Label(limit_frame, text="제한 시간(분)").pack(side="left")
+        ttk.Entry(limit_frame, textvariable=self.deadline_minutes_var, width=5).pack(side="left", padx=(2, 8))
+        ttk.Label(limit_frame, text="호출 예산").pack(side="left")
+        ttk.Entry(limit_frame, textvariable=self.call_budget_var, width=7).pack(side="left", padx=(2, 0))
+        ttk.Checkbutton(action_section, text="로컬 게이트웨이로 검색 (main.py --gateway)", 
+                       variable=self.use_gateway_var, command=self.update_button_states).pack(anchor="w", pady=(0, 5))
+        
+        self.estimate_btn = ttk.Button(action_section, text="예상 비용 보기", 
+                                      command=self.show_estimate, state="disabled")
+        self.estimate_btn.pack(fill="x", pady=(0, 5))
+        
         self.start_btn = ttk.Button(action_section, text="연락처 매핑 시작", 
                                    command=self.start_mapping, state="disabled")
         self.start_btn.pack(fill="x", pady=(0, 5))
         
         self.download_btn = ttk.Button(action_section, text="결과 다운로드", 
                                       command=self.download_results, state="disabled")
-        self.download_btn.pack(fill="x")
+        self.download_btn.pack(fill="x", pady=(0, 5))
+        
+        self.cancel_btn = ttk.Button(action_section, text="취소", 
+                                    command=self.cancel_operation, state="disabled")
+        self.cancel_btn.pack(fill="x")
     
     def setup_result_panel(self, parent):
         """오른쪽 결과 패널 설정"""
@@ -180,6 +262,12 @@ class ContactMappingApp:
         
         self.result_tree.pack(fill="both", expand=True)
         
+        # 기록 검색 탭
+        self.setup_history_tab(notebook)
+        
+        # 주소 하나 바로 찾기 탭
+        self.setup_quick_lookup_tab(notebook)
+        
         # 로그 탭
         log_tab = ttk.Frame(notebook)
         notebook.add(log_tab, text="📝 로그")
@@ -196,6 +284,126 @@ class ContactMappingApp:
         self.add_log("4. 연락처 매핑 시작")
         self.add_log("5. 결과 다운로드")
     
+    def setup_history_tab(self, notebook):
+        """지난 실행 결과 검색 탭"""
+        history_tab = ttk.Frame(notebook)
+        notebook.add(history_tab, text="🔎 기록 검색")
+        
+        search_frame = ttk.Frame(history_tab)
+        search_frame.pack(fill="x", padx=5, pady=5)
+        
+        search_entry = ttk.Entry(search_frame, textvariable=self.history_query_var)
+        search_entry.pack(side="left", fill="x", expand=True, padx=(0, 5))
+        search_entry.bind("<Return>", lambda event: self.search_history())
+        ttk.Button(search_frame, text="검색", command=self.search_history).pack(side="left")
+        
+        self.history_label = ttk.Label(history_tab, text="주소, '구 동', 전화번호로 검색할 수 있어요", 
+                                       foreground="gray")
+        self.history_label.pack(anchor="w", padx=5)
+        
+        self.history_tree = ttk.Treeview(history_tab, columns=("주소", "업체명", "전화번호", "상태", "날짜"), 
+                                         show="headings")
+        for column, width in (("주소", 200), ("업체명", 130), ("전화번호", 110), ("상태", 50), ("날짜", 90)):
+            self.history_tree.heading(column, text=column)
+            self.history_tree.column(column, width=width, anchor="w")
+        self.history_tree.pack(fill="both", expand=True, padx=5, pady=5)
+    
+    def search_history(self):
+        """기록 저장소 검색"""
+        import time
+        started = time.perf_counter()
+        results = self.results_store.search(self.history_query_var.get(), limit=200)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        for item in self.history_tree.get_children():
+            self.history_tree.delete(item)
+        
+        for result in results:
+            self.history_tree.insert("", "end", values=(
+                result['address'],
+                result['place_name'] or "-",
+                result['phone'] or "-",
+                result['status'],
+                result['created_at'][:10]
+            ))
+        
+        self.history_label.config(text=f"{len(results)}건 ({elapsed_ms:.1f}ms)")
+    
+    def setup_quick_lookup_tab(self, notebook):
+        """주소 하나 바로 찾기 탭 (매핑 중에도 일괄 검색보다 먼저 처리)"""
+        quick_tab = ttk.Frame(notebook)
+        notebook.add(quick_tab, text="⚡ 바로 찾기")
+        
+        search_frame = ttk.Frame(quick_tab)
+        search_frame.pack(fill="x", padx=5, pady=5)
+        
+        quick_entry = ttk.Entry(search_frame, textvariable=self.quick_query_var)
+        quick_entry.pack(side="left", fill="x", expand=True, padx=(0, 5))
+        quick_entry.bind("<Return>", lambda event: self.quick_lookup())
+        self.quick_btn = ttk.Button(search_frame, text="찾기", command=self.quick_lookup)
+        self.quick_btn.pack(side="left")
+        
+        self.quick_label = ttk.Label(quick_tab, text="예: 부산광역시 동래구 온천동 871-95 (매핑 중에도 먼저 찾아요)", 
+                                     foreground="gray")
+        self.quick_label.pack(anchor="w", padx=5)
+        
+        self.quick_tree = ttk.Treeview(quick_tab, columns=("주소", "업체명", "전화번호", "신뢰도", "시간"), 
+                                       show="headings")
+        for column, width in (("주소", 200), ("업체명", 130), ("전화번호", 110), ("신뢰도", 50), ("시간", 70)):
+            self.quick_tree.heading(column, text=column)
+            self.quick_tree.column(column, width=width, anchor="w")
+        self.quick_tree.pack(fill="both", expand=True, padx=5, pady=5)
+    
+    def quick_lookup(self):
+        """주소 하나를 우선 차례로 검색 (일괄 검색과 같은 API 객체/속도 제한 사용)"""
+        address = " ".join(self.quick_query_var.get().split())
+        if not address:
+            return
+        
+        if not self.kakao_api:
+            messagebox.showwarning("경고", "API를 먼저 연결해주세요!")
+            return
+        
+        self.quick_btn.config(state="disabled")
+        self.quick_label.config(text=f"🔍 찾는 중: {address}")
+        
+        def worker():
+            import time
+            started = time.perf_counter()
+            contact_info = None
+            error = None
+            try:
+                with self.kakao_api.priority_lane():
+                    contact_info = self.kakao_api.find_contact_info(address)
+                # 추가 호출 없이 점수만 매기기 (threshold=0 → 추가 확인 안 함)
+                contact_info = MatchVerifier(self.kakao_api, threshold=0).verify(address, contact_info)
+            except Exception as e:
+                error = str(e)
+            elapsed = time.perf_counter() - started
+            self.root.after(0, self.quick_lookup_done, address, contact_info, error, elapsed)
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def quick_lookup_done(self, address, contact_info, error, elapsed):
+        """바로 찾기 결과 표시 (UI 스레드)"""
+        self.quick_btn.config(state="normal")
+        
+        if error:
+            self.quick_label.config(text=f"❌ {address}: {error} ({elapsed:.1f}초)")
+            self.quick_tree.insert("", 0, values=(address, "-", "-", "-", datetime.now().strftime("%H:%M:%S")))
+            return
+        
+        self.quick_label.config(text=f"✅ {contact_info['place_name']} - {contact_info['phone']} ({elapsed:.1f}초)")
+        self.quick_tree.insert("", 0, values=(
+            address,
+            contact_info['place_name'],
+            contact_info['phone'],
+            contact_info['confidence_label'],
+            datetime.now().strftime("%H:%M:%S")
+        ))
+        self.add_log(f"⚡ 바로 찾기: {address} → {contact_info['place_name']} {contact_info['phone']} "
+                     f"({elapsed:.1f}초)")
+    
     def add_log(self, message):
         """로그 메시지 추가"""
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -213,42 +421,245 @@ class ContactMappingApp:
         
         if file_path:
             self.file_path_var.set(file_path)
+            # 큰 파일도 창이 멈추지 않게 백그라운드에서 읽기
+            self.run_file_task(
+                "파일",
+                lambda progress, cancel: self.excel_handler.load_addresses(file_path, progress, cancel),
+                self.file_loaded
+            )
+    
+    def file_loaded(self, address_data, error):
+        """파일 읽기 완료 (UI 스레드)"""
+        if error:
+            messagebox.showerror("오류", str(error))
+            self.add_log(f"❌ 파일 로드 실패: {error}")
+            return
+        
+        self.address_data = address_data
+        self.batch_job = None
+        self.baseline_diff = None
+        self.total_count_var.set(str(len(self.address_data)))
+        self.progress_var.set(0)
+        self.progress_label.config(text=f"{len(self.address_data)}개 주소 로드 완료")
+        
+        self.add_log(f"✅ {len(self.address_data)}개 주소를 로드했어요!")
+        
+        # 처음 3개 주소 미리보기
+        for i, addr in enumerate(self.address_data[:3]):
+            self.add_log(f"   {i+1}. {addr['address']}")
+        
+        if len(self.address_data) > 3:
+            self.add_log(f"   ... 외 {len(self.address_data) - 3}개 더")
+        
+        self.log_address_check(self.address_data)
+        self.update_button_states()
+        self.maybe_start_prefetch()
+    
+    def select_baseline(self):
+        """지난달 결과 파일과 행 단위로 비교 (그대로인 행은 결과를 가져오고 바뀐 행만 검색)"""
+        if not self.address_data or self.batch_job:
+            messagebox.showwarning("경고", "비교할 Excel 파일을 먼저 선택해주세요! (폴더 일괄 모드는 지원 안 해요)")
+            return
+        
+        file_path = filedialog.askopenfilename(
+            title="지난 결과 파일 선택",
+            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+        )
+        
+        if file_path:
+            address_data = self.address_data
+            self.run_file_task(
+                "지난 결과 비교",
+                lambda progress, cancel: self.excel_handler.apply_baseline(address_data, file_path,
+                                                                           progress, cancel),
+                self.baseline_applied
+            )
+    
+    def baseline_applied(self, diff, error):
+        """지난 결과 비교 완료 (UI 스레드)"""
+        if error:
+            messagebox.showerror("오류", str(error))
+            self.add_log(f"❌ 지난 결과 비교 실패: {error}")
+            return
+        
+        self.baseline_diff = diff
+        for line in self.excel_handler.format_diff_report(diff):
+            self.add_log(line)
+        
+        lookups = sum(1 for addr in self.address_data if not addr.get('carried_over'))
+        self.progress_var.set(0)
+        self.progress_label.config(text=f"검색할 주소 {lookups}개 (나머지는 지난 결과 사용)")
+        self.update_button_states()
+        self.maybe_start_prefetch()
+    
+    def log_address_check(self, address_data):
+        """불러올 때 행정구역 확인 결과 (고친 주소/검색 안 할 주소) 알리기"""
+        fixed = [addr for addr in address_data if addr.get('address_note') and not addr.get('invalid_address')]
+        invalid = [addr for addr in address_data if addr.get('invalid_address')]
+        
+        if fixed:
+            self.add_log(f"🩹 주소 {len(fixed)}개는 이름을 바로잡았어요 (예: {fixed[0]['address_note']})")
+        if invalid:
+            self.add_log(f"⚠️ 주소 확인 필요 {len(invalid)}개는 검색하지 않아요 (API 호출 절약)")
+            for addr in invalid[:3]:
+                self.add_log(f"   {addr['id']}. {addr['address']} - {addr['address_note']}")
+    
+    def run_file_task(self, description, task, on_done):
+        """
+        파일 읽기/저장을 백그라운드 스레드에서 실행 (UI 스레드는 파일 I/O를 기다리지 않음)
+        task(progress_callback, cancel_event)의 결과를 on_done(result, error)로 UI 스레드에 전달
+        """
+        self.file_cancel_event = threading.Event()
+        self.is_file_busy = True
+        self.update_button_states()
+        self.progress_var.set(0)
+        self.progress_label.config(text=f"{description} 준비 중...")
+        
+        def on_progress(stage, done, total):
+            self.root.after(0, self.update_file_progress, description, stage, done, total)
+        
+        def worker():
+            result, error = None, None
             try:
-                self.address_data = self.excel_handler.load_addresses(file_path)
-                self.total_count_var.set(str(len(self.address_data)))
-                self.progress_label.config(text=f"{len(self.address_data)}개 주소 로드 완료")
-                
-                self.add_log(f"✅ {len(self.address_data)}개 주소를 로드했어요!")
-                
-                # 처음 3개 주소 미리보기
-                for i, addr in enumerate(self.address_data[:3]):
-                    self.add_log(f"   {i+1}. {addr['address']}")
-                
-                if len(self.address_data) > 3:
-                    self.add_log(f"   ... 외 {len(self.address_data) - 3}개 더")
-                
-                self.update_button_states()
-                
+                result = task(on_progress, self.file_cancel_event)
             except Exception as e:
-                messagebox.showerror("오류", str(e))
-                self.add_log(f"❌ 파일 로드 실패: {e}")
+                error = e
+            self.root.after(0, self.file_task_finished, on_done, result, error)
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def update_file_progress(self, description, stage, done, total):
+        """파일 작업 진행률 표시"""
+        stage_names = {'read': '읽는 중', 'parse': '주소 정리 중', 'write': '쓰는 중', 'files': '파일 읽는 중',
+                       'diff': '비교하는 중', 'save': '파일 마무리 중'}
+        unit = {'files': "개", 'save': "KB"}.get(stage, "행")
+        
+        if total:
+            self.progress_var.set(int(done / total * 100))
+            self.progress_label.config(text=f"{description} {stage_names.get(stage, stage)}... {done}/{total}{unit}")
+        else:
+            self.progress_label.config(text=f"{description} {stage_names.get(stage, stage)}... {done}{unit}")
+    
+    def file_task_finished(self, on_done, result, error):
+        """파일 작업 끝 (UI 스레드)"""
+        self.is_file_busy = False
+        self.update_button_states()
+        
+        if isinstance(error, OperationCancelledError):
+            self.progress_var.set(0)
+            self.progress_label.config(text="취소했어요")
+            self.add_log("⏹️ 파일 작업을 취소했어요")
+            return
+        
+        on_done(result, error)
+    
+    def cancel_operation(self):
+        """진행 중인 파일 작업 또는 매핑 취소"""
+        if self.is_file_busy and self.file_cancel_event:
+            self.file_cancel_event.set()
+            self.progress_label.config(text="취소하는 중...")
+        
+        if self.is_processing:
+            self.stop_event.set()
+            self.add_log("⏹️ 매핑을 멈추는 중... (지금 검색 중인 주소까지만 처리해요)")
+    
+    def select_folder(self):
+        """폴더 안의 모든 엑셀 파일(모든 시트)을 한 번에 불러오기"""
+        folder = filedialog.askdirectory(title="엑셀 파일이 있는 폴더 선택")
+        
+        if not folder:
+            return
+        
+        self.file_path_var.set(folder)
+        self.add_log(f"📚 폴더의 엑셀 파일들을 동시에 읽는 중: {folder}")
+        
+        def task(progress, cancel):
+            batch_job = BatchJob()
+            batch_job.load(folder, progress_callback=lambda done, total, path: progress('files', done, total),
+                           cancel_event=cancel)
+            return batch_job
+        
+        self.run_file_task("폴더", task, self.batch_loaded)
+    
+    def batch_loaded(self, batch_job, error):
+        """폴더 일괄 로드 완료 (UI 스레드)"""
+        if error:
+            messagebox.showerror("오류", str(error))
+            self.add_log(f"❌ 폴더 로드 실패: {error}")
+            return
+        
+        address_data = batch_job.lookup_rows
+        self.batch_job = batch_job
+        self.address_data = address_data
+        self.baseline_diff = None
+        self.total_count_var.set(str(len(address_data)))
+        self.progress_var.set(0)
+        self.progress_label.config(text=f"{len(address_data)}개 주소 로드 완료 (파일 {len(batch_job.inputs)}개)")
+        
+        self.add_log(f"✅ 파일 {len(batch_job.inputs)}개에서 중복 제외 {len(address_data)}개 주소를 로드했어요!")
+        for path, reason in batch_job.failed_files:
+            self.add_log(f"   ⚠️ 읽지 못한 파일: {os.path.basename(path)} - {reason}")
+        
+        self.log_address_check(address_data)
+        
+        self.update_button_states()
+        self.maybe_start_prefetch()
+    
+    def import_geocoder_file(self):
+        """공공 주소/좌표 CSV를 오프라인 좌표 DB로 가져오기 (백그라운드)"""
+        file_path = filedialog.askopenfilename(
+            title="주소 좌표 CSV 선택",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        
+        if not file_path:
+            return
+        
+        self.add_log(f"📥 주소 좌표 DB 가져오는 중: {os.path.basename(file_path)}")
+        
+        def worker():
+            try:
+                geocoder = self.geocoder or OfflineGeocoder()
+                imported = geocoder.import_csv(
+                    file_path,
+                    progress_callback=lambda count: self.root.after(0, self.progress_label.config,
+                                                                    {'text': f"좌표 {count}개 가져오는 중..."})
+                )
+                self.geocoder = geocoder
+                if self.kakao_api:
+                    self.kakao_api.geocoder = geocoder
+                self.root.after(0, self.add_log, f"✅ 주소 좌표 {imported}개 가져오기 완료! (이제 좌표 검색은 API 없이 해요)")
+                self.root.after(0, self.progress_label.config, {'text': "주소 좌표 DB 준비 완료"})
+            except Exception as e:
+                self.root.after(0, self.add_log, f"❌ 주소 좌표 DB 가져오기 실패: {e}")
+        
+        threading.Thread(target=worker, daemon=True).start()
     
     def connect_api(self):
         """카카오 API 연결"""
-        api_key = self.api_key_var.get().strip()
+        api_keys = [key.strip() for key in self.api_key_var.get().split(",") if key.strip()]
         
-        if not api_key:
+        if not api_keys:
             messagebox.showwarning("경고", "API 키를 입력해주세요!")
             return
         
         try:
-            self.kakao_api = KakaoAPI(api_key)
+            self.kakao_api = KakaoAPI(api_keys[0], keyword_stats=self.keyword_stats,
+                                      ledger=self.usage_ledger, backup_keys=api_keys[1:],
+                                      geocoder=self.geocoder,
+                                      hedger=self.hedger if self.hedge_var.get() else None,
+                                      archive=self.response_archive)
+            if len(api_keys) > 1:
+                self.add_log(f"🔑 API 키 {len(api_keys)}개 등록 (한도가 차면 다음 키 사용)")
             
-            # API 키 테스트
-            if self.kakao_api.test_api_key():
+            # API 키 테스트 (파일이 있으면 첫 주소 좌표로 → 매핑 때 그대로 재사용)
+            sample_address = next((addr['address'] for addr in self.address_data
+                                   if not addr.get('invalid_address')), None)
+            if self.kakao_api.test_api_key(sample_address):
                 self.add_log("✅ 카카오 API 연결 성공!")
                 messagebox.showinfo("성공", "카카오 API 연결이 완료되었어요! 👍")
                 self.update_button_states()
+                self.maybe_start_prefetch()
             else:
                 self.add_log("❌ API 키 테스트 실패")
                 messagebox.showerror("실패", "API 키를 확인해주세요!")
@@ -257,16 +668,85 @@ class ContactMappingApp:
             self.add_log(f"❌ API 연결 실패: {e}")
             messagebox.showerror("오류", str(e))
     
+    def toggle_hedging(self):
+        """헤징 켜기/끄기 (응답 시간 기록은 켜져 있는 동안 계속 쌓여요)"""
+        if self.hedge_var.get():
+            self.hedger = self.hedger or HedgedRequester()
+            self.add_log("🪁 p95보다 늦는 요청은 다른 연결로 한 번 더 보내요 (전체 호출의 10%까지)")
+        
+        if self.kakao_api:
+            self.kakao_api.hedger = self.hedger if self.hedge_var.get() else None
+    
     def start_mapping(self):
         """연락처 매핑 시작"""
         if self.is_processing:
             return
         
-        if not self.kakao_api or not self.address_data:
+        use_gateway = self.use_gateway_var.get()
+        if not (self.kakao_api or use_gateway) or not self.address_data:
             messagebox.showwarning("경고", "파일과 API를 먼저 준비해주세요!")
             return
         
+        # 게이트웨이 모드: 검색/키/한도는 게이트웨이 프로세스가 관리 (이 창은 결과만 받음)
+        self.gateway_client = None
+        if use_gateway:
+            client = GatewayClient(client_name=f"GUI:{os.getpid()}")
+            if not client.is_available():
+                messagebox.showerror("오류", "게이트웨이에 연결할 수 없어요.\n"
+                                           "python main.py --gateway --api-key 키 로 먼저 실행해주세요.")
+                return
+            self.gateway_client = client
+        
+        # 지난 결과와 비교해서 그대로 가져온 행은 검색하지 않아요
+        carried_rows = [addr for addr in self.address_data if addr.get('carried_over')]
+        self.rows_to_process = [addr for addr in self.address_data if not addr.get('carried_over')]
+        
+        # 이미 찾은 주소가 있으면 남은 주소만 이어서 할지 물어보기
+        pending = [addr for addr in self.rows_to_process if addr['status'] != '성공']
+        if pending and len(pending) < len(self.rows_to_process):
+            if messagebox.askyesno("이어하기", f"이미 찾은 {len(self.rows_to_process) - len(pending)}개는 건너뛰고\n"
+                                             f"남은 {len(pending)}개만 검색할까요?"):
+                self.rows_to_process = pending
+        
+        # 기록 저장소에 이미 있는 주소는 결과를 미리 채우고 검색 대상에서 빼기
+        prefilled_rows = []
+        if self.use_history_var.get():
+            if self.results_store.prefill(self.rows_to_process):
+                prefilled_rows = [addr for addr in self.rows_to_process if addr.get('prefilled')]
+                self.rows_to_process = [addr for addr in self.rows_to_process if not addr.get('prefilled')]
+                self.add_log(f"🗄️ 이전 기록으로 {len(prefilled_rows)}개 주소를 바로 채웠어요 (API 호출 없음)")
+        
+        # 실행 전 예상 비용 확인 (오늘 한도를 넘을 것 같으면 물어보기)
+        estimate = self.get_estimate(self.rows_to_process) if self.kakao_api else None
+        for line in QuotaPlanner.format_estimate(estimate) if estimate else []:
+            self.add_log(line)
+        if estimate and not estimate['fits_quota']:
+            if not messagebox.askyesno("한도 확인", "오늘 남은 API 한도 안에 다 못 끝날 수 있어요.\n"
+                                                 "한도에 닿으면 자동으로 멈춰요. 계속할까요?"):
+                return
+        
+        # 검색 스레드에서는 Tk 변수를 읽지 않게 미리 옮겨두기
+        self.use_clusters = self.use_clusters_var.get()
+        
+        # 시간/호출 제한이 있으면 가치(찾을 확률 / 예상 호출 수)가 높은 주소부터
+        self.time_box = None
+        if self.prioritize_var.get():
+            try:
+                deadline_minutes = float(self.deadline_minutes_var.get() or 0)
+                call_budget = int(self.call_budget_var.get() or 0)
+            except ValueError:
+                messagebox.showwarning("경고", "제한 시간(분)과 호출 예산은 숫자로 넣어주세요!")
+                return
+            self.prioritize_rows(deadline_minutes * 60, call_budget)
+        
+        # 미리 구하기는 여기서 멈추고, 구해둔 좌표는 검색 1단계에서 그대로 써요
+        if self.prefetcher:
+            self.prefetcher.stop()
+            if self.prefetcher.stats['geocoded']:
+                self.add_log(self.prefetcher.format_stats())
+        
         self.is_processing = True
+        self.stop_event.clear()
         self.update_button_states()
         
         # 결과 초기화
@@ -278,58 +758,230 @@ class ContactMappingApp:
         self.error_count_var.set("0")
         self.progress_var.set(0)
         
+        for addr in carried_rows:
+            if addr['status'] == '성공':
+                self.update_result_success(addr['id'], addr['address'], addr['place_name'], addr['phone'])
+            else:
+                self.update_result_error(addr['id'], addr['address'], addr['error'] or "지난 결과: 실패")
+        if carried_rows:
+            self.add_log(f"🔀 지난 결과에서 {len(carried_rows)}개를 그대로 가져왔어요 (API 호출 없음)")
+        
+        for addr in prefilled_rows:
+            self.update_result_success(addr['id'], addr['address'], addr['place_name'], addr['phone'])
+        
         self.add_log("🚀 연락처 매핑을 시작해요!")
         
         # 별도 스레드에서 처리
         threading.Thread(target=self.process_addresses, daemon=True).start()
     
+    def prioritize_rows(self, deadline_seconds, call_budget):
+        """지난 결과로 행마다 적중 확률/예상 호출 수를 추정해서 가치가 높은 순서로 정렬하고 제한 걸기"""
+        estimator = HitEstimator(self.results_store, ledger=self.usage_ledger,
+                                 negative_store=self.negative_store)
+        file_order = estimator.score(self.rows_to_process)
+        self.rows_to_process, scored = estimator.order(self.rows_to_process)
+        self.add_log("🎯 찾을 가능성이 높고 호출이 적게 드는 주소부터 검색해요")
+        
+        # 게이트웨이는 이 창에서 호출 수를 셀 수 없어서 시간 제한만 적용
+        if call_budget and self.gateway_client:
+            self.add_log("⚠️ 게이트웨이 모드에서는 호출 예산을 셀 수 없어서 제한 시간만 적용해요")
+            call_budget = 0
+        
+        if not (deadline_seconds or call_budget):
+            return
+        
+        limits = {'max_calls': call_budget or None, 'max_seconds': deadline_seconds or None}
+        rows, hits = estimator.estimate_hits(scored, **limits)
+        _, file_order_hits = estimator.estimate_hits(file_order, **limits)
+        self.add_log(f"📈 제한 안에 약 {rows}개 주소, 전화번호 약 {hits:.0f}개 예상 "
+                     f"(파일 순서대로면 약 {file_order_hits:.0f}개)")
+        
+        self.time_box = TimeBox(deadline_seconds=deadline_seconds, max_calls=call_budget,
+                                call_counter=(lambda: self.kakao_api.call_count) if call_budget else None,
+                                stop_event=self.stop_event)
+    
+    def maybe_start_prefetch(self):
+        """미리 구하기가 켜져 있고 파일/API가 준비됐으면 백그라운드에서 좌표 미리 구하기"""
+        if self.prefetcher:
+            self.prefetcher.stop()
+        
+        if not (self.prefetch_var.get() and self.kakao_api and self.address_data) or self.is_processing:
+            return
+        
+        # 체크박스는 UI 스레드에서 읽어두고 미리 구하기 스레드에는 값만 넘겨요
+        use_history = self.use_history_var.get()
+        prefetcher = Prefetcher(self.kakao_api)
+        self.prefetcher = prefetcher
+        prefetcher.start(self.address_data,
+                         is_known=lambda addresses: self.get_known_addresses(addresses, use_history),
+                         on_done=lambda stats: self.root.after(0, self.add_log, prefetcher.format_stats()))
+        self.add_log(f"🛫 매핑 시작 전까지 좌표를 미리 구해둘게요 (최대 {prefetcher.budget}번 호출)")
+    
+    def get_known_addresses(self, addresses, use_history):
+        """
+        검색하지 않을 주소 (이전 기록에 결과가 있거나 최근에 못 찾은 주소)
+        미리 구하기 스레드에서 불려서 Tk 변수 대신 use_history 값을 받아요
+        """
+        known = set()
+        if use_history:
+            found = self.results_store.find_many(addresses)
+            known = {address for address in addresses if normalize_address_key(address) in found}
+        return known | {address for address in addresses if self.negative_store.get_retry_after(address)}
+    
+    def get_estimate(self, address_data):
+        """API 호출 없이 예상 호출 수/시간 계산"""
+        planner = QuotaPlanner(self.usage_ledger, provider='kakao',
+                               min_interval=self.kakao_api.min_interval, row_delay=0.15)
+        address_data = [addr for addr in address_data if not addr.get('invalid_address')]
+        known = self.results_store.find_many([addr['address'] for addr in address_data])
+        
+        def is_cached(address):
+            return (normalize_address_key(address) in known
+                    or self.negative_store.get_retry_after(address))
+        
+        return planner.estimate(address_data, self.kakao_api.api_keys, is_cached=is_cached)
+    
+    def show_estimate(self):
+        """예상 비용 보기 (드라이런)"""
+        if not self.kakao_api or not self.address_data:
+            messagebox.showwarning("경고", "파일과 API를 먼저 준비해주세요!")
+            return
+        
+        lines = QuotaPlanner.format_estimate(self.get_estimate(self.address_data))
+        for line in lines:
+            self.add_log(line)
+        messagebox.showinfo("예상 비용", "\n".join(lines))
+    
     def process_addresses(self):
         """주소 처리 (백그라운드)"""
-        total = len(self.address_data)
-        success = 0
-        error = 0
+        rows = self.rows_to_process
+        total = len(rows)
+        
+        def on_success(index, addr_data, contact_info):
+            # UI 업데이트
+            self.root.after(0, self.update_result_success, 
+                           addr_data['id'], addr_data['address'], 
+                           contact_info['place_name'], contact_info['phone'])
+            
+            self.root.after(0, self.add_log, 
+                           f"✅ {index+1}/{total}: {contact_info['place_name']} - {contact_info['phone']}")
+        
+        def on_error(index, addr_data, message):
+            # UI 업데이트
+            self.root.after(0, self.update_result_error, 
+                           addr_data['id'], addr_data['address'], message)
+            
+            self.root.after(0, self.add_log, 
+                           f"❌ {index+1}/{total}: {addr_data['address'][:25]}... - {message}")
+        
+        def on_progress(processed, success, error):
+            # 진행률 업데이트
+            progress = int((processed / total) * 100)
+            self.root.after(0, self.update_progress, processed, success, error, progress)
+        
+        # 마감 시간/호출 예산이 있으면 사용자 취소와 함께 감시
+        should_stop = self.time_box.should_stop if self.time_box else self.stop_event.is_set
         
-        for i, addr_data in enumerate(self.address_data):
+        if self.gateway_client:
+            # 게이트웨이가 검색하고 기록 저장소에도 남겨요
+            self.root.after(0, self.add_log, f"🚪 게이트웨이로 주소 {total}개를 보냈어요")
             try:
-                # 연락처 검색
-                contact_info = self.kakao_api.find_contact_info(addr_data['address'])
-                
-                addr_data['place_name'] = contact_info['place_name']
-                addr_data['phone'] = contact_info['phone']
-                addr_data['category'] = contact_info.get('category', '')
-                addr_data['status'] = '성공'
-                success += 1
-                
-                # UI 업데이트
-                self.root.after(0, self.update_result_success, 
-                               addr_data['id'], addr_data['address'], 
-                               contact_info['place_name'], contact_info['phone'])
-                
-                self.root.after(0, self.add_log, 
-                               f"✅ {i+1}/{total}: {contact_info['place_name']} - {contact_info['phone']}")
-                
+                stats = self.gateway_client.run(rows, on_success=on_success,
+                                                on_error=on_error, on_progress=on_progress,
+                                                should_stop=should_stop)
             except Exception as e:
-                addr_data['status'] = '실패'
-                addr_data['error'] = str(e)
-                error += 1
-                
-                # UI 업데이트
-                self.root.after(0, self.update_result_error, 
-                               addr_data['id'], addr_data['address'], str(e))
-                
-                self.root.after(0, self.add_log, 
-                               f"❌ {i+1}/{total}: {addr_data['address'][:25]}... - {e}")
+                self.root.after(0, self.add_log, f"❌ 게이트웨이 오류: {e}")
+                self.root.after(0, self.mapping_completed,
+                                sum(1 for addr in rows if addr['status'] == '성공'),
+                                sum(1 for addr in rows if addr['status'] == '실패'))
+                return
+            if stats['cached']:
+                self.root.after(0, self.add_log, f"🗄️ 게이트웨이 기록으로 {stats['cached']}개를 바로 받았어요")
+        else:
+            lookup_func = self.kakao_api.find_contact_info
             
-            # 진행률 업데이트
-            progress = int(((i + 1) / total) * 100)
-            self.root.after(0, self.update_progress, i + 1, success, error, progress)
+            # 좌표를 먼저 구해서 가까운 주소끼리 근처 검색을 한 번만
+            planner = None
+            if self.use_clusters:
+                self.root.after(0, self.add_log, "🗺️ 주소 좌표를 먼저 구해서 가까운 주소끼리 묶는 중...")
+                planner = ClusterPlanner(self.kakao_api)
+                planner.plan(rows, should_stop=self.stop_event.is_set,
+                             on_progress=lambda stage, done, count: self.root.after(
+                                 0, self.progress_label.config,
+                                 {'text': f"{'좌표 구하는 중' if stage == 'geocode' else '묶음 검색 중'}... {done}/{count}"}))
+                self.root.after(0, self.add_log, planner.format_stats())
+                lookup_func = planner.lookup
             
-            # API 제한 (0.15초 대기)
-            import time
-            time.sleep(0.15)
+            # 찾은 결과는 신뢰도를 매기고, 약한 매칭만 좁은 반경으로 한 번 더 확인
+            verifier = MatchVerifier(self.kakao_api)
+            
+            # 일시 오류는 재시도 대기열로, 결과 없음은 기록해두는 스케줄러 사용
+            # (API 제한 때문에 한 건마다 0.15초 대기)
+            scheduler = LookupScheduler(verifier.wrap(lookup_func),
+                                        negative_store=self.negative_store,
+                                        row_delay=0.15)
+            stats = scheduler.run(rows, on_success=on_success,
+                                  on_error=on_error, on_progress=on_progress,
+                                  should_stop=should_stop)
+            
+            # 결과를 기록 저장소에도 남기기 (다음 실행 때 미리 채우기/검색용)
+            try:
+                self.results_store.add_run(rows, source=self.file_path_var.get())
+            except Exception as e:
+                self.root.after(0, self.add_log, f"⚠️ 기록 저장소 저장 실패: {e}")
+            
+            if stats['success']:
+                self.root.after(0, self.add_log, verifier.format_stats())
+        
+        # 동네별 키워드 적중 통계, API 사용량 장부, 원본 응답 보관소 저장
+        try:
+            self.keyword_stats.save()
+            self.usage_ledger.save()
+            self.response_archive.flush()
+        except (OSError, sqlite3.Error) as e:
+            self.root.after(0, self.add_log, f"⚠️ 통계 저장 실패: {e}")
+        
+        if self.stop_event.is_set():
+            waiting = sum(1 for addr in rows if addr['status'] == '대기중')
+            self.root.after(0, self.add_log, f"⏹️ 매핑을 멈췄어요. 남은 {waiting}개는 '이어하기'로 계속할 수 있어요")
+        
+        if self.time_box and self.time_box.reason and not self.stop_event.is_set():
+            waiting = sum(1 for addr in rows if addr['status'] == '대기중')
+            self.root.after(0, self.add_log, 
+                           f"⏰ {self.time_box.reason} 남은 {waiting}개는 '이어하기'로 계속할 수 있어요")
+        
+        if stats['paused']:
+            waiting = sum(1 for addr in rows if addr['status'] == '대기중')
+            self.root.after(0, self.add_log, f"⏸️ {stats['paused']}")
+            self.root.after(0, self.add_log, 
+                           f"⏸️ 남은 {waiting}개는 대기중으로 남겨뒀어요. 다른 키를 넣거나 내일 '이어하기'로 계속하세요")
+        for line in self.kakao_api.get_rejected_keys() if self.kakao_api else []:
+            self.root.after(0, self.add_log, f"🚫 {line} → 이 키는 빼고 검색했어요")
+        if stats['duplicates']:
+            self.root.after(0, self.add_log, f"♻️ 중복 주소 {stats['duplicates']}개는 결과를 재사용했어요")
+        
+        if self.kakao_api and self.kakao_api.offline_geocode_hits:
+            self.root.after(0, self.add_log, 
+                           f"📦 오프라인 DB로 좌표를 찾은 주소: {self.kakao_api.offline_geocode_hits}개 (API 호출 절약)")
+        
+        if self.kakao_api and self.kakao_api.hedger:
+            self.root.after(0, self.add_log, HedgedRequester.format_stats(self.kakao_api.hedger.get_stats()))
+        
+        if stats.get('held_seconds'):
+            self.root.after(0, self.add_log, 
+                           f"🔌 API가 응답하지 않아 {stats['held_seconds']:.0f}초 동안 주소를 붙잡아 뒀어요 (실패로 처리 안 함)")
+            for line in self.kakao_api.get_breaker_status() if self.kakao_api else []:
+                self.root.after(0, self.add_log, f"   {line}")
+        
+        if stats['retried']:
+            self.root.after(0, self.add_log, f"🔁 일시 오류로 재시도한 횟수: {stats['retried']}번")
+        if stats.get('invalid'):
+            self.root.after(0, self.add_log, f"⚠️ 주소 확인이 필요한 {stats['invalid']}개는 검색하지 않았어요")
+        if stats['skipped']:
+            self.root.after(0, self.add_log, f"⏭️ 최근에 찾지 못한 주소 {stats['skipped']}개는 건너뛰었어요")
         
         # 완료
-        self.root.after(0, self.mapping_completed, success, error)
+        self.root.after(0, self.mapping_completed, stats['success'], stats['error'])
     
     def update_result_success(self, addr_id, address, place_name, phone):
         """성공 결과 업데이트"""
@@ -370,7 +1022,7 @@ class ContactMappingApp:
         self.success_count_var.set(str(success))
         self.error_count_var.set(str(error))
         self.progress_var.set(progress)
-        self.progress_label.config(text=f"{processed} / {len(self.address_data)} ({progress}%)")
+        self.progress_label.config(text=f"{processed} / {len(self.rows_to_process)} ({progress}%)")
     
     def mapping_completed(self, success, error):
         """매핑 완료"""
@@ -386,35 +1038,95 @@ class ContactMappingApp:
             messagebox.showwarning("경고", "다운로드할 데이터가 없어요!")
             return
         
+        # 폴더 일괄 모드: 원래 파일마다 결과 파일 하나씩
+        if self.batch_job:
+            output_folder = filedialog.askdirectory(title="결과 파일들을 저장할 폴더 선택")
+            if output_folder:
+                batch_job = self.batch_job
+                self.run_file_task(
+                    "결과",
+                    lambda progress, cancel: batch_job.save_results(output_folder, self.excel_handler,
+                                                                    progress, cancel),
+                    lambda saved, error: self.results_saved(
+                        f"결과 파일 {len(saved)}개" if saved else "", output_folder, error)
+                )
+            return
+        
         file_path = filedialog.asksaveasfilename(
             title="결과 저장",
             defaultextension=".xlsx",
             filetypes=[("Excel files", "*.xlsx")],
-            initialvalue=f"연락처_매핑_결과_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+            initialfile=f"연락처_매핑_결과_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         )
         
         if file_path:
-            try:
-                self.excel_handler.save_results(self.address_data, file_path)
-                self.add_log(f"💾 결과 저장 완료: {file_path}")
-                messagebox.showinfo("완료", "결과가 저장되었어요! 👍")
-                
-            except Exception as e:
-                messagebox.showerror("오류", str(e))
-                self.add_log(f"❌ 저장 실패: {e}")
+            address_data = self.address_data
+            diff = self.baseline_diff
+            self.run_file_task(
+                "결과",
+                lambda progress, cancel: self.excel_handler.save_results(address_data, file_path,
+                                                                         progress, cancel, diff=diff),
+                lambda result, error: self.results_saved("결과", file_path, error)
+            )
+    
+    def results_saved(self, what, path, error):
+        """결과 저장 완료 (UI 스레드)"""
+        if error:
+            messagebox.showerror("오류", str(error))
+            self.add_log(f"❌ 저장 실패: {error}")
+            return
+        
+        self.progress_label.config(text="저장 완료")
+        self.add_log(f"💾 {what} 저장 완료: {path}")
+        
+        # 성능 분석 중이었으면 저장까지 끝난 사이클을 파일로 남기기
+        if self.profiler:
+            self.profile_var.set(False)
+            self.toggle_profiling()
+        
+        messagebox.showinfo("완료", f"{what}가 저장되었어요! 👍")
+    
+    def toggle_profiling(self):
+        """성능 분석 켜기/끄기 (끌 때 flamegraph 파일과 요약 저장)"""
+        if self.profile_var.get():
+            self.profiler = SamplingProfiler()
+            self.profiler.start()
+            self.add_log("🔬 성능 분석 시작: 파일 선택 → 매핑 → 결과 저장까지 기록해요")
+            return
+        
+        if not self.profiler:
+            return
+        
+        profiler = self.profiler
+        self.profiler = None
+        profiler.stop()
+        try:
+            folded_path, summary_path = profiler.save_report()
+            self.add_log(f"🔬 성능 분석 저장 ({profiler.elapsed:.0f}초 기록)")
+            self.add_log(f"   flamegraph: {folded_path}")
+            self.add_log(f"   요약: {summary_path}")
+        except OSError as e:
+            self.add_log(f"⚠️ 성능 분석 저장 실패: {e}")
     
     def update_button_states(self):
         """버튼 상태 업데이트"""
         has_file = bool(self.address_data)
-        has_api = self.kakao_api is not None
+        has_api = self.kakao_api is not None or self.use_gateway_var.get()
+        is_busy = self.is_processing or self.is_file_busy
+        
+        for button in self.file_buttons:
+            button.config(state="disabled" if is_busy else "normal")
+        self.cancel_btn.config(state="normal" if is_busy else "disabled")
         
-        if has_file and has_api and not self.is_processing:
+        if has_file and has_api and not is_busy:
             self.start_btn.config(state="normal")
+            self.estimate_btn.config(state="normal")
         else:
             self.start_btn.config(state="disabled")
+            self.estimate_btn.config(state="disabled")
         
         processed_data = [addr for addr in self.address_data if addr.get('status') and addr['status'] != '대기중']
-        if processed_data and not self.is_processing:
+        if processed_data and not is_busy:
             self.download_btn.config(state="normal")
         else:
             self.download_btn.config(state="disabled")
\ No newline at end of file
@@ -1,35 +1,314 @@
 # main.py
 # 연락처 매핑 프로그램의 시작점!
+#
+# 성능 분석: python main.py --profile 주소.xlsx --api-key 카카오키 [--output 결과.xlsx]
+#   화면 없이 읽기 → 검색 → 저장을 한 번 돌리면서 프로파일을 data/profiles에 남겨요
+# 큰 파일 단계별 처리: python main.py --stream 주소.xlsx --api-key 카카오키 [--output 결과.xlsx] [--workers 2]
+#   읽기 → 중복 정리 → 저장된 결과 확인 → 검색 → 쓰기를 동시에 흘려보내요 (메모리 일정, 단계별 큐 상태 출력)
+# 키마다 프로세스 하나로 나눠 검색: python main.py --parallel 주소.xlsx --api-key 키1,키2 [--output 결과.xlsx]
+#   주소 표는 공유 메모리에 한 번만 올리고 워커는 붙어서 읽고 결과 칸에 바로 써요 (피클 복사 없음)
+# 재매칭: python main.py --rematch 주소.xlsx [--output 결과.xlsx]
+#   API 호출 없이 보관된 원본 응답(data/responses.sqlite3)으로 지금 매칭 규칙을 다시 적용해요
+# 여러 PC로 나눠 검색 (공유 폴더의 작업 저장소):
+#   코디네이터: python main.py --distribute 주소.xlsx --job-store 공유폴더/jobs.sqlite3 [--unit-size 200] [--output 결과.xlsx]
+#   워커(PC마다): python main.py --work --job-store 공유폴더/jobs.sqlite3 --api-key 그PC의키
+# 검색 게이트웨이: python main.py --gateway --api-key 키1,키2 [--port 8780]
+#   이 컴퓨터의 모든 창/스크립트가 API 키와 한도를 같이 쓰도록 검색을 대신 해줘요
 
-import tkinter as tk
-from tkinter import messagebox
+import argparse
+import os
 import sys
 
-try:
-    from gui.contact_window import ContactMappingApp
-except ImportError as e:
-    print(f"❌ 필요한 파일을 찾을 수 없어요: {e}")
-    print("📁 파일 구조를 확인해주세요!")
-    sys.exit(1)
+def run_profile(args):
+    """화면 없이 load_addresses → 검색 → save_results 한 사이클을 프로파일링"""
+    from utils.excel_handler import ExcelHandler
+    from utils.kakao_api import KakaoAPI
+    from utils.keyword_stats import KeywordStats
+    from utils.lookup_scheduler import LookupScheduler
+    from utils.profiler import SamplingProfiler
+    from utils.quota import UsageLedger
+
+    excel_handler = ExcelHandler()
+    profiler = SamplingProfiler(interval=args.interval / 1000)
+    output_path = args.output or os.path.splitext(args.profile)[0] + "_프로파일_결과.xlsx"
+
+    with profiler:
+        address_data = excel_handler.load_addresses(args.profile)
+        if args.limit:
+            address_data = address_data[:args.limit]
+
+        kakao_api = KakaoAPI(args.api_key, keyword_stats=KeywordStats(), ledger=UsageLedger())
+        # GUI와 같은 설정 (한 건마다 0.15초 대기)
+        scheduler = LookupScheduler(kakao_api.find_contact_info, row_delay=0.15)
+        stats = scheduler.run(address_data)
+
+        excel_handler.save_results(address_data, output_path)
+
+    print(f"📊 {stats['processed']}개 처리: 성공 {stats['success']}개, 실패 {stats['error']}개, "
+          f"API 호출 {kakao_api.call_count}번")
+    profiler.save_report()
+
+def run_stream(args):
+    """화면 없이 큰 파일을 단계별 파이프라인으로 처리"""
+    from utils.excel_handler import ExcelHandler
+    from utils.kakao_api import KakaoAPI
+    from utils.keyword_stats import KeywordStats
+    from utils.lookup_scheduler import NegativeResultStore
+    from utils.quota import UsageLedger
+    from utils.response_archive import ResponseArchive
+    from utils.results_store import ResultsStore
+    from utils.streaming_mapper import StreamingMapper
+    from utils.verification import MatchVerifier
+
+    output_path = args.output or os.path.splitext(args.stream)[0] + "_연락처결과.xlsx"
+    archive = ResponseArchive()
+    kakao_api = KakaoAPI(args.api_key, keyword_stats=KeywordStats(), ledger=UsageLedger(),
+                         archive=archive)
+    verifier = MatchVerifier(kakao_api)
+    results_store = ResultsStore()
+
+    mapper = StreamingMapper(ExcelHandler(), verifier.wrap(kakao_api.find_contact_info),
+                             results_store=results_store, negative_store=NegativeResultStore(),
+                             lookup_workers=args.workers)
+
+    def print_progress(stage_stats, stats):
+        print(StreamingMapper.format_progress(stage_stats, stats))
+
+    try:
+        stats = mapper.run(args.stream, output_path, on_stats=print_progress)
+    finally:
+        results_store.close()
+        archive.close()
+
+    print(f"📊 {stats['processed']}개 처리: 성공 {stats['success']}개, 실패 {stats['error']}개, "
+          f"API 호출 {kakao_api.call_count}번")
+    print(verifier.format_stats())
+    if stats['paused']:
+        print(f"⏸️ {stats['paused']} (남은 주소는 대기중으로 저장했어요)")
+    print(f"💾 결과 파일: {output_path}")
+
+def run_parallel(args):
+    """화면 없이 키마다 프로세스 하나로 나눠 검색 (주소 표는 공유 메모리)"""
+    from utils.excel_handler import ExcelHandler
+    from utils.results_store import ResultsStore
+    from utils.shared_table import run_parallel_lookup
+
+    api_keys = [key.strip() for key in args.api_key.split(",") if key.strip()]
+    output_path = args.output or os.path.splitext(args.parallel)[0] + "_연락처결과.xlsx"
+    excel_handler = ExcelHandler()
+    address_data = excel_handler.load_addresses(args.parallel)
+    if args.limit:
+        address_data = address_data[:args.limit]
+
+    results_store = ResultsStore()
+    try:
+        prefilled = results_store.prefill(address_data)
+        if prefilled:
+            print(f"🗄️ 이전 기록으로 {prefilled}개 주소를 바로 채웠어요 (API 호출 없음)")
+
+        def print_progress(processed, success, error):
+            print(f"⏳ {processed}개 처리: 성공 {success}개, 실패 {error}개")
+
+        try:
+            stats = run_parallel_lookup(address_data, api_keys, on_progress=print_progress)
+        except KeyboardInterrupt:
+            print("⏹️ 검색을 멈췄어요")
+            return
+
+        results_store.add_run(address_data, source=os.path.basename(args.parallel))
+    finally:
+        results_store.close()
+
+    excel_handler.save_results(address_data, output_path)
+    print(f"📊 {stats['processed']}개 처리: 성공 {stats['success']}개, 실패 {stats['error']}개")
+    if stats['paused']:
+        print(f"⏸️ {stats['paused']} (남은 주소는 대기중으로 저장했어요)")
+    if stats['stopped']:
+        print("⏹️ 검색을 멈췄어요 (남은 주소는 대기중으로 저장했어요)")
+    if stats['failures']:
+        print(f"❌ 검색 프로세스 {len(stats['failures'])}개가 오류로 멈췄어요 (남은 주소는 대기중으로 저장했어요)")
+    print(f"💾 결과 파일: {output_path}")
+
+def run_rematch(args):
+    """보관된 응답으로 주소 파일을 다시 매칭 (네트워크 없음)"""
+    from utils.excel_handler import ExcelHandler
+    from utils.offline_geocoder import OfflineGeocoder
+    from utils.response_archive import ResponseArchive, rematch_addresses
+
+    output_path = args.output or os.path.splitext(args.rematch)[0] + "_재매칭_결과.xlsx"
+    excel_handler = ExcelHandler()
+    address_data = excel_handler.load_addresses(args.rematch)
+    if args.limit:
+        address_data = address_data[:args.limit]
+
+    archive = ResponseArchive()
+    geocoder = OfflineGeocoder.open_if_exists()
+    try:
+        rematch_addresses(address_data, archive, geocoder=geocoder)
+    finally:
+        archive.close()
+        if geocoder:
+            geocoder.close()
+
+    excel_handler.save_results(address_data, output_path)
+    print(f"💾 결과 파일: {output_path}")
+
+def run_coordinator(args):
+    """주소 파일을 작업 단위로 나눠 넣고, 워커들이 다 끝내면 하나의 엑셀로 합치기"""
+    from utils.distributed_jobs import SharedJobStore, format_progress
+    from utils.excel_handler import ExcelHandler
+
+    excel_handler = ExcelHandler()
+    output_path = args.output or os.path.splitext(args.distribute)[0] + "_연락처결과.xlsx"
+    store = SharedJobStore(args.job_store)
+
+    try:
+        if args.job_id:
+            # 코디네이터를 다시 켠 경우: 이미 만든 작업을 이어서 기다림
+            job_id = args.job_id
+        else:
+            address_data = excel_handler.load_addresses(args.distribute)
+            job_id = store.create_job(address_data, source=os.path.basename(args.distribute),
+                                      unit_size=args.unit_size)
+            print(f"👷 각 PC에서 실행: python main.py --work --job-store {args.job_store} --api-key 키")
+            print(f"   (코디네이터를 껐다 켜면 --job-id {job_id} 로 이어서 기다릴 수 있어요)")
+
+        try:
+            store.wait_for_job(job_id, on_progress=lambda progress: print(format_progress(progress)))
+        except KeyboardInterrupt:
+            print("⏹️ 기다리기를 멈췄어요. 지금까지 끝난 결과만 저장해요")
+
+        address_data = store.collect(job_id)
+        excel_handler.save_results(address_data, output_path)
+    finally:
+        store.close()
+
+    print(f"💾 결과 파일: {output_path}")
+
+def run_worker(args):
+    """작업 저장소에서 단위를 빌려서 이 PC의 API 키로 검색"""
+    from utils.distributed_jobs import SharedJobStore, DistributedWorker
+    from utils.kakao_api import KakaoAPI
+    from utils.keyword_stats import KeywordStats
+    from utils.lookup_scheduler import LookupScheduler, NegativeResultStore
+    from utils.offline_geocoder import OfflineGeocoder
+    from utils.quota import UsageLedger
+    from utils.response_archive import ResponseArchive
+    from utils.results_store import ResultsStore
+    from utils.verification import MatchVerifier
+
+    api_keys = [key.strip() for key in args.api_key.split(",") if key.strip()]
+    archive = ResponseArchive()
+    kakao_api = KakaoAPI(api_keys[0], keyword_stats=KeywordStats(), ledger=UsageLedger(),
+                         backup_keys=api_keys[1:], geocoder=OfflineGeocoder.open_if_exists(),
+                         archive=archive)
+    verifier = MatchVerifier(kakao_api)
+    scheduler = LookupScheduler(verifier.wrap(kakao_api.find_contact_info),
+                                negative_store=NegativeResultStore(), row_delay=0.15)
+    store = SharedJobStore(args.job_store)
+    results_store = ResultsStore()
+
+    try:
+        worker = DistributedWorker(store, scheduler, results_store=results_store)
+        worker.run(wait_for_work=args.wait)
+    except KeyboardInterrupt:
+        print("⏹️ 워커를 멈췄어요 (하던 단위는 빌린 시간이 지나면 다른 워커가 가져가요)")
+    finally:
+        kakao_api.keyword_stats.save()
+        kakao_api.ledger.save()
+        archive.close()
+        results_store.close()
+        store.close()
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="연락처 매핑 프로그램")
+    parser.add_argument('--profile', metavar='엑셀파일', help="화면 없이 한 사이클 돌리면서 프로파일링")
+    parser.add_argument('--stream', metavar='엑셀파일', help="화면 없이 큰 파일을 단계별로 처리")
+    parser.add_argument('--workers', type=int, default=1, help="단계별 처리의 검색 스레드 수")
+    parser.add_argument('--parallel', metavar='엑셀파일', help="키마다 프로세스 하나로 나눠 검색 (공유 메모리)")
+    parser.add_argument('--rematch', metavar='엑셀파일', help="보관된 응답으로 다시 매칭 (API 호출 없음)")
+    parser.add_argument('--distribute', metavar='엑셀파일', help="여러 PC로 나눠 검색 (코디네이터)")
+    parser.add_argument('--work', action='store_true', help="나눠 검색하는 워커로 실행")
+    parser.add_argument('--job-store', help="공유 작업 저장소 파일 경로 (--distribute / --work)")
+    parser.add_argument('--job-id', type=int, help="이미 만든 작업을 이어서 기다리기 (--distribute)")
+    parser.add_argument('--unit-size', type=int, default=200, help="작업 단위 크기 (행)")
+    parser.add_argument('--wait', action='store_true', help="워커: 남은 단위가 없어도 새 작업을 기다림")
+    parser.add_argument('--gateway', action='store_true', help="로컬 검색 게이트웨이 실행")
+    parser.add_argument('--port', type=int, help="게이트웨이 포트 (기본 8780)")
+    parser.add_argument('--api-key', help="카카오 API 키 (게이트웨이/--parallel은 쉼표로 여러 개)")
+    parser.add_argument('--output', help="결과 엑셀 경로 (--profile / --stream / --parallel / --rematch / --distribute)")
+    parser.add_argument('--limit', type=int, help="앞에서부터 이 개수만 검색")
+    parser.add_argument('--interval', type=float, default=5, help="샘플 간격 (ms)")
+    args = parser.parse_args()
+
+    if args.gateway:
+        if not args.api_key:
+            parser.error("--gateway 에는 --api-key 가 필요해요")
+        from utils.lookup_gateway import serve, DEFAULT_PORT
+        serve([key.strip() for key in args.api_key.split(",") if key.strip()],
+              port=args.port or DEFAULT_PORT)
+        return
+
+    if args.distribute or args.work:
+        if not args.job_store:
+            parser.error("--distribute / --work 에는 --job-store 가 필요해요")
+        if args.work:
+            if not args.api_key:
+                parser.error("--work 에는 --api-key 가 필요해요")
+            run_worker(args)
+        else:
+            run_coordinator(args)
+        return
+
+    if args.parallel:
+        if not args.api_key:
+            parser.error("--parallel 에는 --api-key 가 필요해요")
+        run_parallel(args)
+        return
+
+    if args.rematch:
+        run_rematch(args)
+        return
+
+    if args.stream:
+        if not args.api_key:
+            parser.error("--stream 에는 --api-key 가 필요해요")
+        run_stream(args)
+        return
+
+    if args.profile:
+        if not args.api_key:
+            parser.error("--profile 에는 --api-key 가 필요해요")
+        run_profile(args)
+        return
+
+    import tkinter as tk
+    from tkinter import messagebox
+
+    try:
+        from gui.contact_window import ContactMappingApp
+    except ImportError as e:
+        print(f"❌ 필요한 파일을 찾을 수 없어요: {e}")
+        print("📁 파일 구조를 확인해주세요!")
+        sys.exit(1)
+
     try:
         print("📞 연락처 매핑 프로그램을 시작해요!")
-        
+
         # 메인 윈도우 생성
         root = tk.Tk()
         app = ContactMappingApp(root)
-        
+
         print("✅ 연락처 매핑 GUI 준비 완료!")
-        
+
         # 프로그램 실행
         root.mainloop()
-        
+
     except Exception as e:
         print(f"❌ 프로그램 실행 중 오류: {e}")
         messagebox.showerror("오류", f"프로그램 실행 실패:\n{str(e)}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
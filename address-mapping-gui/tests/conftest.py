@@ -0,0 +1,7 @@
+# tests/conftest.py
+# address-mapping-gui 폴더에서 실행하는 것처럼 utils를 가져올 수 있게
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
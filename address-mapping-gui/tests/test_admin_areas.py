@@ -0,0 +1,58 @@
+# tests/test_admin_areas.py
+# 행정구역 색인과 법정동코드 파일 가져오기
+
+import json
+
+from utils.admin_areas import AdminAreaIndex, NO_DISTRICT, import_legal_dong_file
+
+
+def write_legal_dong_file(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("법정동코드\t법정동명\t폐지여부\n")
+        for line in lines:
+            f.write(line + "\n")
+
+
+def test_import_sejong_line(tmp_path):
+    """시군구가 없는 세종 행은 NO_DISTRICT 자리에 들어가고 색인도 만들어져요"""
+    source = tmp_path / "법정동.txt"
+    output = tmp_path / "admin_areas.json"
+    write_legal_dong_file(source, ["3611025000\t세종특별자치시 조치원읍\t존재"])
+
+    assert import_legal_dong_file(str(source), encoding='utf-8', output_path=str(output)) == 1
+    with open(output, encoding='utf-8') as f:
+        assert json.load(f) == {"세종특별자치시": {NO_DISTRICT: ["조치원읍"]}}
+
+    index = AdminAreaIndex.load(str(output))
+    assert index.validate("세종특별자치시", "세종시", "조치원읍")['status'] == 'ok'
+    assert index.validate("세종특별자치시", "세종시", "없는읍")['status'] == 'invalid'
+
+
+def test_old_file_with_empty_district(tmp_path):
+    """예전에 빈 시군구("")로 저장된 파일도 읽어요"""
+    output = tmp_path / "admin_areas.json"
+    output.write_text(json.dumps({"세종특별자치시": {"": ["조치원읍"]}}, ensure_ascii=False),
+                      encoding='utf-8')
+
+    index = AdminAreaIndex.load(str(output))
+    assert index.validate("세종", "세종시", "조치원")['dong'] == "조치원읍"
+
+
+def test_validate_fixes_common_variants(tmp_path):
+    source = tmp_path / "법정동.txt"
+    output = tmp_path / "admin_areas.json"
+    write_legal_dong_file(source, [
+        "2626010800\t부산광역시 동래구 온천동\t존재",
+        "4111113000\t경기도 수원시 장안구 파장동\t존재",
+        "2626099999\t부산광역시 동래구 없어진동\t폐지"
+    ])
+    import_legal_dong_file(str(source), encoding='utf-8', output_path=str(output))
+    index = AdminAreaIndex.load(str(output))
+
+    result = index.validate("부산", "동래", "온천1동")
+    assert (result['city'], result['district'], result['dong'], result['status']) == \
+        ("부산광역시", "동래구", "온천동", 'fixed')
+
+    assert index.validate("경기도", "장안구", "파장동")['district'] == "수원시 장안구"
+    assert index.validate("부산광역시", "동래구", "없어진동")['status'] == 'invalid'
+    assert index.validate("없는도", "동래구", "온천동")['status'] == 'invalid'
@@ -0,0 +1,32 @@
+# tests/test_batch_loader.py
+# 여러 엑셀 파일 일괄 읽기
+
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+import utils.batch_loader as batch_loader
+from utils.batch_loader import BatchJob
+from utils.excel_handler import OperationCancelledError
+
+
+def slow_parse(file_path):
+    """아주 큰 파일처럼 오래 걸리는 읽기"""
+    time.sleep(3)
+    return {}
+
+
+def test_cancel_while_parsing(monkeypatch):
+    """파일을 읽는 중에 취소하면 읽기가 끝날 때까지 기다리지 않고 바로 멈춰요"""
+    if multiprocessing.get_start_method() != 'fork':
+        pytest.skip("가짜 읽기 함수를 넘기려면 fork가 필요해요")
+    monkeypatch.setattr(batch_loader, 'parse_workbook', slow_parse)
+    cancel_event = threading.Event()
+    threading.Timer(0.3, cancel_event.set).start()
+
+    started = time.time()
+    with pytest.raises(OperationCancelledError):
+        BatchJob().load(["큰파일.xlsx"], max_workers=1, cancel_event=cancel_event)
+    assert time.time() - started < 2
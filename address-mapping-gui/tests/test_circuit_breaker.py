@@ -0,0 +1,106 @@
+# tests/test_circuit_breaker.py
+# 회로 차단기와 거부된 API 키 처리
+
+import pytest
+import requests
+
+from utils.api_errors import APIKeyRejectedError, TransientAPIError
+from utils.circuit_breaker import CircuitBreaker
+from utils.kakao_api import KakaoAPI
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    """키마다 정해진 상태 코드로 답하는 세션"""
+
+    def __init__(self, status_by_key):
+        self.status_by_key = status_by_key
+        self.headers = {}
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        api_key = self.headers['Authorization'].split()[-1]
+        self.calls.append(api_key)
+        return FakeResponse(self.status_by_key[api_key], {'documents': []})
+
+
+def make_api(status_by_key):
+    keys = list(status_by_key)
+    api = KakaoAPI(keys[0], backup_keys=keys[1:])
+    api.session = FakeSession(status_by_key)
+    api._use_key(keys[0])
+    api.rate_limiter.wait = lambda priority=False: None
+    return api
+
+
+def test_opens_after_failures_and_closes_after_probe():
+    """연속 실패하면 열리고, 확인 요청이 성공하면 다시 닫혀요"""
+    healthy = []
+    breaker = CircuitBreaker("테스트", failure_threshold=2, open_seconds=0, probe=lambda: bool(healthy))
+
+    breaker.record_failure()
+    assert breaker.is_closed()
+    breaker.record_failure()
+    assert not breaker.is_closed()
+
+    assert not breaker.allow()  # 확인 실패 → 다시 열림
+    healthy.append(True)
+    assert breaker.allow()
+    assert breaker.is_closed()
+
+
+def test_dead_breaker_never_probes():
+    """사용 불가가 된 키는 확인 요청도 안 보내고, 성공 기록으로도 살아나지 않아요"""
+    probes = []
+    breaker = CircuitBreaker("테스트", open_seconds=0, probe=lambda: probes.append(1) or True)
+
+    breaker.mark_dead("키가 거부됐어요 (HTTP 401)")
+    breaker.record_success()
+
+    assert not breaker.allow()
+    assert breaker.is_dead()
+    assert probes == []
+    assert "사용 불가" in breaker.format_status()
+
+
+def test_rejected_key_is_skipped_and_others_keep_working():
+    """401을 받은 키만 빼고 같은 요청을 다음 키로 바로 다시 보내요"""
+    api = make_api({'bad': 401, 'good': 200})
+
+    assert api._get(api.address_url, {'query': '서울'}) == {'documents': []}
+    assert api.session.calls == ['bad', 'good']
+    assert api.api_key == 'good'
+    assert len(api.get_rejected_keys()) == 1
+
+    api._get(api.address_url, {'query': '부산'})
+    assert api.session.calls == ['bad', 'good', 'good']
+
+
+def test_all_keys_rejected_stops():
+    """모든 키가 거부되면 재시도하지 않는 오류로 멈춰요"""
+    api = make_api({'bad1': 403, 'bad2': 401})
+
+    with pytest.raises(APIKeyRejectedError):
+        api._get(api.address_url, {'query': '서울'})
+    assert api.session.calls == ['bad1', 'bad2']
+
+
+def test_broken_response_counts_as_failure():
+    """응답이 중간에 끊기는 오류도 일시 오류로 올리고 차단기에 실패로 세요"""
+    api = make_api({'key': 200})
+
+    def broken_get(url, params=None, headers=None, timeout=None):
+        raise requests.exceptions.ChunkedEncodingError("응답이 끊겼어요")
+
+    api.session.get = broken_get
+    with pytest.raises(TransientAPIError):
+        api._get(api.address_url, {'query': '서울'})
+    assert api.breakers['key'].failures == 1
@@ -0,0 +1,65 @@
+# tests/test_distributed_jobs.py
+# 여러 PC가 같이 쓰는 작업 저장소 (빌리기/돌려주기)
+
+import time
+
+from utils.distributed_jobs import SharedJobStore, DONE, LEASED, PENDING
+
+
+def make_rows(count):
+    return [{'id': number + 1, 'address': f"서울 강남구 역삼동 {number}", 'status': '대기중'}
+            for number in range(count)]
+
+
+def test_lease_and_complete(tmp_path):
+    """빌린 단위는 다른 워커가 못 가져가고, 결과를 돌려주면 원래 순서대로 합쳐져요"""
+    store = SharedJobStore(str(tmp_path / "jobs.sqlite3"))
+    try:
+        job_id = store.create_job(make_rows(5), unit_size=2)
+
+        unit_a, job_a, rows_a = store.lease("A")
+        unit_b, _, rows_b = store.lease("B")
+        assert job_a == job_id and unit_a != unit_b
+        assert [row['id'] for row in rows_a] == [1, 2]
+        assert [row['id'] for row in rows_b] == [3, 4]
+
+        progress = store.get_progress(job_id)
+        assert progress[LEASED] == 2 and progress[PENDING] == 1
+        assert progress['workers'] == {"A", "B"}
+
+        for row in rows_b:
+            row['status'] = '성공'
+        assert store.complete(unit_b, "B", rows_b)
+        assert not store.complete(unit_b, "B", rows_b)  # 이미 끝난 단위는 다시 안 받음
+
+        # 돌려놓은 단위는 바로 다음 워커가 가져감
+        store.release(unit_a, "A")
+        assert store.lease("C")[0] == unit_a
+
+        rows = store.collect(job_id)
+        assert [row['id'] for row in rows] == [1, 2, 3, 4, 5]
+        assert [row['status'] for row in rows] == ['대기중', '대기중', '성공', '성공', '대기중']
+    finally:
+        store.close()
+
+
+def test_expired_lease_is_taken_over(tmp_path):
+    """소식이 끊긴 단위는 다른 워커가 가져가고, 먼저 끝낸 결과만 받아요"""
+    store = SharedJobStore(str(tmp_path / "jobs.sqlite3"))
+    try:
+        job_id = store.create_job(make_rows(2), unit_size=2)
+
+        unit_id, _, rows = store.lease("A", lease_seconds=0.05)
+        assert store.lease("B") is None
+        time.sleep(0.1)
+
+        assert store.lease("B")[0] == unit_id
+        assert not store.heartbeat(unit_id, "A")  # 넘어간 단위는 연장 못 함
+        assert store.heartbeat(unit_id, "B")
+
+        assert store.complete(unit_id, "A", rows)
+        assert not store.complete(unit_id, "B", rows)
+        assert store.get_progress(job_id)[DONE] == 1
+        assert store.lease("C") is None
+    finally:
+        store.close()
@@ -0,0 +1,61 @@
+# tests/test_excel_handler.py
+# 결과 파일 저장 (진행률/취소)
+
+import threading
+
+import pytest
+
+import utils.excel_handler as excel_handler
+from utils.excel_handler import ExcelHandler, OperationCancelledError
+
+
+def make_rows(count):
+    return [{'id': number + 1, 'city': '서울', 'district': '강남구', 'dong': '역삼동',
+             'street_number': str(number), 'address': f"서울 강남구 역삼동 {number}",
+             'additional_info': '', 'status': '성공', 'place_name': '가게', 'phone': '02-000-0000',
+             'category': '음식점', 'error': None} for number in range(count)]
+
+
+def test_save_reports_write_and_save_stages(tmp_path, monkeypatch):
+    """행 쓰기 뒤 파일 마무리 중에도 진행률이 오고, 저장한 파일은 다시 읽혀요"""
+    monkeypatch.setattr(excel_handler, 'SAVE_PROGRESS_BYTES', 1024)
+    handler = ExcelHandler()
+    output = tmp_path / "결과.xlsx"
+    stages = []
+
+    handler.save_results(make_rows(2000), str(output),
+                         progress_callback=lambda stage, done, total: stages.append(stage))
+
+    assert stages[0] == 'write' and stages[-1] == 'save'
+    baseline = handler.load_baseline(str(output))
+    assert len(baseline) == 2000
+    assert baseline[1]['street_number'] == '1' and baseline[1]['phone'] == '02-000-0000'
+
+
+def test_cancel_while_finishing_file(tmp_path, monkeypatch):
+    """파일 마무리 중에 취소하면 결과 파일도 임시 파일도 남지 않아요"""
+    monkeypatch.setattr(excel_handler, 'SAVE_PROGRESS_BYTES', 1024)
+    handler = ExcelHandler()
+    cancel_event = threading.Event()
+
+    def on_progress(stage, done, total):
+        if stage == 'save':
+            cancel_event.set()
+
+    with pytest.raises(OperationCancelledError):
+        handler.save_results(make_rows(2000), str(tmp_path / "결과.xlsx"),
+                             progress_callback=on_progress, cancel_event=cancel_event)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_replace_removes_temp_file(tmp_path, monkeypatch):
+    """결과 파일이 열려 있어서 바꿔치기에 실패해도 임시 파일은 남지 않아요"""
+    def locked_replace(source, target):
+        raise PermissionError("다른 프로그램이 파일을 사용 중")
+
+    monkeypatch.setattr(excel_handler.os, 'replace', locked_replace)
+    handler = ExcelHandler()
+
+    with pytest.raises(Exception, match="저장할 수 없어요"):
+        handler.save_results(make_rows(10), str(tmp_path / "결과.xlsx"))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,40 @@
+# tests/test_keyword_stats.py
+# 동네별 키워드 적중 통계와 시도 순서
+
+import random
+
+from utils.keyword_stats import KeywordStats
+
+ADDRESS = "서울 강남구 역삼동 1"
+
+
+def make_stats(tmp_path, **options):
+    return KeywordStats(str(tmp_path / "keyword_stats.json"), rng=random.Random(1), **options)
+
+
+def test_pruned_keyword_gets_explored_and_can_come_back(tmp_path):
+    """계속 안 맞은 키워드도 가끔 맨 뒤에서 다시 시도하고, 맞으면 다시 순서에 들어가요"""
+    stats = make_stats(tmp_path, prune_after=3, explore_rate=0.5)
+    stats.record('kakao', ADDRESS, ['음식점'], '음식점')
+    for _ in range(3):
+        stats.record('kakao', ADDRESS, ['카페'])
+
+    orders = [stats.order_keywords('kakao', ADDRESS, ['카페', '음식점']) for _ in range(40)]
+    assert ['음식점'] in orders
+    assert ['음식점', '카페'] in orders
+
+    stats.record('kakao', ADDRESS, ['음식점', '카페'], '카페')
+    assert all('카페' in stats.order_keywords('kakao', ADDRESS, ['카페', '음식점']) for _ in range(20))
+
+
+def test_district_counts_fill_in_for_new_area(tmp_path):
+    """기록이 적은 동은 같은 구의 다른 동 기록을 반쯤 섞어서 써요 (저장했다 읽어도 같음)"""
+    stats = make_stats(tmp_path)
+    for _ in range(4):
+        stats.record('kakao', "서울 강남구 삼성동 1", ['음식점', '카페'], '카페')
+    stats.record('kakao', "서울 강남구 논현동 1", ['카페'])
+    stats.record('kakao', ADDRESS, ['카페'])
+
+    assert stats._get_counts('kakao', "강남구 역삼동", '카페') == (1 + 2.5, 0 + 2.0)
+    stats.save()
+    assert make_stats(tmp_path)._get_counts('kakao', "강남구 역삼동", '카페') == (3.5, 2.0)
@@ -0,0 +1,78 @@
+# tests/test_lookup_scheduler.py
+# 검색 스케줄러와 결과 없음 저장소
+
+from datetime import date, timedelta
+
+from utils.api_errors import ContactNotFoundError, TransientAPIError
+from utils.lookup_scheduler import (LookupScheduler, NegativeResultStore, FAILURE_NOT_FOUND,
+                                    FAILURE_SKIPPED, FAILURE_TRANSIENT)
+
+
+def make_rows(*addresses):
+    return [{'id': number, 'address': address, 'status': '대기중'}
+            for number, address in enumerate(addresses, start=1)]
+
+
+def test_negative_store_retry_date_and_save(tmp_path):
+    """못 찾은 주소는 재시도 날짜까지 건너뛰고, 저장할 때 지난 기록은 정리돼요"""
+    path = str(tmp_path / "negative.json")
+    store = NegativeResultStore(path, retry_after_days=30)
+    today = date.today()
+    store.add("서울 강남구 역삼동 1", "없음", today=today)
+    store.add("서울 강남구 역삼동 2", "없음", today=today - timedelta(days=31))
+
+    retry_after = (today + timedelta(days=30)).isoformat()
+    assert store.get_retry_after("서울 강남구 역삼동 1", today=today + timedelta(days=29)) == retry_after
+    assert store.get_retry_after("서울 강남구 역삼동 1", today=today + timedelta(days=30)) is None
+
+    store.save()
+    reloaded = NegativeResultStore(path)
+    assert list(reloaded.entries) == ["서울 강남구 역삼동 1"]
+
+    reloaded.remove("서울 강남구 역삼동 1")
+    assert reloaded.get_retry_after("서울 강남구 역삼동 1") is None
+
+
+def test_duplicate_of_missed_address_reuses_result(tmp_path):
+    """첫 행이 방금 못 찾은 주소의 중복 행은 건너뜀이 아니라 같은 결과로 채워져요"""
+    calls = []
+
+    def lookup(address):
+        calls.append(address)
+        raise ContactNotFoundError("전화번호 없음")
+
+    store = NegativeResultStore(str(tmp_path / "negative.json"))
+    scheduler = LookupScheduler(lookup, negative_store=store)
+    rows = make_rows("서울 A", "서울 A")
+    stats = scheduler.run(rows)
+
+    assert calls == ["서울 A"]
+    assert stats['duplicates'] == 1 and stats['skipped'] == 0
+    assert [row['failure_reason'] for row in rows] == [FAILURE_NOT_FOUND, FAILURE_NOT_FOUND]
+    assert rows[1]['error'] == "전화번호 없음"
+
+    # 다음 실행에서는 기록을 보고 건너뜀
+    rows = make_rows("서울 A")
+    assert scheduler.run(rows)['skipped'] == 1
+    assert rows[0]['failure_reason'] == FAILURE_SKIPPED
+
+
+def test_transient_errors_are_retried():
+    """일시 오류는 다시 시도하고, 끝까지 실패하면 일시 오류로 남겨요"""
+    attempts = {}
+
+    def lookup(address):
+        attempts[address] = attempts.get(address, 0) + 1
+        if address == "서울 B" and attempts[address] == 1:
+            raise TransientAPIError("시간 초과")
+        if address == "서울 C":
+            raise TransientAPIError("시간 초과")
+        return {'place_name': '가게', 'phone': '02-000-0000'}
+
+    scheduler = LookupScheduler(lookup, max_attempts=2, base_delay=0.01, max_delay=0.01)
+    rows = make_rows("서울 B", "서울 C")
+    stats = scheduler.run(rows)
+
+    assert rows[0]['status'] == '성공'
+    assert rows[1]['status'] == '실패' and rows[1]['failure_reason'] == FAILURE_TRANSIENT
+    assert stats['retried'] == 2
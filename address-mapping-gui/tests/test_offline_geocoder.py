@@ -0,0 +1,44 @@
+# tests/test_offline_geocoder.py
+# 주소 좌표 CSV 가져오기와 주소 키
+
+from utils.offline_geocoder import OfflineGeocoder, normalize_address_key
+
+
+def test_mountain_lot_keeps_its_own_key(tmp_path):
+    """산 번지와 같은 숫자의 일반 번지는 서로 덮어쓰지 않고 각자 찾아져요"""
+    source = tmp_path / "coords.csv"
+    source.write_text(
+        "시도명,시군구명,법정읍면동명,산여부,지번본번,지번부번,위도,경도\n"
+        "서울특별시,종로구,청운동,0,12,3,37.1,126.1\n"
+        "서울특별시,종로구,청운동,1,12,3,37.2,126.2\n",
+        encoding='utf-8'
+    )
+
+    geocoder = OfflineGeocoder(str(tmp_path / "coords.sqlite3"))
+    try:
+        assert geocoder.import_csv(str(source), encoding='utf-8') == 2
+        assert geocoder.count() == 2
+        assert geocoder.lookup("서울 종로구 청운동 12-3")['lat'] == 37.1
+        assert geocoder.lookup("서울 종로구 청운동 산12-3")['lat'] == 37.2
+        assert geocoder.lookup("서울 종로구 청운동 산 12-3번지")['lat'] == 37.2
+    finally:
+        geocoder.close()
+
+
+def test_file_without_mountain_column(tmp_path):
+    """산여부 컬럼이 없는 파일은 모두 일반 번지로 가져와요"""
+    source = tmp_path / "coords.csv"
+    source.write_text("시도명,시군구명,법정읍면동명,지번본번,지번부번,위도,경도\n"
+                      "부산광역시,동래구,온천동,871,95,35.2,129.1\n", encoding='utf-8')
+
+    geocoder = OfflineGeocoder(str(tmp_path / "coords.sqlite3"))
+    try:
+        geocoder.import_csv(str(source), encoding='utf-8')
+        assert geocoder.lookup("부산 동래구 온천동 871-95번지")['lng'] == 129.1
+    finally:
+        geocoder.close()
+
+
+def test_address_key():
+    assert normalize_address_key("부산 동래구 온천동 871-0번지") == "부산광역시동래구온천동871"
+    assert normalize_address_key("서울 종로구 청운동 산 12-3") == "서울특별시종로구청운동산12-3"
@@ -0,0 +1,76 @@
+# tests/test_pipeline.py
+# 단계별 파이프라인: 끝까지 흘려보내기, 멈춤, 멈춘 뒤 남은 입력 흘려보내기
+
+import threading
+
+from utils.pipeline import Pipeline, Stage
+
+
+def make_pipeline(collected, stop_after=None):
+    """double → slow → sink (stop_after개를 받으면 멈춤 요청)"""
+    stop_event = threading.Event()
+
+    def double(item, emit):
+        emit(item * 2)
+
+    def slow(item, emit):
+        if stop_after is not None and item // 2 >= stop_after:
+            stop_event.set()
+        emit(('looked_up', item))
+
+    def sink(item, emit):
+        collected.append(item)
+
+    pipeline = Pipeline([
+        Stage('double', double, queue_size=2),
+        Stage('slow', slow, workers=2, queue_size=2),
+        Stage('sink', sink, queue_size=2)
+    ])
+    return pipeline, stop_event
+
+
+def test_runs_every_item_through_all_stages():
+    collected = []
+    pipeline, _ = make_pipeline(collected)
+    pipeline.run(range(100))
+
+    assert sorted(value for _, value in collected) == [i * 2 for i in range(100)]
+    stats = {stage['name']: stage for stage in pipeline.get_stats()}
+    assert stats['sink']['processed'] == 100
+    assert stats['double']['errors'] == 0
+
+
+def test_stop_without_drain_stops_reading():
+    collected = []
+    pipeline, stop_event = make_pipeline(collected, stop_after=10)
+    pipeline.run(range(1000), should_stop=stop_event.is_set)
+
+    assert len(collected) < 1000
+
+
+def test_stop_with_drain_keeps_every_item():
+    """멈춘 뒤 들어온 item은 중간 단계를 건너뛰고 sink로 (하나도 빠지지 않음)"""
+    collected = []
+    pipeline, stop_event = make_pipeline(collected, stop_after=10)
+    pipeline.run(range(1000), should_stop=stop_event.is_set, drain_to='sink')
+
+    looked_up = [value for value in collected if isinstance(value, tuple)]
+    drained = [value for value in collected if not isinstance(value, tuple)]
+    assert len(collected) == 1000
+    assert drained and len(looked_up) < 1000
+    assert sorted([value for _, value in looked_up] + drained) == [i * 2 for i in range(1000)]
+
+
+def test_stage_errors_are_counted_not_raised():
+    collected = []
+
+    def broken(item, emit):
+        if item % 2:
+            raise ValueError("홀수")
+        emit(item)
+
+    pipeline = Pipeline([Stage('broken', broken), Stage('sink', lambda item, emit: collected.append(item))])
+    pipeline.run(range(10))
+
+    assert collected == [0, 2, 4, 6, 8]
+    assert pipeline.get_stats()[0]['errors'] == 5
@@ -0,0 +1,72 @@
+# tests/test_prefetch.py
+# 매핑 시작 전 좌표 미리 구하기
+
+import threading
+
+from utils.kakao_api import KakaoAPI
+from utils.prefetch import Prefetcher
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, query):
+        self.query = query
+
+    def json(self):
+        return {'documents': [{'x': '127.0', 'y': '37.5', 'address_name': self.query}]}
+
+
+class BusySession:
+    """미리 구하기 호출마다 다른 스레드(매핑)도 같은 KakaoAPI로 호출 1번을 하는 세션"""
+
+    def __init__(self):
+        self.headers = {}
+        self.api = None
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        if threading.current_thread().daemon and threading.current_thread().name != "mapping":
+            other = threading.Thread(target=self.api._get, args=(url, {'query': '매핑 중인 주소'}),
+                                     name="mapping")
+            other.start()
+            other.join()
+        return FakeResponse(params['query'])
+
+
+def make_api():
+    api = KakaoAPI("key")
+    api.session = BusySession()
+    api.session.api = api
+    api.rate_limiter.wait = lambda priority=False: None
+    return api
+
+
+def run_prefetch(prefetcher, rows):
+    done = threading.Event()
+    prefetcher.start(rows, on_done=lambda stats: done.set())
+    assert done.wait(5)
+
+
+def test_budget_counts_only_prefetch_calls():
+    """같은 KakaoAPI로 동시에 하는 호출은 미리 구하기 예산에 안 들어가요"""
+    api = make_api()
+    rows = [{'address': f"서울 강남구 역삼동 {number}", 'status': '대기중'} for number in range(10)]
+    prefetcher = Prefetcher(api, budget=4)
+
+    run_prefetch(prefetcher, rows)
+
+    assert prefetcher.stats == {'geocoded': 4, 'calls': 4, 'skipped': 0}
+    assert api.call_count == 8
+
+
+def test_stats_reset_on_each_start():
+    """다시 시작하면 예산을 처음부터 써요"""
+    api = make_api()
+    rows = [{'address': f"서울 강남구 역삼동 {number}", 'status': '대기중'} for number in range(10)]
+    prefetcher = Prefetcher(api, budget=3)
+
+    run_prefetch(prefetcher, rows)
+    run_prefetch(prefetcher, rows)
+
+    assert prefetcher.stats['calls'] == 3
+    assert len(api.coords_cache) == 6
@@ -0,0 +1,68 @@
+# tests/test_response_archive.py
+# 원본 응답 보관과 재매칭
+
+from utils.kakao_api import KakaoAPI
+from utils.lookup_scheduler import LookupScheduler, FAILURE_SKIPPED
+from utils.response_archive import ResponseArchive, rematch_addresses
+from utils.spatial_clustering import ClusterPlanner
+
+PLACES = [
+    {'place_name': '역삼 식당', 'phone': '02-111-1111', 'address_name': '서울 강남구 역삼동 1',
+     'x': '127.0010', 'y': '37.5000', 'category_name': '음식점'},
+    {'place_name': '역삼 카페', 'phone': '02-222-2222', 'address_name': '서울 강남구 역삼동 2',
+     'x': '127.0020', 'y': '37.5000', 'category_name': '카페'},
+]
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    """좌표 검색과 영역 검색에만 답하는 세션 (그 밖의 검색은 결과 없음)"""
+
+    def __init__(self):
+        self.headers = {}
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        if 'address' in url:
+            number = params['query'].split()[-1]
+            return FakeResponse({'documents': [{'x': f"127.00{number}", 'y': '37.5000',
+                                                'address_name': params['query']}]})
+        if 'rect' in params:
+            return FakeResponse({'documents': PLACES, 'meta': {'is_end': True, 'total_count': 2}})
+        return FakeResponse({'documents': [], 'meta': {'is_end': True, 'total_count': 0}})
+
+
+def make_rows(*addresses):
+    return [{'id': number, 'address': address, 'status': '대기중'}
+            for number, address in enumerate(addresses, start=1)]
+
+
+def test_rematch_replays_cluster_plan(tmp_path):
+    """묶음 검색으로 찾은 주소도 재매칭에서 같은 결과가 나오고, 보관 안 된 주소는 건너뜀으로 남아요"""
+    archive = ResponseArchive(str(tmp_path / "responses.sqlite3"))
+    try:
+        api = KakaoAPI("key", archive=archive)
+        api.session = FakeSession()
+        api.rate_limiter.wait = lambda priority=False: None
+        planner = ClusterPlanner(api)
+        rows = make_rows("서울 강남구 역삼동 1", "서울 강남구 역삼동 2")
+        planner.plan(rows)
+        LookupScheduler(planner.lookup).run(rows)
+        assert [row['phone'] for row in rows] == ['02-111-1111', '02-222-2222']
+
+        rows = make_rows("서울 강남구 역삼동 1", "서울 강남구 역삼동 2", "서울 강남구 역삼동 9")
+        stats = rematch_addresses(rows, archive)
+
+        assert [row['phone'] for row in rows[:2]] == ['02-111-1111', '02-222-2222']
+        assert rows[2]['status'] == '실패' and rows[2]['failure_reason'] == FAILURE_SKIPPED
+        assert stats['unreplayable'] == 1
+    finally:
+        archive.close()
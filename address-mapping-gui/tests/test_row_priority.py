@@ -0,0 +1,70 @@
+# tests/test_row_priority.py
+# 기록 저장소의 적중 통계와 행 우선순위 추정
+
+import sqlite3
+
+from utils.lookup_scheduler import (FAILURE_NOT_FOUND, FAILURE_INVALID, FAILURE_SKIPPED,
+                                    FAILURE_TRANSIENT)
+from utils.results_store import ResultsStore
+from utils.row_priority import HitEstimator
+
+
+def make_row(number, status, district='강남구', dong='역삼동', street_number='1', reason=None):
+    return {'address': f"서울 {district} {dong} {number}", 'city': '서울', 'district': district,
+            'dong': dong, 'street_number': street_number, 'status': status,
+            'phone': '02-000-0000' if status == '성공' else None, 'failure_reason': reason}
+
+
+def test_outcome_counts_only_count_searched_misses(tmp_path):
+    """검색하지 않은 실패(주소 확인 필요/건너뜀/일시 오류)는 못 찾은 수에 안 들어가요"""
+    store = ResultsStore(str(tmp_path / "results.sqlite3"))
+    store.add_run([
+        make_row(1, '성공'),
+        make_row(2, '실패', reason=FAILURE_NOT_FOUND),
+        make_row(3, '실패', reason=FAILURE_INVALID),
+        make_row(4, '실패', reason=FAILURE_SKIPPED),
+        make_row(5, '실패', reason=FAILURE_TRANSIENT),
+    ])
+
+    assert sorted(store.get_outcome_counts()) == [('강남구', '역삼동', True, '성공', 1),
+                                                 ('강남구', '역삼동', True, '실패', 1)]
+
+
+def test_old_database_gets_failure_reasons(tmp_path):
+    """이유 칸이 없던 DB는 열 때 칸을 추가하고 오류 문구로 이유를 채워요"""
+    db_path = str(tmp_path / "results.sqlite3")
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE results (
+            id INTEGER PRIMARY KEY, run_id INTEGER NOT NULL, address_key TEXT NOT NULL,
+            address TEXT NOT NULL, city TEXT, district TEXT, dong TEXT, street_number TEXT,
+            additional_info TEXT, status TEXT NOT NULL, place_name TEXT, phone TEXT,
+            category TEXT, error TEXT, created_at TEXT NOT NULL
+        );
+        INSERT INTO results (run_id, address_key, address, district, dong, status, error, created_at)
+        VALUES (1, 'a', 'a', '강남구', '역삼동', '실패', '주소 확인 필요: 없는 동', '2026-01-01'),
+               (1, 'b', 'b', '강남구', '역삼동', '실패', '요청 시간 초과 (3회 시도)', '2026-01-01'),
+               (1, 'c', 'c', '강남구', '역삼동', '실패', '전화번호가 있는 장소를 찾지 못했어요', '2026-01-01');
+    """)
+    conn.commit()
+    conn.close()
+
+    store = ResultsStore(db_path)
+    assert store.get_outcome_counts() == [('강남구', '역삼동', False, '실패', 1)]
+
+
+def test_estimator_prefers_areas_with_hits(tmp_path):
+    """잘 찾던 동의 행이 못 찾던 동의 행보다 먼저, 검색하지 않을 행은 맨 뒤로"""
+    store = ResultsStore(str(tmp_path / "results.sqlite3"))
+    store.add_run([make_row(number, '성공', dong='역삼동') for number in range(10)] +
+                  [make_row(number, '실패', dong='삼성동', reason=FAILURE_NOT_FOUND) for number in range(10)])
+
+    estimator = HitEstimator(store)
+    rows = [make_row(1, '대기중', dong='삼성동'), make_row(2, '대기중', dong='역삼동'),
+            dict(make_row(3, '대기중'), invalid_address=True)]
+    ordered, scored = estimator.order(rows)
+
+    assert [addr['dong'] for addr in ordered[:2]] == ['역삼동', '삼성동']
+    assert ordered[2].get('invalid_address')
+    assert scored[2][2] == 0.0
+    assert estimator.get_hit_probability(rows[1]) > 0.5 > estimator.get_hit_probability(rows[0])
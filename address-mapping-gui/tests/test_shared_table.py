@@ -0,0 +1,87 @@
+# tests/test_shared_table.py
+# 공유 메모리 주소 표와 키별 프로세스 검색
+
+import pytest
+
+import utils.data_paths as data_paths
+import utils.shared_table as shared_table
+from utils.shared_table import SharedAddressTable, add_counts, subtract_counts
+
+
+def make_rows(count):
+    return [{'id': number + 1, 'address': f"서울 강남구 역삼동 {number}", 'city': '서울',
+             'district': '강남구', 'dong': '역삼동', 'street_number': str(number),
+             'status': '대기중'} for number in range(count)]
+
+
+def test_round_trip():
+    """입력 컬럼은 그대로 읽히고, 결과 칸에 쓴 값은 원래 목록으로 옮겨져요"""
+    rows = make_rows(3)
+    rows[1].update(invalid_address=True, address_note='없는 동')
+    rows[2].update(status='성공', phone='02-111-1111', place_name='미리 채운 가게')
+
+    with SharedAddressTable.create(rows) as table:
+        other = SharedAddressTable.attach(table.spec)
+        try:
+            row = other.get_row(1)
+            assert row['address'] == rows[1]['address']
+            assert row['invalid_address'] and row['address_note'] == '없는 동'
+            assert other.get_row(2)['phone'] == '02-111-1111'
+
+            # 칸보다 긴 값은 잘리고, 잘린 글자 조각은 버려요
+            other.write_result(0, {'status': '성공', 'place_name': '가' * 100, 'phone': '02-222-2222'})
+        finally:
+            other.close()
+
+        table.read_results(rows)
+
+    assert rows[0]['status'] == '성공'
+    assert rows[0]['place_name'] == '가' * 53
+    assert rows[1]['status'] == '대기중'
+    assert rows[2]['place_name'] == '미리 채운 가게'
+
+
+def test_counts_delta_round_trip():
+    """워커가 늘린 만큼만 빼서 다른 장부에 더할 수 있어요"""
+    base = {'usage': {'2026-10-19': {'key1': {'provider': 'kakao', 'calls': 10}}},
+            'kakao': {'강남구 역삼동': {'상호': [4, 1]}}}
+    current = {'usage': {'2026-10-19': {'key1': {'provider': 'kakao', 'calls': 15},
+                                        'key2': {'provider': 'kakao', 'calls': 2}}},
+               'kakao': {'강남구 역삼동': {'상호': [6, 2], '전화': [0, 0]}}}
+
+    delta = subtract_counts(current, base)
+    assert delta == {'usage': {'2026-10-19': {'key1': {'provider': 'kakao', 'calls': 5},
+                                              'key2': {'provider': 'kakao', 'calls': 2}}},
+                     'kakao': {'강남구 역삼동': {'상호': [2, 1]}}}
+
+    # 다른 프로세스가 그동안 저장한 값 위에 더해짐
+    saved = {'usage': {'2026-10-19': {'key1': {'provider': 'kakao', 'calls': 12}}}}
+    add_counts(saved, delta)
+    assert saved['usage']['2026-10-19'] == {'key1': {'provider': 'kakao', 'calls': 17},
+                                            'key2': {'provider': 'kakao', 'calls': 2}}
+    assert saved['kakao']['강남구 역삼동']['상호'] == [2, 1]
+
+
+def failing_worker(api_key):
+    """첫 묶음 결과를 쓰고 나서 오류로 죽는 워커"""
+    table = shared_table._worker_table
+    for row in table.claim(shared_table._worker_lock, size=5):
+        table.write_result(row, {'status': '성공', 'phone': f"02-{row}"})
+        table.count(shared_table._worker_lock, True)
+    raise RuntimeError("키 오류")
+
+
+def test_worker_failure_keeps_results(tmp_path, monkeypatch):
+    """워커가 죽어도 그때까지 쓴 결과는 옮겨 담고 오류는 반환값으로 알려줘요"""
+    if shared_table.get_context().get_start_method() != 'fork':
+        pytest.skip("가짜 워커를 넘기려면 fork가 필요해요")
+    monkeypatch.setattr(data_paths, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(shared_table, '_lookup_worker', failing_worker)
+
+    rows = make_rows(20)
+    stats = shared_table.run_parallel_lookup(rows, ['key1'], progress_interval=0.1)
+
+    assert stats['failures'] == ["RuntimeError: 키 오류"]
+    assert stats['processed'] == 5
+    assert [row['status'] for row in rows[:6]] == ['성공'] * 5 + ['대기중']
+    assert rows[4]['phone'] == "02-4"
@@ -0,0 +1,46 @@
+# tests/test_spatial_clustering.py
+# 가까운 주소 묶음 검색
+
+from utils.spatial_clustering import ClusterPlanner
+
+
+class FakeKakao:
+    """좌표는 모두 가까이, 영역 검색은 정해둔 응답을 페이지마다 돌려주는 가짜 API"""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get_coordinates(self, address):
+        return {'lat': 37.5, 'lng': 127.0}
+
+    def search_in_rect(self, rect, query, page=1, size=15):
+        return self.pages[page - 1]
+
+    def _is_address_similar(self, address, place_address):
+        return False
+
+
+ADDRESSES = [{'address': "서울 강남구 역삼동 1"}, {'address': "서울 강남구 역삼동 2"}]
+
+
+def plan(pages):
+    planner = ClusterPlanner(FakeKakao(pages))
+    planner.plan(ADDRESSES)
+    return planner
+
+
+def test_all_candidates_seen_skips_nearby_search():
+    """영역 안 장소를 다 받았으면 주소마다 근처 검색을 다시 안 해요"""
+    planner = plan([([{}] * 3, {'is_end': True, 'total_count': 3})])
+    assert planner.checked == {"서울 강남구 역삼동 1", "서울 강남구 역삼동 2"}
+
+
+def test_failed_or_capped_search_keeps_nearby_search():
+    """요청이 실패했거나 45곳 제한으로 다 못 받았으면 평소 근처 검색을 해요"""
+    assert plan([([], None)]).checked == set()
+
+    capped = [([{}] * 15, {'is_end': False, 'total_count': 120})] * 2
+    capped.append(([{}] * 15, {'is_end': True, 'total_count': 120}))
+    planner = plan(capped)
+    assert planner.checked == set()
+    assert planner.stats['search_calls'] == 3
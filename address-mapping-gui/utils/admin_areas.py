@@ -0,0 +1,292 @@
+# utils/admin_areas.py
+# 시도 → 시군구 → 읍면동 행정구역 색인 (주소를 API로 보내기 전에 미리 확인)
+# - 시도/시군구 목록은 이 파일에 들어 있고, 읍면동은 법정동코드 파일을 한 번 가져오면 함께 확인해요
+# - 흔한 변형은 자동으로 고쳐요: "부산" → "부산광역시", "동래" → "동래구", "장안구" → "수원시 장안구",
+#   "온천1동"(행정동) → "온천동"(법정동), "경상북도 군위군" → "대구광역시 군위군"
+# - 고칠 수 없는 주소는 검색하지 않고 "주소 확인 필요"로 표시
+#
+# 읍면동 가져오기: python -m utils.admin_areas 법정동코드_전체자료.txt [인코딩]
+#   (행정표준코드관리시스템의 "법정동코드 전체자료" - 탭으로 구분된 코드/이름/폐지여부)
+
+import json
+import os
+import re
+import sys
+
+from utils.data_paths import get_data_path
+from utils.offline_geocoder import CITY_ALIASES
+
+# 시도: 시군구 (괄호 안은 그 시의 일반구)
+BUNDLED_AREAS = """
+서울특별시: 종로구 중구 용산구 성동구 광진구 동대문구 중랑구 성북구 강북구 도봉구 노원구 은평구 서대문구 마포구 양천구 강서구 구로구 금천구 영등포구 동작구 관악구 서초구 강남구 송파구 강동구
+부산광역시: 중구 서구 동구 영도구 부산진구 동래구 남구 북구 해운대구 사하구 금정구 강서구 연제구 수영구 사상구 기장군
+대구광역시: 중구 동구 서구 남구 북구 수성구 달서구 달성군 군위군
+인천광역시: 중구 동구 미추홀구 연수구 남동구 부평구 계양구 서구 강화군 옹진군 제물포구 영종구 검단구
+광주광역시: 동구 서구 남구 북구 광산구
+대전광역시: 동구 중구 서구 유성구 대덕구
+울산광역시: 중구 남구 동구 북구 울주군
+세종특별자치시:
+경기도: 수원시(장안구 권선구 팔달구 영통구) 성남시(수정구 중원구 분당구) 의정부시 안양시(만안구 동안구) 부천시(원미구 소사구 오정구) 광명시 평택시 동두천시 안산시(상록구 단원구) 고양시(덕양구 일산동구 일산서구) 과천시 구리시 남양주시 오산시 시흥시 군포시 의왕시 하남시 용인시(처인구 기흥구 수지구) 파주시 이천시 안성시 김포시 화성시(만세구 효행구 병점구 동탄구) 광주시 양주시 포천시 여주시 연천군 가평군 양평군
+강원특별자치도: 춘천시 원주시 강릉시 동해시 태백시 속초시 삼척시 홍천군 횡성군 영월군 평창군 정선군 철원군 화천군 양구군 인제군 고성군 양양군
+충청북도: 청주시(상당구 서원구 흥덕구 청원구) 충주시 제천시 보은군 옥천군 영동군 증평군 진천군 괴산군 음성군 단양군
+충청남도: 천안시(동남구 서북구) 공주시 보령시 아산시 서산시 논산시 계룡시 당진시 금산군 부여군 서천군 청양군 홍성군 예산군 태안군
+전북특별자치도: 전주시(완산구 덕진구) 군산시 익산시 정읍시 남원시 김제시 완주군 진안군 무주군 장수군 임실군 순창군 고창군 부안군
+전라남도: 목포시 여수시 순천시 나주시 광양시 담양군 곡성군 구례군 고흥군 보성군 화순군 장흥군 강진군 해남군 영암군 무안군 함평군 영광군 장성군 완도군 진도군 신안군
+경상북도: 포항시(남구 북구) 경주시 김천시 안동시 구미시 영주시 영천시 상주시 문경시 경산시 의성군 청송군 영양군 영덕군 청도군 고령군 성주군 칠곡군 예천군 봉화군 울진군 울릉군
+경상남도: 창원시(의창구 성산구 마산합포구 마산회원구 진해구) 진주시 통영시 사천시 김해시 밀양시 거제시 양산시 의령군 함안군 창녕군 고성군 남해군 하동군 산청군 함양군 거창군 합천군
+제주특별자치도: 제주시 서귀포시
+"""
+
+# 다른 시도로 옮겨간 시군구 (옛 주소 → 지금 주소)
+MOVED_DISTRICTS = {
+    ('경상북도', '군위군'): ('대구광역시', '군위군')
+}
+
+# 세종처럼 시군구 없이 시도 바로 아래에 읍면동이 있는 경우의 시군구 자리
+NO_DISTRICT = "(시군구 없음)"
+
+DISTRICT_SUFFIXES = ('구', '군', '시')
+DONG_SUFFIXES = ('동', '읍', '면', '가')
+ADMIN_DONG_PATTERN = re.compile(r'^(.+?)제?\d+동$')  # 행정동 "온천1동", "역삼제1동"
+
+
+def parse_bundled_areas(text=BUNDLED_AREAS):
+    """BUNDLED_AREAS → {시도: {시군구: set()}} ("수원시"와 "수원시 장안구" 둘 다 들어감)"""
+    areas = {}
+    for line in text.strip().splitlines():
+        city, _, rest = line.partition(':')
+        districts = areas.setdefault(city.strip(), {})
+        for match in re.finditer(r'(\S+?)(?:\(([^)]*)\))?(?=\s|$)', rest.strip()):
+            name, sub_districts = match.groups()
+            districts.setdefault(name, set())
+            for sub in (sub_districts or '').split():
+                districts.setdefault(f"{name} {sub}", set())
+    return areas
+
+
+def compact(name):
+    """비교용으로 공백 없애기"""
+    return name.replace(' ', '')
+
+
+class AdminAreaIndex:
+    """행정구역 색인 (시도 → 시군구 → 읍면동)"""
+
+    def __init__(self, areas=None):
+        """areas: {시도: {시군구: 읍면동 set}} (없으면 내장 시도/시군구만)"""
+        self.areas = areas or parse_bundled_areas()
+        self.has_dongs = any(dongs for districts in self.areas.values() for dongs in districts.values())
+        self._build_aliases()
+
+    @classmethod
+    def load(cls, file_path=None):
+        """내장 목록 + 가져온 읍면동 파일(있으면) 합치기"""
+        areas = parse_bundled_areas()
+        file_path = file_path or get_data_path("admin_areas.json")
+
+        if os.path.exists(file_path):
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    for city, districts in json.load(f).items():
+                        for district, dongs in districts.items():
+                            # 예전 형식은 시군구 없는 동을 빈 이름("")으로 저장했어요
+                            district = district.strip() or NO_DISTRICT
+                            areas.setdefault(city, {}).setdefault(district, set()).update(dongs)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 읍면동 목록을 읽지 못했어요 (시군구까지만 확인): {e}")
+
+        return cls(areas)
+
+    def _build_aliases(self):
+        """줄임말/변형 → 정식 이름 표 만들기"""
+        self.city_aliases = dict(CITY_ALIASES)
+        for city in self.areas:
+            self.city_aliases[city] = city
+
+        # 시도별: 변형된 시군구 이름 → 정식 이름들 (여러 개면 애매해서 못 고침)
+        self.district_aliases = {}
+
+        for city, districts in self.areas.items():
+            aliases = {}
+            districts = [district for district in districts if district.strip() and district != NO_DISTRICT]
+
+            for district in districts:
+                names = {district, compact(district)}
+                parts = district.split()
+                names.add(parts[-1])  # "수원시 장안구" → "장안구"
+                for part in list(names):
+                    if part.endswith(DISTRICT_SUFFIXES) and len(part) > 2:
+                        names.add(part[:-1])  # "동래구" → "동래"
+                for name in names:
+                    aliases.setdefault(name, set()).add(district)
+
+            # 정식 이름은 항상 자기 자신으로
+            for district in districts:
+                aliases[district] = {district}
+
+            self.district_aliases[city] = aliases
+
+    def validate(self, city, district, dong):
+        """
+        주소 확인 + 정식 이름으로 바꾸기
+        반환: {'city', 'district', 'dong', 'status', 'message'}
+        status: 'ok'(그대로), 'fixed'(고침), 'invalid'(고칠 수 없음)
+        """
+        result = {'city': city, 'district': district, 'dong': dong, 'status': 'ok', 'message': ''}
+        fixes = []
+
+        # 1) 시도
+        canonical_city = self.city_aliases.get(city) or self.city_aliases.get(compact(city))
+        if not canonical_city:
+            return self._invalid(result, f"모르는 시도예요: {city}")
+        if canonical_city != city:
+            fixes.append(f"{city}→{canonical_city}")
+        city = canonical_city
+
+        # 옛 시도의 시군구 (예: 경상북도 군위군)
+        moved = MOVED_DISTRICTS.get((city, district))
+        if moved:
+            fixes.append(f"{city} {district}→{' '.join(moved)}")
+            city, district = moved
+
+        # 세종처럼 시군구가 없는 시도는 읍면동이 NO_DISTRICT 자리에 있어요
+        city_dongs = self.areas[city].get(NO_DISTRICT)
+        districts = {name: dongs for name, dongs in self.areas[city].items() if name != NO_DISTRICT}
+
+        # 2) 시군구 (시군구가 없는 시도는 건너뜀)
+        if districts:
+            candidates = self.district_aliases[city].get(district) or \
+                self.district_aliases[city].get(compact(district))
+
+            if candidates and len(candidates) == 1:
+                canonical_district = next(iter(candidates))
+            elif candidates:
+                canonical_district = self._pick_district_by_dong(city, candidates, dong)
+                if not canonical_district:
+                    return self._invalid(result, f"{district}가 여러 곳이에요: {', '.join(sorted(candidates))}")
+            else:
+                # 구 이름이 틀렸어도 동이 그 시도에 한 곳뿐이면 그 구로
+                canonical_district = self._pick_district_by_dong(city, districts, dong)
+                if not canonical_district:
+                    return self._invalid(result, f"{city}에 없는 시군구예요: {district}")
+
+            if canonical_district != district:
+                fixes.append(f"{district}→{canonical_district}")
+            district = canonical_district
+
+        # "수원시"처럼 일반구를 빼고 쓴 경우 동으로 구 찾기
+        if districts and self.has_dongs and not districts.get(district):
+            sub_districts = [name for name in districts if name.startswith(district + ' ')]
+            picked = self._pick_district_by_dong(city, sub_districts, dong)
+            if picked:
+                fixes.append(f"{district}→{picked}")
+                district = picked
+
+        # 3) 읍면동 (읍면동 목록을 가져왔을 때만)
+        dongs = districts.get(district) if districts else city_dongs
+        if dongs:
+            canonical_dong = self._find_dong(dongs, dong)
+            if not canonical_dong:
+                # 구-동이 안 맞으면 어느 쪽이 틀렸는지 알 수 없어서 고치지 않고 힌트만
+                other = self._pick_district_by_dong(city, districts, dong)
+                hint = f" ({dong}은 {other}에 있어요)" if other else ""
+                return self._invalid(result, f"{district}에 없는 읍면동이에요: {dong}{hint}")
+            if canonical_dong != dong:
+                fixes.append(f"{dong}→{canonical_dong}")
+            dong = canonical_dong
+
+        result.update(city=city, district=district, dong=dong)
+        if fixes:
+            result['status'] = 'fixed'
+            result['message'] = ", ".join(fixes)
+        return result
+
+    def _find_dong(self, dongs, dong):
+        """읍면동 이름 찾기 (띄어쓰기, 접미사 빠짐, 행정동 번호 고침)"""
+        name = compact(dong)
+        if name in dongs:
+            return name
+
+        match = ADMIN_DONG_PATTERN.match(name)
+        if match and match.group(1) + '동' in dongs:
+            return match.group(1) + '동'
+
+        for suffix in DONG_SUFFIXES:
+            if name + suffix in dongs:
+                return name + suffix
+
+        return None
+
+    def _pick_district_by_dong(self, city, districts, dong):
+        """이 동이 있는 시군구가 districts 중 한 곳뿐이면 그 이름 (아니면 None)"""
+        if not self.has_dongs:
+            return None
+
+        found = [district for district in districts
+                 if self.areas[city].get(district) and self._find_dong(self.areas[city][district], dong)]
+        return found[0] if len(found) == 1 else None
+
+    @staticmethod
+    def _invalid(result, message):
+        result['status'] = 'invalid'
+        result['message'] = message
+        return result
+
+
+_default_index = None
+
+
+def get_default_index():
+    """프로세스마다 한 번만 만드는 기본 색인"""
+    global _default_index
+    if _default_index is None:
+        _default_index = AdminAreaIndex.load()
+    return _default_index
+
+
+def import_legal_dong_file(file_path, encoding='cp949', output_path=None):
+    """
+    법정동코드 전체자료 → data/admin_areas.json (폐지된 동과 리 단위는 제외)
+    반환: 가져온 읍면동 수
+    """
+    areas = {}
+    count = 0
+
+    with open(file_path, 'r', encoding=encoding) as f:
+        for line in f:
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) < 3 or not parts[0].isdigit() or parts[2].strip() != '존재':
+                continue
+
+            code, name = parts[0], parts[1].split()
+            # 코드 끝 5자리가 00000이면 시도/시군구, 끝 2자리가 00이 아니면 리
+            if code[-5:] == '00000' or code[-2:] != '00' or len(name) < 2:
+                continue
+
+            city, district, dong = name[0], ' '.join(name[1:-1]) or NO_DISTRICT, name[-1]
+            areas.setdefault(city, {}).setdefault(district, set()).add(dong)
+            count += 1
+
+    output_path = output_path or get_data_path("admin_areas.json")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            city: {district: sorted(dongs) for district, dongs in districts.items()}
+            for city, districts in areas.items()
+        }, f, ensure_ascii=False, separators=(',', ':'))
+
+    print(f"✅ 읍면동 {count}개 가져오기 완료: {output_path}")
+    return count
+
+
+# 명령줄에서 가져오기: python -m utils.admin_areas 법정동코드_전체자료.txt [인코딩]
+def import_from_command_line():
+    """명령줄에서 법정동코드 파일 가져오기"""
+    if len(sys.argv) < 2:
+        print("사용법: python -m utils.admin_areas 법정동코드_전체자료.txt [인코딩]")
+        return
+
+    encoding = sys.argv[2] if len(sys.argv) > 2 else 'cp949'
+    import_legal_dong_file(sys.argv[1], encoding=encoding)
+
+if __name__ == "__main__":
+    import_from_command_line()
@@ -0,0 +1,32 @@
+# utils/api_errors.py
+# 검색 API 오류 종류 구분 (잠깐 문제인 오류 vs 진짜로 결과가 없는 경우)
+
+
+class TransientAPIError(Exception):
+    """타임아웃, 429, 서버 오류처럼 나중에 다시 시도하면 될 수도 있는 오류"""
+
+
+class ContactNotFoundError(Exception):
+    """검색은 정상적으로 끝났지만 전화번호를 찾지 못한 경우"""
+
+
+class QuotaExhaustedError(Exception):
+    """모든 API 키가 오늘 사용 한도에 거의 다 찬 경우 (재시도하지 말고 멈춰야 함)"""
+
+
+class APIKeyRejectedError(QuotaExhaustedError):
+    """
+    모든 API 키가 거부된 경우 (401/403) - 재시도해도 소용없어요
+    한도가 찼을 때처럼 남은 주소는 대기중으로 두고 멈추게 QuotaExhaustedError를 이어받아요
+    """
+
+
+class ProviderUnavailableError(TransientAPIError):
+    """
+    제공자(또는 그 키)가 계속 실패해서 회로 차단기가 열린 경우 - 요청을 보내지 않았어요
+    retry_after: 다음 상태 확인까지 남은 시간 (초)
+    """
+
+    def __init__(self, message, retry_after=0):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,150 @@
+# utils/batch_loader.py
+# 여러 엑셀 파일(폴더 통째로)을 한 번에 처리하는 일괄 모드
+# - 파일들은 여러 프로세스에서 동시에 읽고
+# - 모든 시트의 주소를 합친 뒤 중복을 빼서 검색은 한 번씩만
+# - 결과는 원래 파일마다 하나씩 저장
+
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from utils.excel_handler import ExcelHandler, OperationCancelledError
+
+# 검색 결과로 채워지는 항목들 (중복 주소에 결과를 복사할 때 사용)
+RESULT_FIELDS = ('status', 'place_name', 'phone', 'category', 'error', 'confidence')
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+
+CANCEL_POLL_SECONDS = 0.2  # 파일을 읽는 동안 취소 요청을 확인하는 간격
+
+
+def find_workbooks(folder):
+    """폴더 안의 엑셀 파일 목록 (엑셀이 열어둔 임시 파일 ~$... 는 제외)"""
+    return sorted(
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if name.lower().endswith(EXCEL_EXTENSIONS) and not name.startswith('~$')
+    )
+
+
+def parse_workbook(file_path):
+    """워커 프로세스에서 엑셀 파일 하나 읽기 (모든 시트)"""
+    return ExcelHandler().load_all_sheets(file_path)
+
+
+class BatchJob:
+    """여러 엑셀 파일을 하나의 검색 작업으로 묶는 클래스"""
+
+    def __init__(self):
+        self.inputs = []  # [{'file_path': 경로, 'sheets': {시트이름: 주소 데이터}}]
+        self.lookup_rows = []  # 중복을 뺀 검색용 주소 데이터
+        self.failed_files = []  # [(경로, 오류)]
+        self._rows_by_address = {}  # 주소 → 원본 행들
+
+    def load(self, paths, max_workers=None, progress_callback=None, cancel_event=None):
+        """
+        엑셀 파일들을 여러 프로세스에서 동시에 읽기
+        paths: 폴더 경로 하나 또는 파일 경로 리스트
+        progress_callback(done, total, file_path): 파일 하나 읽을 때마다 호출
+        cancel_event: set() 되면 남은 파일은 읽지 않고 OperationCancelledError
+        """
+        if isinstance(paths, str):
+            paths = find_workbooks(paths) if os.path.isdir(paths) else [paths]
+
+        if not paths:
+            raise Exception("처리할 엑셀 파일이 없어요")
+
+        print(f"📚 엑셀 파일 {len(paths)}개를 동시에 읽는 중...")
+
+        loaded = {}
+        # with 블록을 쓰면 나갈 때 읽는 중인 파일을 다 기다려서, 취소/오류 때는 기다리지 않고 닫아요
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {executor.submit(parse_workbook, path): path for path in paths}
+            pending = set(futures)
+            done = 0
+
+            while pending:
+                # 큰 파일 하나를 읽는 동안에도 취소 요청을 볼 수 있게 짧게 나눠서 기다림
+                finished, pending = wait(pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                if cancel_event is not None and cancel_event.is_set():
+                    raise OperationCancelledError("작업을 취소했어요")
+
+                for future in finished:
+                    done += 1
+                    path = futures[future]
+                    try:
+                        loaded[path] = future.result()
+                    except Exception as e:
+                        print(f"   ❌ {os.path.basename(path)} 읽기 실패: {e}")
+                        self.failed_files.append((path, str(e)))
+
+                    if progress_callback:
+                        progress_callback(done, len(paths), path)
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+
+        # 원래 파일 순서대로 정리
+        for path in paths:
+            if path in loaded and loaded[path]:
+                self.inputs.append({'file_path': path, 'sheets': loaded[path]})
+
+        self._merge()
+        return self.lookup_rows
+
+    def _merge(self):
+        """모든 시트의 주소를 합치고 중복 제거"""
+        self.lookup_rows = []
+        self._rows_by_address = {}
+        total_rows = 0
+
+        for workbook in self.inputs:
+            for address_data in workbook['sheets'].values():
+                for row in address_data:
+                    total_rows += 1
+                    rows = self._rows_by_address.get(row['address'])
+
+                    if rows is None:
+                        # 처음 나온 주소 → 검색용 행 만들기
+                        lookup_row = dict(row, id=len(self.lookup_rows) + 1)
+                        self.lookup_rows.append(lookup_row)
+                        self._rows_by_address[row['address']] = [row]
+                    else:
+                        rows.append(row)
+
+        print(f"🧮 총 {total_rows}행 → 중복 제외 {len(self.lookup_rows)}개 주소를 검색해요")
+
+    def apply_results(self):
+        """검색 결과를 원래 파일의 모든 행에 복사"""
+        for lookup_row in self.lookup_rows:
+            for row in self._rows_by_address.get(lookup_row['address'], []):
+                for field in RESULT_FIELDS:
+                    if field in lookup_row:
+                        row[field] = lookup_row[field]
+
+    def save_results(self, output_folder, excel_handler=None, progress_callback=None,
+                     cancel_event=None):
+        """
+        원래 파일마다 결과 파일 하나씩 저장 (저장한 경로 리스트 반환)
+        progress_callback / cancel_event는 ExcelHandler.save_results와 같음
+        """
+        excel_handler = excel_handler or ExcelHandler()
+        self.apply_results()
+        os.makedirs(output_folder, exist_ok=True)
+
+        saved = []
+        for workbook in self.inputs:
+            name = os.path.splitext(os.path.basename(workbook['file_path']))[0]
+            output_path = os.path.join(output_folder, f"{name}_연락처_결과.xlsx")
+
+            if len(workbook['sheets']) == 1:
+                address_data = next(iter(workbook['sheets'].values()))
+                excel_handler.save_results(address_data, output_path,
+                                           progress_callback, cancel_event)
+            else:
+                excel_handler.save_sheet_results(workbook['sheets'], output_path,
+                                                 progress_callback, cancel_event)
+
+            saved.append(output_path)
+
+        return saved
@@ -0,0 +1,129 @@
+# utils/circuit_breaker.py
+# API 제공자/키별 회로 차단기
+# - 연속으로 실패(타임아웃, 연결 오류, 429, 5xx, 키 오류)하면 "열림" → 한동안 요청을 아예 안 보냄
+#   (장애 중에 요청마다 10초 타임아웃을 기다리거나, 수천 행이 "결과 없음"이 되지 않게)
+# - 열린 뒤 정해진 시간이 지나면 가벼운 확인 요청(probe) 하나만 보내보고
+#   성공하면 다시 "닫힘", 실패하면 기다리는 시간을 두 배로 늘려서 다시 열림
+# - 키가 거부되면(401/403) "사용 불가" → 확인 요청도 없이 이번 실행 동안 그 키는 안 씀
+
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+PROBING = 'probing'  # 확인 요청 하나가 나가 있는 중
+DEAD = 'dead'  # 키가 거부됨 (다시 열지 않음)
+
+STATE_LABELS = {CLOSED: '정상', OPEN: '차단', PROBING: '확인 중', DEAD: '사용 불가'}
+
+
+class CircuitBreaker:
+    """제공자 하나(또는 키 하나)의 회로 차단기"""
+
+    def __init__(self, name, failure_threshold=3, open_seconds=5, max_open_seconds=120, probe=None):
+        """
+        failure_threshold: 이만큼 연속 실패하면 열림
+        open_seconds: 처음 열렸을 때 기다리는 시간 (다시 열릴 때마다 두 배, 최대 max_open_seconds)
+        probe(): 상태 확인용 가벼운 요청 (성공하면 True) - 없으면 다음 실제 요청 하나가 확인 역할
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.probe = probe
+
+        self.state = CLOSED
+        self.failures = 0
+        self.open_seconds = open_seconds
+        self.retry_at = 0
+        self.dead_reason = None
+        self.stats = {'opened': 0, 'probes': 0, 'rejected': 0}
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """지금 요청을 보내도 되는지 (열려 있고 확인할 때가 됐으면 여기서 확인 요청)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state in (PROBING, DEAD) or time.time() < self.retry_at:
+                self.stats['rejected'] += 1
+                return False
+
+            self.state = PROBING
+            self.stats['probes'] += 1
+            if not self.probe:
+                # 확인 함수가 없으면 이번 실제 요청이 확인 요청 (결과는 record_*로)
+                return True
+
+        try:
+            healthy = self.probe()
+        except Exception:
+            healthy = False
+
+        if healthy:
+            self.record_success()
+            print(f"✅ {self.name} 다시 응답해요 → 요청 재개")
+            return True
+
+        self.record_failure()
+        return False
+
+    def record_success(self):
+        """요청 성공 → 닫힘 (사용 불가가 된 키는 그대로)"""
+        with self._lock:
+            if self.state == DEAD:
+                return
+            self.state = CLOSED
+            self.failures = 0
+            self.open_seconds = self.base_open_seconds
+
+    def record_failure(self):
+        """요청 실패 → 연속 실패가 쌓이면(또는 확인 요청이 실패하면) 열림"""
+        with self._lock:
+            self.failures += 1
+            if self.state == DEAD:
+                return
+            if self.state == PROBING:
+                # 확인도 실패 → 더 오래 기다리기
+                self.open_seconds = min(self.open_seconds * 2, self.max_open_seconds)
+                self._open()
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                self.stats['opened'] += 1
+                self._open()
+                print(f"🔌 {self.name} 연속 {self.failures}번 실패 → {self.open_seconds:.0f}초 동안 요청 중단")
+
+    def mark_dead(self, reason):
+        """키가 거부됨 → 이번 실행 동안 요청도 확인 요청도 안 보냄"""
+        with self._lock:
+            if self.state == DEAD:
+                return
+            self.state = DEAD
+            self.dead_reason = reason
+        print(f"🚫 {self.name} 사용 불가: {reason}")
+
+    def is_dead(self):
+        with self._lock:
+            return self.state == DEAD
+
+    def _open(self):
+        self.state = OPEN
+        self.retry_at = time.time() + self.open_seconds
+
+    def get_retry_after(self):
+        """다음 확인까지 남은 시간 (초, 닫혀 있으면 0)"""
+        with self._lock:
+            if self.state in (CLOSED, DEAD):
+                return 0
+            return max(0.0, self.retry_at - time.time())
+
+    def is_closed(self):
+        with self._lock:
+            return self.state == CLOSED
+
+    def format_status(self):
+        """로그용 한 줄"""
+        with self._lock:
+            if self.state == DEAD:
+                return f"{self.name}: {STATE_LABELS[DEAD]} ({self.dead_reason})"
+            return (f"{self.name}: {STATE_LABELS[self.state]} (차단 {self.stats['opened']}번, "
+                    f"확인 요청 {self.stats['probes']}번, 막은 요청 {self.stats['rejected']}번)")
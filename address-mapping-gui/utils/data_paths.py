@@ -0,0 +1,12 @@
+# utils/data_paths.py
+# 프로그램이 기억해두는 파일들(캐시, 통계 등)을 저장하는 위치
+
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def get_data_path(file_name):
+    """data 폴더 안의 파일 경로 만들기 (폴더가 없으면 생성)"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, file_name)
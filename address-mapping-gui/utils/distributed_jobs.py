@@ -0,0 +1,319 @@
+# utils/distributed_jobs.py
+# 큰 주소 파일 하나를 여러 PC가 나눠서 검색하기 (공유 폴더의 SQLite 작업 저장소)
+# - 코디네이터: 주소를 작업 단위(기본 200행)로 나눠 저장소에 넣고, 다 끝나면 하나의 엑셀로 합침
+# - 워커: PC마다 자기 API 키로 작업 단위를 하나씩 빌려서(lease) 검색하고 결과를 돌려줌
+#   검색하는 동안 주기적으로 "살아있음"(heartbeat)을 남기고, 소식이 끊긴 단위는 다른 워커가 다시 가져감
+# - 빌린 시간은 각 PC 시계 기준이라 PC끼리 시계가 크게 다르면 안 돼요 (lease_seconds를 넉넉히)
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+
+DEFAULT_UNIT_SIZE = 200
+DEFAULT_LEASE_SECONDS = 180
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+
+
+def pack_rows(rows):
+    """주소 데이터 목록 → 압축된 JSON"""
+    return zlib.compress(json.dumps(rows, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+def unpack_rows(blob):
+    """압축된 JSON → 주소 데이터 목록"""
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
+def get_worker_name():
+    """기본 워커 이름 (PC 이름:프로세스 번호 - 한 PC에서 여러 개 띄워도 구분되게)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class SharedJobStore:
+    """여러 PC가 같이 쓰는 작업 저장소 (공유 폴더의 SQLite 파일 하나)"""
+
+    def __init__(self, db_path):
+        # 공유 폴더에서는 WAL이 안전하지 않아서 기본 저널 모드 + 넉넉한 잠금 대기
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._create_tables()
+
+    def _create_tables(self):
+        """테이블 만들기"""
+        with self._lock:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY,
+                    source TEXT,
+                    created_at TEXT NOT NULL,
+                    total_rows INTEGER NOT NULL,
+                    total_units INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS units (
+                    id INTEGER PRIMARY KEY,
+                    job_id INTEGER NOT NULL REFERENCES jobs(id),
+                    status TEXT NOT NULL,
+                    rows BLOB NOT NULL,
+                    results BLOB,
+                    worker TEXT,
+                    lease_until REAL,
+                    leases INTEGER NOT NULL DEFAULT 0,
+                    finished_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_units_status ON units(status, id);
+                CREATE INDEX IF NOT EXISTS idx_units_job ON units(job_id, status);
+            """)
+
+    # ----- 코디네이터 -----
+
+    def create_job(self, address_data, source="", unit_size=DEFAULT_UNIT_SIZE):
+        """주소를 작업 단위로 나눠서 넣기 → 작업 번호"""
+        units = [address_data[start:start + unit_size] for start in range(0, len(address_data), unit_size)]
+
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self.conn.execute(
+                    "INSERT INTO jobs (source, created_at, total_rows, total_units) VALUES (?, ?, ?, ?)",
+                    (source, datetime.now().isoformat(timespec='seconds'), len(address_data), len(units))
+                )
+                job_id = cursor.lastrowid
+                self.conn.executemany(
+                    "INSERT INTO units (job_id, status, rows) VALUES (?, ?, ?)",
+                    [(job_id, PENDING, pack_rows(rows)) for rows in units]
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+        print(f"📦 작업 {job_id}: 주소 {len(address_data)}개를 {len(units)}개 단위로 나눴어요")
+        return job_id
+
+    def get_progress(self, job_id):
+        """작업 진행 상황 {total, pending, leased, done, workers}"""
+        now = time.time()
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT status, worker, lease_until FROM units WHERE job_id = ?", (job_id,)
+            ).fetchall()
+
+        progress = {'total': len(rows), PENDING: 0, LEASED: 0, DONE: 0, 'workers': set()}
+        for status, worker, lease_until in rows:
+            if status == LEASED and lease_until < now:
+                status = PENDING  # 소식이 끊긴 단위는 다시 대기
+            progress[status] += 1
+            if status == LEASED:
+                progress['workers'].add(worker)
+        return progress
+
+    def collect(self, job_id):
+        """끝난 단위의 결과를 모아 원래 순서(순번)대로 → 주소 데이터 목록 (안 끝난 단위는 대기중 그대로)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT rows, results FROM units WHERE job_id = ? ORDER BY id", (job_id,)
+            ).fetchall()
+
+        address_data = []
+        for original, results in rows:
+            address_data.extend(unpack_rows(results if results is not None else original))
+        address_data.sort(key=lambda addr: addr['id'])
+        return address_data
+
+    def wait_for_job(self, job_id, on_progress=None, poll_seconds=5, should_stop=None):
+        """모든 단위가 끝날 때까지 기다리기 (끝났으면 True, 중간에 멈췄으면 False)"""
+        while True:
+            progress = self.get_progress(job_id)
+            if on_progress:
+                on_progress(progress)
+            if progress[DONE] >= progress['total']:
+                return True
+            if should_stop and should_stop():
+                return False
+            time.sleep(poll_seconds)
+
+    # ----- 워커 -----
+
+    def lease(self, worker, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """
+        기다리는 단위(또는 빌린 시간이 지난 단위) 하나 빌리기
+        반환: (단위 번호, 작업 번호, 주소 데이터 목록) 또는 남은 단위가 없으면 None
+        """
+        now = time.time()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute("""
+                    SELECT id, job_id, rows, status FROM units
+                    WHERE status = ? OR (status = ? AND lease_until < ?)
+                    ORDER BY id LIMIT 1
+                """, (PENDING, LEASED, now)).fetchone()
+
+                if not row:
+                    self.conn.execute("COMMIT")
+                    return None
+
+                unit_id, job_id, blob, status = row
+                self.conn.execute(
+                    "UPDATE units SET status = ?, worker = ?, lease_until = ?, leases = leases + 1 WHERE id = ?",
+                    (LEASED, worker, now + lease_seconds, unit_id)
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+        if status == LEASED:
+            print(f"♻️ 소식이 끊긴 단위 {unit_id}를 다시 가져왔어요")
+        return unit_id, job_id, unpack_rows(blob)
+
+    def heartbeat(self, unit_id, worker, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """빌린 시간 연장 (다른 워커에게 넘어갔으면 False)"""
+        with self._lock:
+            cursor = self.conn.execute(
+                "UPDATE units SET lease_until = ? WHERE id = ? AND status = ? AND worker = ?",
+                (time.time() + lease_seconds, unit_id, LEASED, worker)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, unit_id, worker, rows):
+        """
+        결과 돌려주기 (True면 저장됨)
+        빌린 시간이 지나 다른 워커가 가져갔더라도 아직 안 끝났으면 먼저 끝낸 결과를 받아요
+        """
+        with self._lock:
+            cursor = self.conn.execute(
+                "UPDATE units SET status = ?, results = ?, worker = ?, finished_at = ? WHERE id = ? AND status != ?",
+                (DONE, pack_rows(rows), worker, datetime.now().isoformat(timespec='seconds'), unit_id, DONE)
+            )
+        return cursor.rowcount == 1
+
+    def release(self, unit_id, worker):
+        """끝내지 못한 단위 돌려놓기 (다른 워커가 바로 가져갈 수 있게)"""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE units SET status = ?, lease_until = NULL WHERE id = ? AND status = ? AND worker = ?",
+                (PENDING, unit_id, LEASED, worker)
+            )
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class DistributedWorker:
+    """작업 저장소에서 단위를 빌려 검색하고 결과를 돌려주는 워커"""
+
+    def __init__(self, store, scheduler, results_store=None, worker_name=None,
+                 lease_seconds=DEFAULT_LEASE_SECONDS):
+        """
+        scheduler: 이 PC의 LookupScheduler (자기 API 키의 검색 함수로 만든 것)
+        results_store: 있으면 이미 아는 주소는 미리 채우고, 찾은 결과도 남겨요
+        """
+        self.store = store
+        self.scheduler = scheduler
+        self.results_store = results_store
+        self.worker_name = worker_name or get_worker_name()
+        self.lease_seconds = lease_seconds
+        self.stats = {'units': 0, 'rows': 0, 'success': 0, 'error': 0, 'lost': 0}
+
+    def run(self, should_stop=None, wait_for_work=False, poll_seconds=10):
+        """
+        단위가 없을 때까지 빌려서 처리
+        wait_for_work: True면 단위가 없어도 끝내지 않고 새 작업을 기다림
+        API 한도가 차면 하던 단위를 돌려놓고 멈춰요 (반환: 멈춘 이유 또는 None)
+        """
+        print(f"👷 워커 {self.worker_name} 시작")
+        while not (should_stop and should_stop()):
+            leased = self.store.lease(self.worker_name, self.lease_seconds)
+            if not leased:
+                if not wait_for_work:
+                    break
+                time.sleep(poll_seconds)
+                continue
+
+            unit_id, job_id, rows = leased
+            paused = self._process_unit(unit_id, job_id, rows, should_stop)
+            if paused:
+                return paused
+
+        print(f"👷 워커 {self.worker_name} 끝: 단위 {self.stats['units']}개, "
+              f"주소 {self.stats['rows']}개 (성공 {self.stats['success']}, 실패 {self.stats['error']})")
+        return None
+
+    def _process_unit(self, unit_id, job_id, rows, should_stop):
+        """단위 하나 검색 (검색하는 동안 heartbeat) → 멈춘 이유 또는 None"""
+        print(f"📥 작업 {job_id} 단위 {unit_id} ({len(rows)}행) 검색 시작")
+        stop_heartbeat = threading.Event()
+        lost = threading.Event()
+
+        def keep_alive():
+            while not stop_heartbeat.wait(self.lease_seconds / 3):
+                try:
+                    if not self.store.heartbeat(unit_id, self.worker_name, self.lease_seconds):
+                        lost.set()
+                        return
+                except sqlite3.Error as e:
+                    print(f"⚠️ heartbeat 실패 (다시 시도): {e}")
+
+        heartbeat_thread = threading.Thread(target=keep_alive, daemon=True)
+        heartbeat_thread.start()
+
+        try:
+            pending = rows
+            if self.results_store:
+                self.results_store.prefill(rows)
+                pending = [addr for addr in rows if not addr.get('prefilled')]
+
+            stats = self.scheduler.run(
+                pending,
+                should_stop=lambda: lost.is_set() or (should_stop and should_stop())
+            )
+        finally:
+            stop_heartbeat.set()
+            heartbeat_thread.join()
+
+        if self.results_store:
+            try:
+                self.results_store.add_run(rows, source=f"distributed:{job_id}:{self.worker_name}")
+            except Exception as e:
+                print(f"⚠️ 기록 저장소 저장 실패: {e}")
+
+        unfinished = any(addr['status'] not in ('성공', '실패') for addr in rows)
+        if lost.is_set():
+            # 다른 워커가 가져감 → 그래도 다 끝냈으면 결과는 넘겨봄 (먼저 끝낸 쪽이 저장)
+            self.stats['lost'] += 1
+            print(f"⚠️ 단위 {unit_id}가 다른 워커에게 넘어갔어요")
+            if unfinished:
+                return None
+
+        if unfinished:
+            self.store.release(unit_id, self.worker_name)
+            if stats['paused']:
+                print(f"⏸️ {stats['paused']} → 단위 {unit_id}는 돌려놓고 멈춰요")
+                return stats['paused']
+            return None
+
+        self.store.complete(unit_id, self.worker_name, rows)
+        self.stats['units'] += 1
+        self.stats['rows'] += len(rows)
+        self.stats['success'] += sum(1 for addr in rows if addr['status'] == '성공')
+        self.stats['error'] += sum(1 for addr in rows if addr['status'] == '실패')
+        print(f"📤 단위 {unit_id} 완료")
+        return None
+
+
+def format_progress(progress):
+    """코디네이터 로그용 한 줄"""
+    workers = ", ".join(sorted(progress['workers'])) or "-"
+    return (f"📊 완료 {progress[DONE]}/{progress['total']} 단위 "
+            f"(작업 중 {progress[LEASED]}, 대기 {progress[PENDING]}) 워커: {workers}")
@@ -1,7 +1,97 @@
 # utils/excel_handler.py
 # 새로운 엑셀 구조에 맞춘 처리기
 
+import hashlib
+import io
+import os
+from collections import deque
+
 import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from utils.admin_areas import get_default_index
+
+# 진행률을 알려주는 간격 (행)
+PROGRESS_EVERY = 500
+
+# 파일 마무리(압축) 중에 진행률을 알려주는 간격 (바이트)
+SAVE_PROGRESS_BYTES = 1024 * 1024
+
+# 결과 시트 컬럼 (순서대로 A~M)
+RESULT_COLUMNS = ['순번', '시도', '구', '동', '번지', '전체주소', '추가정보', '상태',
+                  '업체명', '전화번호', '카테고리', '오류내용', '신뢰도']
+
+# 결과 시트 컬럼 너비
+RESULT_COLUMN_WIDTHS = {
+    'A': 8,   # 순번
+    'B': 12,  # 시도
+    'C': 12,  # 구
+    'D': 15,  # 동
+    'E': 15,  # 번지
+    'F': 35,  # 전체주소
+    'G': 25,  # 추가정보
+    'H': 10,  # 상태
+    'I': 20,  # 업체명
+    'J': 15,  # 전화번호
+    'K': 20,  # 카테고리
+    'L': 25,  # 오류내용
+    'M': 8    # 신뢰도
+}
+
+# 이전 결과와 비교할 때 같은 행인지 보는 입력 컬럼 (시도/구/동/번지/추가정보)
+BASELINE_INPUT_FIELDS = ['city', 'district', 'dong', 'street_number', 'additional_info']
+
+# 이전 결과에서 그대로 가져오는 상태 (대기중이던 행은 다시 검색)
+CARRY_OVER_STATUSES = ('성공', '실패')
+
+# 이전 대비 변경 내역 시트 컬럼
+DIFF_COLUMNS = ['구분', '순번', '이전 순번', '전체주소', '추가정보', '이전 주소', '이전 추가정보',
+                '이전 상태', '이전 전화번호']
+
+
+class OperationCancelledError(Exception):
+    """사용자가 파일 읽기/저장을 취소한 경우"""
+
+
+def check_cancelled(cancel_event):
+    """취소 요청이 있으면 OperationCancelledError"""
+    if cancel_event is not None and cancel_event.is_set():
+        raise OperationCancelledError("작업을 취소했어요")
+
+
+class ProgressFile:
+    """
+    통합 문서를 파일로 마무리(압축)하는 동안 쓴 양을 알리고 취소를 확인하는 파일 감싸개
+    progress_callback('save', 쓴 KB, 0) - 전체 크기는 미리 알 수 없어서 0
+    """
+    
+    def __init__(self, file, progress_callback=None, cancel_event=None):
+        self.file = file
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.written = 0
+        self.reported = 0
+        self.cancelled = False
+    
+    def write(self, data):
+        if self.cancelled:
+            # openpyxl이 닫지 못한 ZipFile이 나중에 정리되며 쓰는 내용은 버림 (파일은 이미 닫혀요)
+            return len(data)
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            self.cancelled = True
+            self.file = io.BytesIO()
+            raise OperationCancelledError("작업을 취소했어요")
+        self.written += len(data)
+        if self.progress_callback and self.written - self.reported >= SAVE_PROGRESS_BYTES:
+            self.reported = self.written
+            self.progress_callback('save', self.written // 1024, 0)
+        return self.file.write(data)
+    
+    def __getattr__(self, name):
+        # tell/seek/flush 등은 원래 파일 그대로
+        return getattr(self.file, name)
 
 class ExcelHandler:
     """새로운 엑셀 구조로 연락처 데이터 처리하는 클래스"""
@@ -9,64 +99,25 @@ class ExcelHandler:
     def __init__(self):
         print("📁 새로운 구조의 Excel 처리기가 준비되었어요!")
     
-    def load_addresses(self, file_path):
+    def load_addresses(self, file_path, progress_callback=None, cancel_event=None):
         """
         새로운 엑셀 구조에서 주소들을 읽어오는 함수
         컬럼: 주소 | 구 | 동 | 번지 | (추가정보)
+        progress_callback(stage, done, total): stage는 'read' / 'parse'
+        cancel_event: set() 되면 OperationCancelledError로 중단
         """
         try:
             print(f"📖 새로운 구조의 주소 파일을 읽는 중: {file_path}")
             
             # Excel 파일 읽기 (헤더 포함)
-            df = pd.read_excel(file_path)
+            df = self._read_first_sheet(file_path, progress_callback, cancel_event)
             print(f"✅ 파일 읽기 성공! 총 {len(df)}행")
             
             # 컬럼명 확인
             print(f"📋 컬럼명들: {list(df.columns)}")
             
             # 데이터 구조 분석
-            address_data = []
-            
-            for i, row in df.iterrows():
-                try:
-                    # 각 컬럼에서 데이터 추출
-                    city = str(row.iloc[0]).strip() if pd.notna(row.iloc[0]) else ""
-                    district = str(row.iloc[1]).strip() if pd.notna(row.iloc[1]) else ""
-                    dong = str(row.iloc[2]).strip() if pd.notna(row.iloc[2]) else ""
-                    street_num = str(row.iloc[3]).strip() if pd.notna(row.iloc[3]) else ""
-                    
-                    # 추가 정보 (5번째 컬럼이 있으면)
-                    additional_info = ""
-                    if len(row) > 4 and pd.notna(row.iloc[4]):
-                        additional_info = str(row.iloc[4]).strip()
-                    
-                    # 완전한 주소 조합
-                    if city and district and dong:
-                        # 기본 주소 형태: "부산광역시 동래구 온천동 871-95"
-                        full_address = f"{city} {district} {dong}"
-                        if street_num:
-                            full_address += f" {street_num}"
-                        
-                        # 빈 주소 제외
-                        if full_address.strip():
-                            address_data.append({
-                                'id': len(address_data) + 1,
-                                'city': city,
-                                'district': district,
-                                'dong': dong,
-                                'street_number': street_num,
-                                'additional_info': additional_info,
-                                'address': full_address.strip(),
-                                'status': '대기중',
-                                'place_name': None,
-                                'phone': None,
-                                'category': None,
-                                'error': None
-                            })
-                            
-                except Exception as e:
-                    print(f"   ⚠️ {i+2}행 처리 중 오류: {e}")
-                    continue
+            address_data = self.parse_rows(df, progress_callback, cancel_event)
             
             print(f"🏠 총 {len(address_data)}개의 주소를 조합했어요!")
             
@@ -82,70 +133,504 @@ class ExcelHandler:
             
             return address_data
             
+        except OperationCancelledError:
+            print(f"⏹️ 파일 읽기를 취소했어요")
+            raise
         except Exception as e:
             print(f"❌ 파일 읽기 실패: {e}")
             raise Exception(f"Excel 파일을 읽을 수 없어요: {e}")
     
-    def save_results(self, address_data, file_path):
+    def _read_first_sheet(self, file_path, progress_callback=None, cancel_event=None):
+        """
+        첫 번째 시트를 DataFrame으로 읽기
+        진행률이 필요한 .xlsx는 openpyxl로 한 줄씩 읽고, 나머지는 pandas로 한 번에
+        """
+        if not (progress_callback or cancel_event) or not file_path.lower().endswith('.xlsx'):
+            return pd.read_excel(file_path)
+        
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook.worksheets[0]
+            total = worksheet.max_row or 0
+            
+            rows = []
+            for i, values in enumerate(worksheet.iter_rows(values_only=True)):
+                if i % PROGRESS_EVERY == 0:
+                    check_cancelled(cancel_event)
+                    if progress_callback:
+                        progress_callback('read', i, total)
+                rows.append(values)
+        finally:
+            workbook.close()
+        
+        if not rows:
+            return pd.DataFrame()
+        
+        # 완전히 빈 행은 pandas처럼 빼기
+        data = [row for row in rows[1:] if any(value is not None for value in row)]
+        return pd.DataFrame(data, columns=list(rows[0]))
+    
+    def parse_rows(self, df, progress_callback=None, cancel_event=None):
+        """
+        DataFrame의 각 행을 주소 데이터로 변환
+        컬럼 순서: 주소(시도) | 구 | 동 | 번지 | (추가정보)
+        """
+        address_data = []
+        total = len(df)
+        
+        # 색인을 못 만들면 행마다 삼키지 말고 파일 읽기 오류로
+        get_default_index()
+        
+        for i, row in df.iterrows():
+            if i % PROGRESS_EVERY == 0:
+                check_cancelled(cancel_event)
+                if progress_callback:
+                    progress_callback('parse', i, total)
+            
+            try:
+                addr = self.make_address(list(row), len(address_data) + 1)
+                if addr:
+                    address_data.append(addr)
+                
+            except Exception as e:
+                print(f"   ⚠️ {i+2}행 처리 중 오류: {e}")
+                continue
+        
+        return address_data
+    
+    def make_address(self, values, row_id):
+        """
+        행 값 하나를 주소 데이터로 변환 (주소를 만들 수 없는 행이면 None)
+        values 순서: 주소(시도) | 구 | 동 | 번지 | (추가정보)
+        """
+        # 각 컬럼에서 데이터 추출
+        city = str(values[0]).strip() if pd.notna(values[0]) else ""
+        district = str(values[1]).strip() if pd.notna(values[1]) else ""
+        dong = str(values[2]).strip() if pd.notna(values[2]) else ""
+        street_num = str(values[3]).strip() if pd.notna(values[3]) else ""
+        
+        # 추가 정보 (5번째 컬럼이 있으면)
+        additional_info = ""
+        if len(values) > 4 and pd.notna(values[4]):
+            additional_info = str(values[4]).strip()
+        
+        # 완전한 주소 조합
+        if not (city and district and dong):
+            return None
+        
+        # 행정구역 색인으로 확인 (흔한 변형은 고치고, 못 고치면 검색 안 하도록 표시)
+        area = get_default_index().validate(city, district, dong)
+        if area['status'] == 'fixed':
+            city, district, dong = area['city'], area['district'], area['dong']
+        
+        # 기본 주소 형태: "부산광역시 동래구 온천동 871-95"
+        full_address = f"{city} {district} {dong}"
+        if street_num:
+            full_address += f" {street_num}"
+        
+        # 빈 주소 제외
+        if not full_address.strip():
+            return None
+        
+        return {
+            'id': row_id,
+            'city': city,
+            'district': district,
+            'dong': dong,
+            'street_number': street_num,
+            'additional_info': additional_info,
+            'address': full_address.strip(),
+            'status': '대기중',
+            'place_name': None,
+            'phone': None,
+            'category': None,
+            'error': None,
+            'address_note': area['message'],
+            'invalid_address': area['status'] == 'invalid'
+        }
+    
+    def iter_sheet_rows(self, file_path):
+        """
+        첫 번째 시트의 데이터 행을 한 줄씩 (헤더/빈 행 제외, 값 튜플)
+        .xlsx를 통째로 메모리에 올리지 않아서 아주 큰 파일도 일정한 메모리로 읽어요
+        """
+        if not file_path.lower().endswith('.xlsx'):
+            # openpyxl로 못 읽는 형식은 pandas로 읽고 한 줄씩 넘겨요
+            for values in pd.read_excel(file_path).itertuples(index=False):
+                yield tuple(values)
+            return
+        
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            next(rows, None)  # 헤더
+            for values in rows:
+                if any(value is not None for value in values):
+                    yield values
+        finally:
+            workbook.close()
+    
+    def load_all_sheets(self, file_path):
+        """
+        엑셀 파일의 모든 시트에서 주소 읽기
+        반환: {시트이름: 주소 데이터 리스트} (주소가 없는 시트는 빠짐)
+        """
+        try:
+            print(f"📖 모든 시트 읽는 중: {file_path}")
+            
+            sheets = pd.read_excel(file_path, sheet_name=None)
+            
+            result = {}
+            for sheet_name, df in sheets.items():
+                address_data = self.parse_rows(df)
+                if address_data:
+                    result[sheet_name] = address_data
+                    print(f"   📄 {sheet_name}: {len(address_data)}개 주소")
+            
+            return result
+            
+        except Exception as e:
+            print(f"❌ 파일 읽기 실패: {e}")
+            raise Exception(f"Excel 파일을 읽을 수 없어요: {e}")
+    
+    def get_row_hash(self, addr):
+        """입력 컬럼(시도/구/동/번지/추가정보)으로 만든 행 해시 (같으면 바뀌지 않은 행)"""
+        text = "\x1f".join(str(addr.get(field) or '').strip() for field in BASELINE_INPUT_FIELDS)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    def load_baseline(self, file_path):
+        """
+        이전에 save_results로 저장한 결과 파일 읽기 → 행 목록 (입력 컬럼 + 결과 + row_hash)
+        결과 시트가 아니면 Exception
+        """
+        try:
+            with pd.ExcelFile(file_path) as workbook:
+                sheet = '연락처_검색_결과' if '연락처_검색_결과' in workbook.sheet_names else 0
+                # 번지 같은 숫자도 저장된 글자 그대로 비교하려고 전부 문자열로 읽기
+                df = workbook.parse(sheet, dtype=str)
+        except Exception as e:
+            raise Exception(f"이전 결과 파일을 읽을 수 없어요: {e}")
+        
+        missing = [name for name in ('순번', '시도', '구', '동', '번지', '추가정보', '상태')
+                   if name not in df.columns]
+        if missing:
+            raise Exception(f"이전 결과 파일이 아니에요 (없는 컬럼: {', '.join(missing)})")
+        
+        def get_value(row, name):
+            value = row.get(name)
+            return str(value).strip() if pd.notna(value) else ''
+        
+        baseline = []
+        for row in df.to_dict('records'):
+            try:
+                row_id = int(float(get_value(row, '순번')))
+            except ValueError:
+                row_id = None
+            
+            item = {
+                'id': row_id,
+                'city': get_value(row, '시도'),
+                'district': get_value(row, '구'),
+                'dong': get_value(row, '동'),
+                'street_number': get_value(row, '번지'),
+                'additional_info': get_value(row, '추가정보'),
+                'address': get_value(row, '전체주소'),
+                'status': get_value(row, '상태'),
+                'place_name': get_value(row, '업체명') or None,
+                'phone': get_value(row, '전화번호') or None,
+                'category': get_value(row, '카테고리') or None,
+                'error': get_value(row, '오류내용') or None,
+                'confidence': get_value(row, '신뢰도') or None
+            }
+            item['row_hash'] = self.get_row_hash(item)
+            baseline.append(item)
+        
+        return baseline
+    
+    def apply_baseline(self, address_data, file_path, progress_callback=None, cancel_event=None):
+        """
+        이전 결과 파일과 행 단위로 비교
+        - 입력 컬럼 해시가 같은 행은 이전 결과(성공/실패)를 그대로 가져오고 carried_over=True 표시 (검색 안 함)
+        - 해시가 다른 행은 같은 순번의 이전 행이 있으면 '변경', 없으면 '추가'
+        - 이번 파일에 없는 이전 행은 '삭제'
+        progress_callback(stage, done, total): stage는 'diff'
+        반환: {'added': [행], 'changed': [(행, 이전 행)], 'removed': [이전 행], 'unchanged': 수, 'carried': 수}
+        """
+        print(f"🔀 이전 결과와 비교 중: {file_path}")
+        baseline = self.load_baseline(file_path)
+        
+        # 같은 내용의 행이 여러 번 있어도 하나씩 짝지어지게 해시별 대기열
+        by_hash = {}
+        for item in baseline:
+            by_hash.setdefault(item['row_hash'], deque()).append(item)
+        
+        total = len(address_data)
+        unmatched = []
+        unchanged = 0
+        carried = 0
+        for i, addr in enumerate(address_data):
+            if i % PROGRESS_EVERY == 0:
+                check_cancelled(cancel_event)
+                if progress_callback:
+                    progress_callback('diff', i, total)
+            
+            candidates = by_hash.get(self.get_row_hash(addr))
+            if not candidates:
+                unmatched.append(addr)
+                continue
+            
+            previous = candidates.popleft()
+            unchanged += 1
+            if previous['status'] in CARRY_OVER_STATUSES:
+                addr.update(status=previous['status'], place_name=previous['place_name'],
+                            phone=previous['phone'], category=previous['category'],
+                            error=previous['error'], confidence=previous['confidence'],
+                            carried_over=True)
+                carried += 1
+        
+        # 짝이 없는 행: 같은 순번의 이전 행이 남아 있으면 고쳐진 행으로
+        leftover = {item['id']: item for items in by_hash.values() for item in items}
+        added = []
+        changed = []
+        for addr in unmatched:
+            previous = leftover.pop(addr['id'], None)
+            if previous:
+                changed.append((addr, previous))
+            else:
+                added.append(addr)
+        
+        removed = sorted(leftover.values(), key=lambda item: item['id'] if item['id'] is not None else 0)
+        
+        if progress_callback:
+            progress_callback('diff', total, total)
+        print(f"✅ 비교 완료! 그대로 {unchanged}행 (결과 재사용 {carried}행), "
+              f"추가 {len(added)}행, 변경 {len(changed)}행, 삭제 {len(removed)}행")
+        
+        return {
+            'added': added,
+            'changed': changed,
+            'removed': removed,
+            'unchanged': unchanged,
+            'carried': carried
+        }
+    
+    @staticmethod
+    def format_diff_report(diff):
+        """비교 결과를 사람이 읽기 좋은 문장들로"""
+        lines = [
+            f"🔀 이전 결과와 같은 행: {diff['unchanged']}개 (결과 그대로 사용 {diff['carried']}개, 검색 안 함)",
+            f"➕ 추가된 행: {len(diff['added'])}개",
+            f"✏️ 바뀐 행: {len(diff['changed'])}개",
+            f"➖ 없어진 행: {len(diff['removed'])}개"
+        ]
+        for addr, previous in diff['changed'][:3]:
+            lines.append(f"   {addr['id']}. {previous['address']} → {addr['address']}")
+        return lines
+    
+    def save_results(self, address_data, file_path, progress_callback=None, cancel_event=None,
+                     diff=None):
         """
         연락처 검색 결과를 Excel 파일로 저장 (새 구조 포함)
+        progress_callback(stage, done, total): 'write'(행을 쓰는 중) → 'save'(파일 마무리 중, 쓴 KB)
+        cancel_event: set() 되면 중단하고 쓰다 만 파일은 지움 (마무리 중에도)
+        diff: apply_baseline 결과를 넘기면 '이전_대비_변경' 시트도 같이 저장
         """
         try:
             print(f"💾 연락처 결과 저장 중: {file_path}")
             
-            # 결과 데이터 준비
-            results = []
-            for item in address_data:
-                results.append({
-                    '순번': item['id'],
-                    '시도': item.get('city', ''),
-                    '구': item.get('district', ''),
-                    '동': item.get('dong', ''),
-                    '번지': item.get('street_number', ''),
-                    '전체주소': item['address'],
-                    '추가정보': item.get('additional_info', ''),
-                    '상태': item['status'],
-                    '업체명': item['place_name'] if item['place_name'] else '',
-                    '전화번호': item['phone'] if item['phone'] else '',
-                    '카테고리': item['category'] if item['category'] else '',
-                    '오류내용': item['error'] if item['error'] else ''
-                })
-            
-            # DataFrame으로 만들고 저장
-            df = pd.DataFrame(results)
-            
-            # Excel 파일로 저장 (컬럼 너비 조정)
-            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='연락처_검색_결과', index=False)
-                
-                # 워크시트 가져오기
-                worksheet = writer.sheets['연락처_검색_결과']
-                
-                # 컬럼 너비 조정
-                column_widths = {
-                    'A': 8,   # 순번
-                    'B': 12,  # 시도
-                    'C': 12,  # 구
-                    'D': 15,  # 동
-                    'E': 15,  # 번지
-                    'F': 35,  # 전체주소
-                    'G': 25,  # 추가정보
-                    'H': 10,  # 상태
-                    'I': 20,  # 업체명
-                    'J': 15,  # 전화번호
-                    'K': 20,  # 카테고리
-                    'L': 25   # 오류내용
-                }
-                
-                for column, width in column_widths.items():
-                    worksheet.column_dimensions[column].width = width
+            # write_only 통합 문서라 행을 넣는 동안 바로 시트 XML로 써지고, 마지막엔 압축만 해요
+            # 임시 파일에 다 쓴 뒤에 바꿔치기 (취소/오류 시 쓰다 만 파일이 남지 않게)
+            workbook = Workbook(write_only=True)
+            temp_path = self._get_temp_path(file_path)
+            try:
+                self._write_result_sheet(workbook, address_data, '연락처_검색_결과',
+                                         progress_callback, cancel_event)
+                if diff:
+                    self._write_diff_sheet(workbook, diff)
+                self._save_workbook(workbook, temp_path, progress_callback, cancel_event)
+                # 결과 파일이 엑셀에 열려 있으면 여기서 PermissionError
+                os.replace(temp_path, file_path)
+            except BaseException:
+                self._discard_workbook(workbook)
+                self._remove_partial_file(temp_path)
+                raise
+            
+            print(f"✅ 연락처 결과 저장 완료!")
+            
+        except OperationCancelledError:
+            print(f"⏹️ 저장을 취소했어요")
+            raise
+        except Exception as e:
+            print(f"❌ 저장 실패: {e}")
+            raise Exception(f"결과를 저장할 수 없어요: {e}")
+    
+    def _get_temp_path(self, file_path):
+        """저장 중에 쓰는 임시 파일 경로 (확장자는 .xlsx 유지)"""
+        folder, name = os.path.split(file_path)
+        return os.path.join(folder, f"~저장중_{name}")
+    
+    def _save_workbook(self, workbook, file_path, progress_callback=None, cancel_event=None):
+        """통합 문서를 파일로 마무리 (압축하는 동안에도 진행률/취소 확인)"""
+        check_cancelled(cancel_event)
+        with open(file_path, 'wb') as f:
+            workbook.save(ProgressFile(f, progress_callback, cancel_event))
+    
+    def _discard_workbook(self, workbook):
+        """취소/오류로 버리는 write_only 통합 문서의 시트 정리 (열린 시트 XML 닫기)"""
+        for worksheet in workbook.worksheets:
+            try:
+                worksheet.close()
+            except Exception:
+                pass
+    
+    def _create_result_sheet(self, workbook, sheet_name):
+        """결과 시트 만들기 (write_only 시트는 행을 쓰기 전에 너비를 정해야 해요)"""
+        worksheet = workbook.create_sheet(sheet_name)
+        for column, width in RESULT_COLUMN_WIDTHS.items():
+            worksheet.column_dimensions[column].width = width
+        worksheet.append(self._make_header(worksheet, RESULT_COLUMNS))
+        return worksheet
+    
+    def _make_header(self, worksheet, names):
+        """굵은 글씨 머리글 행"""
+        header = []
+        for name in names:
+            cell = WriteOnlyCell(worksheet, value=name)
+            cell.font = Font(bold=True)
+            header.append(cell)
+        return header
+    
+    def _remove_partial_file(self, file_path):
+        """취소/오류로 쓰다 만 파일 지우기"""
+        try:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        except OSError:
+            pass
+    
+    def _write_result_sheet(self, workbook, address_data, sheet_name, progress_callback=None,
+                            cancel_event=None):
+        """결과 데이터를 write_only 시트 하나에 쓰기 (진행률을 알 수 있게 나눠서)"""
+        worksheet = self._create_result_sheet(workbook, sheet_name)
+        
+        total = len(address_data)
+        for start in range(0, total, PROGRESS_EVERY):
+            check_cancelled(cancel_event)
+            for item in address_data[start:start + PROGRESS_EVERY]:
+                row = self.to_result_row(item)
+                worksheet.append([row[name] for name in RESULT_COLUMNS])
+            if progress_callback:
+                progress_callback('write', min(start + PROGRESS_EVERY, total), total)
+    
+    def _write_diff_sheet(self, workbook, diff, sheet_name='이전_대비_변경'):
+        """추가/변경/삭제된 행 목록 시트 쓰기"""
+        rows = []
+        for addr in diff['added']:
+            rows.append({'구분': '추가', '순번': addr['id'], '전체주소': addr['address'],
+                         '추가정보': addr.get('additional_info', '')})
+        for addr, previous in diff['changed']:
+            rows.append({'구분': '변경', '순번': addr['id'], '이전 순번': previous['id'],
+                         '전체주소': addr['address'], '추가정보': addr.get('additional_info', ''),
+                         '이전 주소': previous['address'], '이전 추가정보': previous['additional_info'],
+                         '이전 상태': previous['status'], '이전 전화번호': previous['phone'] or ''})
+        for previous in diff['removed']:
+            rows.append({'구분': '삭제', '이전 순번': previous['id'], '이전 주소': previous['address'],
+                         '이전 추가정보': previous['additional_info'], '이전 상태': previous['status'],
+                         '이전 전화번호': previous['phone'] or ''})
+        
+        worksheet = workbook.create_sheet(sheet_name)
+        for column, width in zip('ABCDEFGHI', (8, 8, 10, 35, 25, 35, 25, 10, 15)):
+            worksheet.column_dimensions[column].width = width
+        worksheet.append(self._make_header(worksheet, DIFF_COLUMNS))
+        for row in rows:
+            worksheet.append([row.get(name) for name in DIFF_COLUMNS])
+    
+    def to_result_row(self, item):
+        """주소 데이터 하나 → 결과 시트의 한 행 {컬럼명: 값}"""
+        return {
+            '순번': item['id'],
+            '시도': item.get('city', ''),
+            '구': item.get('district', ''),
+            '동': item.get('dong', ''),
+            '번지': item.get('street_number', ''),
+            '전체주소': item['address'],
+            '추가정보': item.get('additional_info', ''),
+            '상태': item['status'],
+            '업체명': item['place_name'] if item['place_name'] else '',
+            '전화번호': item['phone'] if item['phone'] else '',
+            '카테고리': item['category'] if item['category'] else '',
+            '오류내용': item['error'] if item['error'] else '',
+            '신뢰도': item.get('confidence') or ''
+        }
+    
+    def open_result_stream(self, file_path, sheet_name='연락처_검색_결과'):
+        """한 행씩 바로 파일에 쓰는 결과 저장기 (전체 결과를 메모리에 모으지 않음)"""
+        return StreamingResultWriter(self, file_path, sheet_name)
+    
+    def save_sheet_results(self, sheet_data, file_path, progress_callback=None, cancel_event=None):
+        """
+        여러 시트의 결과를 한 파일에 저장 (시트마다 save_results와 같은 구성)
+        sheet_data: {원본 시트이름: 주소 데이터 리스트}
+        """
+        try:
+            print(f"💾 연락처 결과 저장 중: {file_path} ({len(sheet_data)}개 시트)")
+            
+            workbook = Workbook(write_only=True)
+            temp_path = self._get_temp_path(file_path)
+            try:
+                for sheet_name, address_data in sheet_data.items():
+                    # 엑셀 시트 이름은 31자까지
+                    result_sheet = f"{sheet_name}_결과"[:31]
+                    self._write_result_sheet(workbook, address_data, result_sheet,
+                                             progress_callback, cancel_event)
+                self._save_workbook(workbook, temp_path, progress_callback, cancel_event)
+                # 결과 파일이 엑셀에 열려 있으면 여기서 PermissionError
+                os.replace(temp_path, file_path)
+            except BaseException:
+                self._discard_workbook(workbook)
+                self._remove_partial_file(temp_path)
+                raise
             
             print(f"✅ 연락처 결과 저장 완료!")
             
+        except OperationCancelledError:
+            print(f"⏹️ 저장을 취소했어요")
+            raise
         except Exception as e:
             print(f"❌ 저장 실패: {e}")
             raise Exception(f"결과를 저장할 수 없어요: {e}")
 
+class StreamingResultWriter:
+    """
+    결과를 한 행씩 쓰는 저장기 (openpyxl write_only)
+    컬럼 구성/너비는 save_results와 같고, 임시 파일에 쓰다가 close()에서 바꿔치기
+    """
+    
+    def __init__(self, excel_handler, file_path, sheet_name):
+        self.excel_handler = excel_handler
+        self.file_path = file_path
+        self.temp_path = excel_handler._get_temp_path(file_path)
+        self.rows = 0
+        
+        self.workbook = Workbook(write_only=True)
+        self.worksheet = excel_handler._create_result_sheet(self.workbook, sheet_name)
+    
+    def write(self, item):
+        """주소 데이터 한 행 쓰기"""
+        row = self.excel_handler.to_result_row(item)
+        self.worksheet.append([row[name] for name in RESULT_COLUMNS])
+        self.rows += 1
+    
+    def close(self):
+        """파일 마무리 (임시 파일 → 결과 파일)"""
+        try:
+            self.workbook.save(self.temp_path)
+            os.replace(self.temp_path, self.file_path)
+        except Exception as e:
+            self.excel_handler._remove_partial_file(self.temp_path)
+            raise Exception(f"결과를 저장할 수 없어요: {e}")
+        print(f"✅ 연락처 결과 {self.rows}행 저장 완료!")
+
 # 테스트 함수
 def test_new_excel_structure():
     """새로운 엑셀 구조 테스트"""
@@ -0,0 +1,139 @@
+# utils/gateway_client.py
+# 로컬 검색 게이트웨이(utils/lookup_gateway.py)를 쓰는 얇은 클라이언트
+# LookupScheduler.run과 같은 모양으로 쓸 수 있어서 GUI/스크립트에서 그대로 바꿔 끼울 수 있어요
+
+import json
+
+import requests
+
+from utils.lookup_gateway import DEFAULT_PORT, ROW_FIELDS
+from utils.lookup_scheduler import FAILURE_INVALID
+
+
+class GatewayClient:
+    """게이트웨이에 주소 묶음을 보내고 결과를 받아오는 클라이언트"""
+
+    def __init__(self, base_url=None, client_name=""):
+        self.base_url = (base_url or f"http://127.0.0.1:{DEFAULT_PORT}").rstrip('/')
+        self.client_name = client_name
+        self.session = requests.Session()
+
+    def is_available(self):
+        """게이트웨이가 켜져 있는지"""
+        try:
+            return self.session.get(f"{self.base_url}/status", timeout=2).status_code == 200
+        except requests.RequestException:
+            return False
+
+    def get_status(self):
+        """게이트웨이 대기 현황"""
+        return self.session.get(f"{self.base_url}/status", timeout=5).json()
+
+    def submit(self, address_data):
+        """주소 묶음 보내기 (주소와 시도/구/동/번지/추가정보) → job_id"""
+        rows = [{field: addr.get(field) or '' for field in ROW_FIELDS} for addr in address_data]
+        response = self.session.post(f"{self.base_url}/jobs", timeout=30, data=json.dumps({
+            'rows': rows,
+            'client': self.client_name
+        }, ensure_ascii=False).encode('utf-8'))
+        if response.status_code != 200:
+            raise Exception(f"게이트웨이 요청 실패 (HTTP {response.status_code}): {response.text}")
+        return response.json()['job_id']
+
+    def stream(self, job_id):
+        """결과 이벤트를 처리되는 대로 하나씩 (마지막은 done/paused/cancelled/error)"""
+        with self.session.get(f"{self.base_url}/jobs/{job_id}/stream", stream=True,
+                              timeout=(5, 60)) as response:
+            if response.status_code != 200:
+                raise Exception(f"게이트웨이 결과 받기 실패 (HTTP {response.status_code})")
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    def cancel(self, job_id):
+        """남은 주소 취소"""
+        try:
+            self.session.delete(f"{self.base_url}/jobs/{job_id}", timeout=5)
+        except requests.RequestException as e:
+            print(f"⚠️ 게이트웨이 작업 취소 실패: {e}")
+
+    def run(self, address_data, on_success=None, on_error=None, on_progress=None,
+            should_stop=None):
+        """
+        LookupScheduler.run과 같은 방식으로 주소 목록 처리 (검색은 게이트웨이가)
+        반환하는 stats도 같은 키 + 'cached'(게이트웨이 기록으로 바로 채운 수)
+        """
+        stats = {'processed': 0, 'success': 0, 'error': 0, 'retried': 0, 'skipped': 0,
+                 'duplicates': 0, 'invalid': 0, 'paused': None, 'cached': 0}
+        if not address_data:
+            return stats
+
+        # 행정구역 확인에서 걸린 주소는 게이트웨이에 보내지 않고 여기서 실패 (API 호출 없음)
+        submitted = []  # 게이트웨이 행 번호 - 1 → address_data의 index
+        for index, addr_data in enumerate(address_data):
+            if not addr_data.get('invalid_address'):
+                submitted.append(index)
+                continue
+
+            message = f"주소 확인 필요: {addr_data['address_note']}"
+            addr_data['status'] = '실패'
+            addr_data['error'] = message
+            addr_data['failure_reason'] = FAILURE_INVALID
+            stats['processed'] += 1
+            stats['error'] += 1
+            stats['invalid'] += 1
+            if on_error:
+                on_error(index, addr_data, message)
+            if on_progress:
+                on_progress(stats['processed'], stats['success'], stats['error'])
+
+        if not submitted:
+            return stats
+
+        job_id = self.submit([address_data[index] for index in submitted])
+        cancel_sent = False
+
+        for event in self.stream(job_id):
+            if should_stop and should_stop() and not cancel_sent:
+                self.cancel(job_id)
+                cancel_sent = True
+
+            if event['type'] == 'paused':
+                stats['paused'] = event['message']
+            elif event['type'] == 'error':
+                print(f"❌ 게이트웨이 작업 오류 (남은 주소는 대기중): {event['message']}")
+            if event['type'] != 'result':
+                continue
+
+            index = submitted[event['id'] - 1]
+            addr_data = address_data[index]
+            addr_data['status'] = event['status']
+            addr_data['error'] = event['error']
+            addr_data['failure_reason'] = event.get('failure_reason')
+            stats['processed'] += 1
+            if event['cached']:
+                stats['cached'] += 1
+
+            if event['status'] == '성공':
+                contact_info = {
+                    'place_name': event['place_name'],
+                    'phone': event['phone'],
+                    'category': event['category'] or '',
+                    'confidence_label': event.get('confidence') or ''
+                }
+                addr_data['place_name'] = contact_info['place_name']
+                addr_data['phone'] = contact_info['phone']
+                addr_data['category'] = contact_info['category']
+                addr_data['confidence'] = contact_info['confidence_label']
+                stats['success'] += 1
+                if on_success:
+                    on_success(index, addr_data, contact_info)
+            else:
+                stats['error'] += 1
+                if on_error:
+                    on_error(index, addr_data, event['error'])
+
+            if on_progress:
+                on_progress(stats['processed'], stats['success'], stats['error'])
+
+        return stats
@@ -0,0 +1,187 @@
+# utils/hedging.py
+# 느린 응답 대비 "헤징(중복 요청)"
+# - 요청이 지금까지의 p95 응답 시간 안에 안 오면 다른 연결로 같은 요청을 한 번 더 보내요
+# - 먼저 온 응답을 쓰고, 늦은 쪽은 취소(아직 안 보냈으면 보내지 않고, 이미 보냈으면 응답을 버림)
+# - 중복 요청도 API 호출 한도에 포함되니까 전체 요청의 일부(max_hedge_ratio)까지만,
+#   그리고 속도 제한에 여유가 있을 때(can_hedge)만 보내요
+
+import math
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import requests
+
+
+def get_percentile(values, percentile):
+    """값 목록의 백분위수 (값이 없으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, math.ceil(percentile * len(ordered)) - 1)
+    return ordered[index]
+
+
+class HedgedRequester:
+    """p95보다 늦는 요청에 중복 요청을 보내서 꼬리 지연을 줄이는 도우미"""
+
+    def __init__(self, percentile=0.95, min_samples=20, min_delay=0.3,
+                 max_hedge_ratio=0.1, window=200, max_workers=8):
+        """
+        percentile: 이 백분위 응답 시간이 지나면 중복 요청 (기본 p95)
+        min_samples: 응답 시간이 이만큼 쌓이기 전에는 중복 요청 안 함
+        min_delay: 중복 요청 전 최소 대기 시간 (초, 원래 빠른 요청에는 보내지 않게)
+        max_hedge_ratio: 전체 요청 중 중복 요청 최대 비율 (호출 한도 보호)
+        window: 응답 시간 기록 개수 (최근 것만 사용)
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_hedge_ratio = max_hedge_ratio
+
+        self.latencies = deque(maxlen=window)  # 첫 요청 하나만 보냈을 때의 응답 시간
+        self.effective_latencies = deque(maxlen=window)  # 헤징 포함 실제로 기다린 시간
+        self.stats = {'requests': 0, 'hedges': 0, 'hedge_wins': 0, 'cancelled': 0}
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self._sessions = queue.LifoQueue()  # 쉬고 있는 세션 (세션마다 연결이 따로예요)
+        self._lock = threading.Lock()
+
+    def get_hedge_delay(self):
+        """중복 요청을 보내기 전 기다릴 시간 (기록이 부족하면 None = 헤징 안 함)"""
+        with self._lock:
+            if len(self.latencies) < self.min_samples:
+                return None
+            latencies = list(self.latencies)
+        return max(self.min_delay, get_percentile(latencies, self.percentile))
+
+    def get(self, url, params=None, headers=None, timeout=10, can_hedge=None):
+        """
+        session.get과 같은 결과(Response)를 돌려줌
+        can_hedge(): 중복 요청 직전에 호출 - 속도 제한/한도 여유가 없으면 False
+        두 요청 모두 실패하면 먼저 난 오류를 그대로 올림
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self.stats['requests'] += 1
+
+        primary = self._executor.submit(self._send, url, params, headers, timeout)
+        primary.add_done_callback(lambda future: self._record_primary(future, started, timeout))
+        attempts = [primary]
+
+        delay = self.get_hedge_delay()
+        if delay is not None:
+            try:
+                # p95 안에 오면 중복 요청 없이 끝
+                primary.result(timeout=delay)
+            except FutureTimeoutError:
+                if self._has_hedge_budget() and (can_hedge is None or can_hedge()):
+                    with self._lock:
+                        self.stats['hedges'] += 1
+                    attempts.append(self._executor.submit(self._send, url, params, headers, timeout))
+            except Exception:
+                pass
+
+        response, error = self._wait_first_success(attempts)
+
+        with self._lock:
+            self.effective_latencies.append(time.perf_counter() - started)
+
+        if error is not None:
+            raise error
+        return response
+
+    def _wait_first_success(self, attempts):
+        """먼저 성공한 응답 하나 고르기 → (response, 첫 오류)"""
+        pending = set(attempts)
+        first_error = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    first_error = first_error or future.exception()
+                    continue
+
+                if future is not attempts[0]:
+                    with self._lock:
+                        self.stats['hedge_wins'] += 1
+                self._cancel(pending)
+                return future.result(), None
+
+        return None, first_error
+
+    def _cancel(self, futures):
+        """진 요청 취소 (아직 시작 안 했으면 취소, 이미 보냈으면 응답이 오는 대로 닫기)"""
+        for future in futures:
+            with self._lock:
+                self.stats['cancelled'] += 1
+            if not future.cancel():
+                future.add_done_callback(self._close_response)
+
+    @staticmethod
+    def _close_response(future):
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def _send(self, url, params, headers, timeout):
+        """쉬는 세션 하나를 빌려서 요청 (없으면 새 연결용 세션 만들기)"""
+        try:
+            session = self._sessions.get_nowait()
+        except queue.Empty:
+            session = requests.Session()
+
+        try:
+            return session.get(url, params=params, headers=dict(headers or {}), timeout=timeout)
+        finally:
+            self._sessions.put(session)
+
+    def _record_primary(self, future, started, timeout):
+        """첫 요청의 응답 시간 기록 (헤징으로 졌어도 '헤징이 없었다면'의 기준으로 사용)"""
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is None:
+            latency = time.perf_counter() - started
+        elif isinstance(error, requests.Timeout):
+            latency = timeout  # 헤징이 없었다면 타임아웃까지 기다렸을 시간
+        else:
+            return
+
+        with self._lock:
+            self.latencies.append(latency)
+
+    def _has_hedge_budget(self):
+        """중복 요청 비율이 한도 안인지"""
+        with self._lock:
+            return self.stats['hedges'] < self.stats['requests'] * self.max_hedge_ratio
+
+    def get_stats(self):
+        """통계 + 헤징 없을 때/있을 때 p99 (초)"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['p95_delay'] = get_percentile(list(self.latencies), self.percentile)
+            stats['p99_without'] = get_percentile(list(self.latencies), 0.99)
+            stats['p99_with'] = get_percentile(list(self.effective_latencies), 0.99)
+        return stats
+
+    @staticmethod
+    def format_stats(stats):
+        """통계 → 로그용 한 줄"""
+        line = (f"🪁 중복 요청(헤징) {stats['hedges']}번 / 전체 {stats['requests']}번, "
+                f"중복 요청이 먼저 온 경우 {stats['hedge_wins']}번")
+        if stats['p99_without'] and stats['p99_with']:
+            improvement = (1 - stats['p99_with'] / stats['p99_without']) * 100
+            line += (f", p99 {stats['p99_without']:.2f}초 → {stats['p99_with']:.2f}초 "
+                     f"({improvement:.0f}% 개선)")
+        return line
+
+    def close(self):
+        """스레드와 연결 정리"""
+        self._executor.shutdown(wait=False)
+        while not self._sessions.empty():
+            self._sessions.get_nowait().close()
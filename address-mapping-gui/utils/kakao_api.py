@@ -2,14 +2,37 @@
 # 더 정확한 주소 매칭을 위한 개선된 버전
 
 import requests
+import threading
 import time
+from contextlib import contextmanager
 from urllib.parse import quote
 
+from utils.api_errors import (TransientAPIError, ContactNotFoundError, QuotaExhaustedError,
+                              ProviderUnavailableError, APIKeyRejectedError)
+from utils.circuit_breaker import CircuitBreaker
+from utils.rate_limiter import RateLimiter
+
+COORDS_CACHE_SIZE = 50000  # 좌표 캐시 최대 개수 (넘으면 비우고 다시 쌓음)
+PROBE_QUERY = "서울특별시 중구 세종대로 110"  # 차단 중 상태 확인용 주소 검색 (응답이 작고 항상 결과 있음)
+PROBE_TIMEOUT = 3
+NEARBY_RADIUS = 500  # 2단계 근처 검색 반경 (m, 묶음 검색도 이만큼은 보고 "근처 검색 끝"으로 쳐요)
+
 class KakaoAPI:
     """카카오 API로 정확한 연락처 검색"""
     
-    def __init__(self, api_key):
+    def __init__(self, api_key, keyword_stats=None, ledger=None, backup_keys=None, geocoder=None,
+                 hedger=None, archive=None, replay=False):
         self.api_key = api_key
+        self.api_keys = [api_key] + list(backup_keys or [])  # 한도가 차면 다음 키로 교체
+        self.keyword_stats = keyword_stats  # 동네별 키워드 적중 통계 (없으면 고정 순서)
+        self.ledger = ledger  # API 키별 하루 호출 수 장부 (UsageLedger)
+        self.geocoder = geocoder  # 오프라인 주소 → 좌표 DB (OfflineGeocoder, 없으면 항상 API 사용)
+        self.hedger = hedger  # 느린 응답에 중복 요청 (HedgedRequester, 없으면 사용 안 함)
+        self.archive = archive  # 원본 응답 보관소 (ResponseArchive, 없으면 보관 안 함)
+        self.replay = replay  # True면 API 대신 보관된 응답으로만 검색 (재매칭)
+        self.call_count = 0
+        self.offline_geocode_hits = 0
+        self.coords_cache = {}  # 주소 → 좌표 (같은 주소를 다시 변환하지 않게, 묶음 검색/검증 단계에서 재사용)
         self.keyword_url = "https://dapi.kakao.com/v2/local/search/keyword.json"
         self.address_url = "https://dapi.kakao.com/v2/local/search/address.json"
         
@@ -19,22 +42,31 @@ class KakaoAPI:
             'Content-Type': 'application/json'
         })
         
-        self.last_call_time = 0
         self.min_interval = 0.1
+        self.rate_limiter = RateLimiter(self.min_interval)
+        self._local = threading.local()  # 스레드별 설정 (우선 호출인지, 이 스레드의 호출 수)
+        # API 키별 회로 차단기 (계속 실패하는 키는 요청을 멈추고 가벼운 확인 요청만)
+        self.breakers = {
+            key: CircuitBreaker(f"카카오 API 키 {number}", probe=lambda key=key: self._probe(key))
+            for number, key in enumerate(self.api_keys, start=1)
+        }
         
         print(f"🗝️ 정확한 카카오 연락처 검색 API가 준비되었어요!")
     
-    def find_contact_info(self, address):
+    def find_contact_info(self, address, nearby_checked=False):
         """
         주소로 연락처 정보 찾기 (정확도 개선)
+        nearby_checked: 묶음 검색(ClusterPlanner)에서 이미 근처를 찾아봤으면 True → 2단계 건너뜀
         """
+        calls_before = self.get_thread_calls()
+        
         try:
             print(f"🔍 정확한 연락처 검색: {address[:30]}...")
             
-            # 1단계: 정확한 주소로 좌표 구하기
-            coords = self._get_address_coordinates(address)
+            # 1단계: 정확한 주소로 좌표 구하기 (오프라인 DB에 있으면 API 호출 없이)
+            coords = self.get_coordinates(address)
             
-            if coords:
+            if coords and not nearby_checked:
                 # 2단계: 해당 좌표 근처 500m 이내에서 전화번호 있는 곳 찾기
                 result = self._find_nearby_places_with_phone(coords, address)
                 if result:
@@ -44,28 +76,78 @@ class KakaoAPI:
             print(f"   🔄 기존 방법으로 재시도...")
             return self._fallback_search(address)
             
-        except Exception as e:
-            raise e
+        finally:
+            # 주소 1건당 호출 수 기록 (예상 비용 계산에 사용)
+            calls = self.get_thread_calls() - calls_before
+            if self.ledger and calls:
+                self.ledger.record_row('kakao', calls)
+    
+    def get_coordinates(self, address):
+        """주소 → 좌표 (오프라인 DB 먼저, 없으면 API)"""
+        if address in self.coords_cache:
+            return self.coords_cache[address]
+        
+        coords = None
+        if self.geocoder:
+            coords = self.geocoder.lookup(address)
+            if coords:
+                self.offline_geocode_hits += 1
+        
+        if not coords:
+            coords = self._get_address_coordinates(address)
+        
+        if len(self.coords_cache) >= COORDS_CACHE_SIZE:
+            self.coords_cache.clear()
+        self.coords_cache[address] = coords
+        return coords
+    
+    def search_nearby(self, coords, query, radius=500, size=15):
+        """좌표 반경 안에서 키워드 검색 → 장소 목록 (없으면 빈 리스트)"""
+        params = {
+            'x': coords['lng'],
+            'y': coords['lat'],
+            'radius': radius,
+            'query': query,
+            'size': size
+        }
+        
+        data = self._get(self.keyword_url, params)
+        if not data:
+            return []
+        return data.get('documents') or []
+    
+    def search_in_rect(self, rect, query, page=1, size=15):
+        """
+        사각형 영역 안에서 키워드 검색 (한 페이지)
+        rect: (서쪽 경도, 남쪽 위도, 동쪽 경도, 북쪽 위도)
+        반환: (장소 목록, 응답 meta) - 요청이 실패했으면 ([], None)
+        meta의 is_end는 넘겨볼 수 있는 결과(최대 45곳)만 기준이라
+        영역 안 전체 수는 total_count로 따로 봐야 해요
+        """
+        params = {
+            'rect': ",".join(f"{value:.6f}" for value in rect),
+            'query': query,
+            'page': page,
+            'size': size
+        }
+        
+        data = self._get(self.keyword_url, params)
+        if not data:
+            return [], None
+        return data.get('documents') or [], data.get('meta') or {}
     
     def _get_address_coordinates(self, address):
         """주소를 좌표로 변환"""
+        params = {
+            'query': address
+        }
+        
+        data = self._get(self.address_url, params)
+        
+        if not data or not data.get('documents'):
+            return None
+        
         try:
-            self._wait_for_rate_limit()
-            
-            params = {
-                'query': address
-            }
-            
-            response = self.session.get(self.address_url, params=params, timeout=10)
-            
-            if response.status_code != 200:
-                return None
-                
-            data = response.json()
-            
-            if not data.get('documents'):
-                return None
-            
             # 첫 번째 결과의 좌표 사용
             result = data['documents'][0]
             return {
@@ -74,35 +156,20 @@ class KakaoAPI:
                 'address_name': result['address_name']
             }
             
-        except:
+        except (KeyError, TypeError, ValueError):
             return None
     
     def _find_nearby_places_with_phone(self, coords, original_address):
         """좌표 근처에서 전화번호 있는 장소 찾기"""
+        # 좌표 기반 주변 검색 (500m 반경, 일단 음식점으로 검색)
+        places = self.search_nearby(coords, '음식점', radius=NEARBY_RADIUS)
+        
+        if not places:
+            return None
+        
         try:
-            self._wait_for_rate_limit()
-            
-            # 좌표 기반 주변 검색
-            params = {
-                'x': coords['lng'],
-                'y': coords['lat'],
-                'radius': 500,  # 500m 반경
-                'query': '음식점',  # 일단 음식점으로 검색
-                'size': 15
-            }
-            
-            response = self.session.get(self.keyword_url, params=params, timeout=10)
-            
-            if response.status_code != 200:
-                return None
-                
-            data = response.json()
-            
-            if not data.get('documents'):
-                return None
-            
             # 전화번호가 있고, 주소가 유사한 곳 찾기
-            for place in data['documents']:
+            for place in places:
                 phone = place.get('phone', '').strip()
                 place_name = place.get('place_name', '').strip()
                 place_address = place.get('address_name', '').strip()
@@ -122,7 +189,7 @@ class KakaoAPI:
             
             return None
             
-        except:
+        except (KeyError, TypeError, AttributeError):
             return None
     
     def _is_address_similar(self, addr1, addr2):
@@ -139,43 +206,41 @@ class KakaoAPI:
     
     def _fallback_search(self, address):
         """기존 방법으로 검색 (정확도는 떨어지지만 결과는 나옴)"""
-        try:
-            # 여러 키워드로 시도
-            keywords = ["음식점", "카페", "병원", "편의점", "마트"]
-            
-            for keyword in keywords:
-                result = self._try_search(f"{address} {keyword}")
-                if result:
-                    result['match_type'] = 'nearby_search'
-                    print(f"   ⚠️ 근처 검색 결과: {result['place_name']} - {result['phone']}")
-                    print(f"      (정확한 주소 매칭은 아닐 수 있음)")
-                    return result
-            
-            raise Exception("전화번호를 찾을 수 없어요")
-            
-        except Exception as e:
-            raise e
+        # 여러 키워드로 시도 (통계가 있으면 이 동네에서 잘 맞던 키워드부터)
+        keywords = ["음식점", "카페", "병원", "편의점", "마트"]
+        if self.keyword_stats:
+            keywords = self.keyword_stats.order_keywords('kakao', address, keywords)
+        
+        tried = []
+        for keyword in keywords:
+            tried.append(keyword)
+            result = self._try_search(f"{address} {keyword}")
+            if result:
+                if self.keyword_stats:
+                    self.keyword_stats.record('kakao', address, tried, keyword)
+                result['match_type'] = 'nearby_search'
+                print(f"   ⚠️ 근처 검색 결과: {result['place_name']} - {result['phone']}")
+                print(f"      (정확한 주소 매칭은 아닐 수 있음)")
+                return result
+        
+        if self.keyword_stats:
+            self.keyword_stats.record('kakao', address, tried)
+        
+        raise ContactNotFoundError("전화번호를 찾을 수 없어요")
     
     def _try_search(self, query):
         """기본 키워드 검색"""
+        params = {
+            'query': query,
+            'size': 15
+        }
+        
+        data = self._get(self.keyword_url, params)
+        
+        if not data or not data.get('documents'):
+            return None
+        
         try:
-            self._wait_for_rate_limit()
-            
-            params = {
-                'query': query,
-                'size': 15
-            }
-            
-            response = self.session.get(self.keyword_url, params=params, timeout=10)
-            
-            if response.status_code != 200:
-                return None
-                
-            data = response.json()
-            
-            if not data.get('documents'):
-                return None
-            
             # 전화번호가 있는 첫 번째 결과 반환
             for place in data['documents']:
                 phone = place.get('phone', '').strip()
@@ -190,23 +255,181 @@ class KakaoAPI:
             
             return None
             
-        except:
+        except (KeyError, TypeError, AttributeError):
             return None
     
-    def _wait_for_rate_limit(self):
-        """API 호출 제한 관리"""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_call_time
+    def _get(self, url, params):
+        """
+        API 호출 공통 처리
+        요청 오류(타임아웃/연결 등)/429/5xx는 TransientAPIError로 올려서 나중에 재시도할 수 있게 해요
+        401/403은 그 키만 사용 불가로 두고 다른 키로 바로 다시 요청 (남은 키가 없으면 APIKeyRejectedError)
+        재매칭 모드면 호출 없이 보관된 응답 사용 (보관 안 된 요청은 결과 없음)
+        """
+        if self.replay:
+            _, data = self.archive.find('kakao', url, params)
+            return data
+        
+        self._check_quota()
+        breaker = self._select_key()
+        self._wait_for_rate_limit()
+        
+        started = time.time()
+        try:
+            if self.hedger:
+                response = self.hedger.get(url, params, headers=self.session.headers, timeout=10,
+                                           can_hedge=self._use_hedge_call)
+            else:
+                response = self.session.get(url, params=params, timeout=10)
+        except requests.RequestException as e:
+            # 타임아웃/연결 끊김뿐 아니라 응답이 중간에 끊기거나(ChunkedEncodingError)
+            # 리다이렉트가 반복되는 것도 장애라서 차단기에 세고 나중에 다시 시도
+            breaker.record_failure()
+            raise TransientAPIError(f"카카오 API 연결 오류: {e}")
+        finally:
+            self._count_call()
+            if self.ledger:
+                self.ledger.record_call('kakao', self.api_key, time.time() - started)
+        
+        if response.status_code == 429 or response.status_code >= 500:
+            breaker.record_failure()
+            raise TransientAPIError(f"카카오 API 일시 오류 (HTTP {response.status_code})")
+        
+        if response.status_code in (401, 403):
+            # 키 문제는 재시도해도 그대로라 이 키만 빼고 다른 키로 (_select_key가 고름)
+            breaker.mark_dead(f"키가 거부됐어요 (HTTP {response.status_code})")
+            return self._get(url, params)
+        
+        breaker.record_success()
+        
+        data = None
+        if response.status_code == 200:
+            try:
+                data = response.json()
+            except ValueError:
+                data = None
+        
+        if self.archive:
+            self.archive.record('kakao', url, params, response.status_code, data)
+        return data
+    
+    def _count_call(self):
+        """호출 1번 세기 (전체 수와 이 스레드에서 쓴 수)"""
+        self.call_count += 1
+        self._local.calls = self.get_thread_calls() + 1
+    
+    def get_thread_calls(self):
+        """이 스레드에서 지금까지 쓴 호출 수 (미리 구하기처럼 다른 작업과 나눠 셀 때)"""
+        return getattr(self._local, 'calls', 0)
+    
+    def _use_hedge_call(self):
+        """중복 요청 1번을 호출 한도/속도 제한 안에서 쓸 수 있으면 기록하고 True"""
+        if self.ledger and self.ledger.is_near_limit('kakao', self.api_key):
+            return False
+        if not self.rate_limiter.try_acquire():
+            return False
+        
+        self._count_call()
+        if self.ledger:
+            self.ledger.record_call('kakao', self.api_key)
+        return True
+    
+    def _select_key(self):
+        """
+        회로 차단기가 닫힌 키 고르기 → 그 키의 차단기 반환
+        지금 키가 막혔으면 다른 키로 바꾸고, 모든 키가 막혔으면 ProviderUnavailableError (요청 안 보냄)
+        """
+        breaker = self.breakers[self.api_key]
+        if breaker.allow():
+            return breaker
+        
+        for api_key in self.api_keys:
+            if api_key == self.api_key or (self.ledger and self.ledger.is_near_limit('kakao', api_key)):
+                continue
+            if self.breakers[api_key].allow():
+                print(f"🔑 응답이 없는 키 대신 다른 API 키로 바꿨어요")
+                self._use_key(api_key)
+                return self.breakers[api_key]
+        
+        alive = [other for other in self.breakers.values() if not other.is_dead()]
+        if not alive:
+            raise APIKeyRejectedError("카카오 API 키가 모두 거부됐어요 (키를 확인해 주세요)")
+        
+        retry_after = min(other.get_retry_after() for other in alive)
+        raise ProviderUnavailableError(f"카카오 API가 응답하지 않아요 ({retry_after:.0f}초 뒤 다시 확인)",
+                                       retry_after)
+    
+    def _probe(self, api_key):
+        """차단된 키 상태 확인 (주소 검색 한 번, 짧은 타임아웃)"""
+        self._wait_for_rate_limit()
+        try:
+            response = self.session.get(self.address_url, params={'query': PROBE_QUERY},
+                                        headers={'Authorization': f'KakaoAK {api_key}'},
+                                        timeout=PROBE_TIMEOUT)
+        except requests.RequestException:
+            return False
+        finally:
+            self._count_call()
+            if self.ledger:
+                self.ledger.record_call('kakao', api_key)
+        return response.status_code == 200
+    
+    def get_breaker_status(self):
+        """키별 차단기 상태 (로그용 줄 목록)"""
+        return [breaker.format_status() for breaker in self.breakers.values()]
+    
+    def get_rejected_keys(self):
+        """거부돼서 사용 불가가 된 키 상태 (로그용 줄 목록)"""
+        return [breaker.format_status() for breaker in self.breakers.values() if breaker.is_dead()]
+    
+    def _check_quota(self):
+        """오늘 한도에 거의 다 찬 키는 다음 키로 교체 (남은 키가 없으면 QuotaExhaustedError)"""
+        if not self.ledger or not self.ledger.is_near_limit('kakao', self.api_key):
+            return
         
-        if time_since_last_call < self.min_interval:
-            time.sleep(self.min_interval - time_since_last_call)
+        for api_key in self.api_keys:
+            if not self.ledger.is_near_limit('kakao', api_key):
+                print(f"🔑 오늘 한도에 거의 다 차서 다른 API 키로 바꿨어요")
+                self._use_key(api_key)
+                return
         
-        self.last_call_time = time.time()
+        raise QuotaExhaustedError("오늘 카카오 API 호출 한도에 거의 다 찼어요 (모든 키)")
+    
+    def _use_key(self, api_key):
+        """사용할 API 키 바꾸기"""
+        self.api_key = api_key
+        self.session.headers['Authorization'] = f'KakaoAK {api_key}'
     
-    def test_api_key(self):
-        """API 키 테스트"""
+    @contextmanager
+    def priority_lane(self):
+        """
+        이 안에서 하는 호출은 일괄 검색보다 먼저 차례를 받아요
+        (같은 속도 제한기를 쓰니 전체 호출 간격은 그대로 지켜짐)
+        """
+        self._local.priority = True
+        try:
+            yield
+        finally:
+            self._local.priority = False
+    
+    def _wait_for_rate_limit(self):
+        """API 호출 제한 관리"""
+        self.rate_limiter.wait(priority=getattr(self._local, 'priority', False))
+    
+    def test_api_key(self, sample_address=None):
+        """
+        API 키 테스트
+        sample_address: 있으면 버리는 검색 대신 이 주소 좌표를 구해서 테스트 (좌표는 캐시에 남아 재사용)
+        """
         try:
             print("🧪 API 키 테스트 중...")
+            if sample_address:
+                calls_before = self.call_count
+                self.get_coordinates(sample_address)
+                # 오프라인 DB에서 찾아서 호출을 안 했으면 아래 검색으로 테스트
+                if self.call_count > calls_before:
+                    print(f"✅ API 키는 유효해요!")
+                    return True
+            
             result = self._try_search("서울역 맛집")
             
             if result:
@@ -0,0 +1,139 @@
+# utils/keyword_stats.py
+# 동네(구/동)별로 어떤 검색 키워드가 전화번호를 찾아줬는지 기록하고
+# 다음 실행 때 잘 맞는 키워드부터 시도하도록 순서를 정해주는 모듈
+
+import json
+import os
+import random
+import threading
+
+from utils.data_paths import get_data_path
+
+
+class KeywordStats:
+    """
+    키워드별 적중 통계 (구/동 단위)
+    순서는 톰슨 샘플링(베타 분포)으로 정해요.
+    - 잘 맞았던 키워드일수록 앞으로 오고
+    - 기록이 적은 키워드도 가끔 앞에 와서 새로 배울 기회를 얻어요
+    호출 비용이 모두 같으니 적중 확률이 높은 순서로 시도하면 평균 호출 수가 가장 적어요.
+    """
+
+    def __init__(self, file_path=None, prune_after=10, explore_rate=0.1, rng=None):
+        """
+        prune_after: 한 동네에서 이 횟수 이상 시도했는데 한 번도 안 맞은 키워드는 보통 빼기
+                     (같은 동네에 맞은 키워드가 있을 때만, None이면 빼지 않음)
+        explore_rate: 뺄 키워드도 이 확률로 맨 뒤에 넣어서 다시 시도
+                      (영영 빼 버리면 기록이 안 바뀌어서 동네 사정이 달라져도 돌아올 수 없어요)
+        """
+        self.file_path = file_path or get_data_path("keyword_stats.json")
+        self.prune_after = prune_after
+        self.explore_rate = explore_rate
+        self.rng = rng or random.Random()
+        self.data = {}  # {provider: {지역: {키워드: [시도, 적중]}}}
+        self._district_totals = {}  # {provider: {구: {키워드: [시도, 적중]}}} (구 전체 합, data에서 계산)
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """저장된 통계 읽기"""
+        if not os.path.exists(self.file_path):
+            return
+
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 키워드 통계를 읽지 못했어요: {e}")
+            self.data = {}
+
+        for provider, areas in self.data.items():
+            for area, keywords in areas.items():
+                for keyword, (tries, hits) in keywords.items():
+                    self._add_district_counts(provider, area, keyword, tries, hits)
+
+    def _add_district_counts(self, provider, area, keyword, tries, hits):
+        """구 전체 합에 더하기"""
+        district = self.get_district(area)
+        counts = self._district_totals.setdefault(provider, {}).setdefault(district, {}).setdefault(
+            keyword, [0, 0])
+        counts[0] += tries
+        counts[1] += hits
+
+    @staticmethod
+    def get_area(address):
+        """주소에서 지역 키 만들기 ("부산광역시 동래구 온천동 871-95" → "동래구 온천동")"""
+        parts = address.split()
+        if len(parts) >= 3:
+            return f"{parts[1]} {parts[2]}"
+        return " ".join(parts)
+
+    @staticmethod
+    def get_district(area):
+        """지역 키에서 구만 떼어내기 (동 기록이 없을 때 참고용)"""
+        return area.split()[0] if area else ""
+
+    def _get_counts(self, provider, area, keyword):
+        """동 기록을 우선 쓰고, 기록이 적으면 같은 구의 기록을 반쯤 섞어서 사용"""
+        tries, hits = self.data.get(provider, {}).get(area, {}).get(keyword, [0, 0])
+
+        if tries < 3:
+            # 구 전체 합에서 이 동 몫을 빼면 같은 구의 다른 동 합 (동을 하나씩 훑지 않음)
+            district = self._district_totals.get(provider, {}).get(self.get_district(area), {})
+            district_tries, district_hits = district.get(keyword, [0, 0])
+            tries += (district_tries - tries) * 0.5
+            hits += (district_hits - hits) * 0.5
+
+        return tries, hits
+
+    def order_keywords(self, provider, address, keywords):
+        """
+        이 주소에서 시도할 키워드 순서
+        안 맞는 키워드는 보통 빼지만, 가끔(explore_rate) 맨 뒤에 넣어서 다시 기회를 줘요
+        """
+        area = self.get_area(address)
+
+        with self._lock:
+            area_stats = self.data.get(provider, {}).get(area, {})
+            has_hit = any(hits > 0 for _, hits in area_stats.values())
+
+            scored = []
+            explored = []
+            for position, keyword in enumerate(keywords):
+                tries, hits = area_stats.get(keyword, [0, 0])
+                if (self.prune_after and has_hit and hits == 0
+                        and tries >= self.prune_after):
+                    if self.rng.random() < self.explore_rate:
+                        explored.append(keyword)
+                    continue
+
+                tries, hits = self._get_counts(provider, area, keyword)
+                sample = self.rng.betavariate(hits + 1, tries - hits + 1)
+                # 점수가 같으면 원래 순서 유지
+                scored.append((-sample, position, keyword))
+
+        scored.sort()
+        return [keyword for _, _, keyword in scored] + explored
+
+    def record(self, provider, address, tried_keywords, hit_keyword=None):
+        """시도한 키워드들과 전화번호를 찾아준 키워드 기록"""
+        area = self.get_area(address)
+
+        with self._lock:
+            area_stats = self.data.setdefault(provider, {}).setdefault(area, {})
+            for keyword in tried_keywords:
+                counts = area_stats.setdefault(keyword, [0, 0])
+                hit = 1 if keyword == hit_keyword else 0
+                counts[0] += 1
+                counts[1] += hit
+                self._add_district_counts(provider, area, keyword, 1, hit)
+
+    def save(self):
+        """통계 파일 저장"""
+        with self._lock:
+            text = json.dumps(self.data, ensure_ascii=False)
+
+        temp_path = self.file_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, self.file_path)
@@ -0,0 +1,360 @@
+# utils/lookup_gateway.py
+# 한 컴퓨터의 모든 GUI/스크립트가 같이 쓰는 로컬 검색 게이트웨이
+# - 카카오 API 클라이언트, API 키 목록, 결과 캐시(기록 저장소), 속도 제한을 이 프로세스 하나가 가짐
+# - 여러 창/스크립트가 보낸 주소 묶음을 한 줄(queue)에 세우고 MAX_ACTIVE_JOBS개까지 동시에 처리
+#   (작업마다 스케줄러를 한 번만 돌리니까 재시도 대기/중복 주소 재사용이 작업 전체에 걸쳐 되고,
+#    재시도 백오프는 그 작업만 기다려요. 호출 간격은 같은 KakaoAPI의 속도 제한이 나눠 지켜요)
+#   → 같은 키의 한도를 서로 모르고 나눠 쓰는 일이 없어요
+# - 결과는 처리되는 대로 한 줄에 하나씩(JSON Lines) 흘려보내요
+#
+# 실행: python main.py --gateway --api-key 키1,키2 [--port 8780]
+# HTTP API (127.0.0.1 전용):
+#   POST   /jobs               {"rows": [{"address", "city", "district", "dong", "street_number",
+#                                          "additional_info"}, ...], "client": "이름"} → {"job_id", "total"}
+#                               (예전 형식 {"addresses": ["주소", ...]}도 받아요)
+#   GET    /jobs/<id>/stream   처리 결과를 한 줄씩 (끝나면 {"type": "done"})
+#   DELETE /jobs/<id>          남은 주소 취소
+#   GET    /status             대기 중인 작업/주소 수, 오늘 남은 호출 수
+
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from utils.kakao_api import KakaoAPI
+from utils.keyword_stats import KeywordStats
+from utils.lookup_scheduler import LookupScheduler, NegativeResultStore
+from utils.quota import UsageLedger
+from utils.response_archive import ResponseArchive
+from utils.results_store import ResultsStore
+from utils.offline_geocoder import OfflineGeocoder
+from utils.verification import MatchVerifier
+
+DEFAULT_PORT = 8780
+MAX_ACTIVE_JOBS = 3  # 동시에 처리하는 작업 수 (큰 작업이 작은 작업을 오래 막지 않게)
+KEEP_FINISHED_SECONDS = 3600  # 끝난 작업 결과를 남겨두는 시간 (늦게 받으러 오는 클라이언트용)
+
+# 클라이언트가 보내는 행 항목 (기록 저장소에 구/동까지 남겨야 기록 검색/적중 통계가 맞아요)
+ROW_FIELDS = ('address', 'city', 'district', 'dong', 'street_number', 'additional_info')
+
+
+def make_job_row(index, item):
+    """요청의 행 하나(dict 또는 주소 문자열) → 작업 행 (주소가 없으면 ValueError)"""
+    if isinstance(item, str):
+        item = {'address': item}
+    if not isinstance(item, dict):
+        raise ValueError(f"{index + 1}번째 행 형식이 잘못됐어요")
+
+    row = {field: str(item.get(field) or '').strip() for field in ROW_FIELDS}
+    if not row['address']:
+        raise ValueError(f"{index + 1}번째 행에 주소가 없어요")
+
+    row.update(id=index + 1, status='대기중')
+    return row
+
+
+class GatewayJob:
+    """게이트웨이에 들어온 주소 묶음 하나"""
+
+    def __init__(self, job_id, rows, client=""):
+        """rows: make_job_row로 만든 행들"""
+        self.job_id = job_id
+        self.client = client
+        self.total = len(rows)
+        self.rows = rows
+        self.events = []  # 스트림으로 보낼 이벤트 (처리 순서대로)
+        self.cancelled = False
+        self.finished = False
+        self.finished_at = None
+        self.condition = threading.Condition()
+
+    def count_pending(self):
+        """아직 결과가 안 나온 주소 수"""
+        return sum(1 for row in self.rows if row['status'] in ('대기중', '재시도대기'))
+
+    def add_event(self, event):
+        with self.condition:
+            self.events.append(event)
+            self.condition.notify_all()
+
+    def finish(self, reason='done', message=""):
+        """작업 끝 (남은 대기중 주소도 함께 알림)"""
+        self.finished = True
+        self.finished_at = time.time()
+        self.add_event({'type': reason, 'message': message,
+                        'pending': sum(1 for row in self.rows if row['status'] == '대기중')})
+
+    def wait_events(self, since, timeout=15):
+        """since번째 이후 이벤트가 생길 때까지 기다렸다가 돌려줌"""
+        with self.condition:
+            if len(self.events) <= since and not self.finished:
+                self.condition.wait(timeout)
+            return self.events[since:]
+
+
+class LookupGateway:
+    """검색 요청을 한 줄로 모아서 처리하는 게이트웨이"""
+
+    def __init__(self, api_keys, use_history=True):
+        self.keyword_stats = KeywordStats()
+        self.ledger = UsageLedger()
+        self.negative_store = NegativeResultStore()
+        self.results_store = ResultsStore()
+        self.response_archive = ResponseArchive()
+        self.use_history = use_history
+        self.kakao_api = KakaoAPI(api_keys[0], keyword_stats=self.keyword_stats, ledger=self.ledger,
+                                  backup_keys=api_keys[1:], geocoder=OfflineGeocoder.open_if_exists(),
+                                  archive=self.response_archive)
+        self.verifier = MatchVerifier(self.kakao_api)
+        # 클라이언트가 몇 개든 API 호출은 이 KakaoAPI 하나로만 (속도 제한/키 교체 공유)
+        # 스케줄러는 실행 상태를 run() 안에만 두니까 작업 스레드들이 같이 써도 돼요
+        self.scheduler = LookupScheduler(self.verifier.wrap(self.kakao_api.find_contact_info),
+                                         negative_store=self.negative_store, row_delay=0.15)
+
+        self.jobs = {}
+        self.queue = deque()  # 처리 차례를 기다리는 작업
+        self.active = set()  # 지금 처리 중인 작업
+        self.paused = None  # 한도가 차서 멈췄으면 그 이유
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Condition()
+        self._save_lock = threading.Lock()  # 작업 끝 저장이 겹치지 않게
+        self._workers = [threading.Thread(target=self._run, name=f"gateway-worker-{number}", daemon=True)
+                         for number in range(MAX_ACTIVE_JOBS)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, rows, client=""):
+        """주소 묶음 접수 (rows: make_job_row로 만든 행들) → GatewayJob"""
+        with self._lock:
+            # 오래전에 끝난 작업은 정리
+            expired = time.time() - KEEP_FINISHED_SECONDS
+            for job_id in [job_id for job_id, job in self.jobs.items()
+                           if job.finished_at and job.finished_at < expired]:
+                del self.jobs[job_id]
+
+            job = GatewayJob(next(self._job_ids), rows, client)
+            self.jobs[job.job_id] = job
+
+        # 이미 아는 주소는 줄 서지 않고 바로 결과 보내기
+        if self.use_history:
+            self.results_store.prefill(job.rows)
+            for row in job.rows:
+                if row.get('prefilled'):
+                    job.add_event(self._make_result_event(row, cached=True))
+
+        job.rows = [row for row in job.rows if not row.get('prefilled')]
+
+        # 한도 때문에 멈췄어도 날짜가 바뀌었거나 키가 추가됐으면 다시 시작
+        if self.paused and any(not self.ledger.is_near_limit('kakao', key)
+                               for key in self.kakao_api.api_keys):
+            self.paused = None
+
+        if self.paused:
+            job.finish('paused', self.paused)
+        elif not job.rows:
+            job.finish()
+        else:
+            with self._lock:
+                self.queue.append(job)
+                self._lock.notify()
+
+        print(f"📨 작업 {job.job_id} 접수 ({client or '이름 없음'}): 주소 {len(job.rows)}개 대기")
+        return job
+
+    def cancel(self, job_id):
+        """작업 취소 (지금 검색 중인 주소는 끝까지)"""
+        job = self.jobs.get(job_id)
+        if job:
+            job.cancelled = True
+        return job
+
+    def get_status(self):
+        """대기 현황과 오늘 남은 호출 수"""
+        with self._lock:
+            queued_rows = sum(job.count_pending() for job in list(self.queue) + list(self.active))
+            return {
+                'queued_jobs': len(self.queue),
+                'active_jobs': len(self.active),
+                'queued_rows': queued_rows,
+                'paused': self.paused,
+                'calls_today': self.ledger.get_calls_today('kakao', self.kakao_api.api_key),
+                'remaining_today': sum(self.ledger.get_remaining('kakao', key)
+                                       for key in self.kakao_api.api_keys)
+            }
+
+    def _run(self):
+        """작업 스레드: 줄에서 작업을 하나 꺼내 스케줄러를 한 번 끝까지 돌림"""
+        while True:
+            with self._lock:
+                while not self.queue:
+                    self._lock.wait()
+                job = self.queue.popleft()
+                self.active.add(job)
+
+            try:
+                self._run_job(job)
+            finally:
+                with self._lock:
+                    self.active.discard(job)
+
+    def _run_job(self, job):
+        """작업 하나 처리 (취소되거나 한도가 차면 남은 주소는 대기중으로 두고 끝)"""
+        if job.cancelled or self.paused:
+            self._finish_job(job, 'cancelled' if job.cancelled else 'paused', self.paused or "")
+            return
+
+        try:
+            stats = self.scheduler.run(
+                job.rows,
+                on_success=lambda index, row, info: job.add_event(self._make_result_event(row)),
+                on_error=lambda index, row, message: job.add_event(self._make_result_event(row)),
+                should_stop=lambda: job.cancelled or self.paused is not None
+            )
+        except Exception as e:
+            print(f"❌ 게이트웨이 작업 {job.job_id} 처리 중 오류: {e}")
+            self._finish_job(job, 'error', str(e))
+            return
+
+        if stats['paused']:
+            # 한도가 찼으면 모든 작업을 멈추고 남은 주소는 대기중으로 돌려줌
+            # (처리 중인 다른 작업은 self.paused를 보고 스스로 멈춰요)
+            self.paused = stats['paused']
+            with self._lock:
+                waiting = list(self.queue)
+                self.queue.clear()
+            for waiting_job in [job] + waiting:
+                self._finish_job(waiting_job, 'paused', self.paused)
+        elif job.cancelled:
+            self._finish_job(job, 'cancelled')
+        elif self.paused:
+            self._finish_job(job, 'paused', self.paused)
+        else:
+            self._finish_job(job, 'done')
+
+    def _finish_job(self, job, reason, message=""):
+        """작업 정리: 기록 저장소/통계 저장 후 끝 알림"""
+        try:
+            with self._save_lock:
+                self.results_store.add_run(job.rows, source=f"gateway:{job.client}")
+                self.keyword_stats.save()
+                self.ledger.save()
+                self.response_archive.flush()
+        except Exception as e:
+            print(f"⚠️ 게이트웨이 기록 저장 실패: {e}")
+
+        job.finish(reason, message)
+        print(f"📬 작업 {job.job_id} 끝 ({reason})")
+
+    @staticmethod
+    def _make_result_event(row, cached=False):
+        return {
+            'type': 'result',
+            'id': row['id'],
+            'address': row['address'],
+            'status': row['status'],
+            'place_name': row.get('place_name'),
+            'phone': row.get('phone'),
+            'category': row.get('category'),
+            'confidence': row.get('confidence'),
+            'error': row.get('error'),
+            'failure_reason': row.get('failure_reason'),
+            'cached': cached
+        }
+
+
+def make_handler(gateway):
+    """게이트웨이 HTTP 핸들러 클래스 만들기"""
+
+    class GatewayHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if urlparse(self.path).path != '/jobs':
+                self._send_json(404, {'error': 'not found'})
+                return
+
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                items = body['rows'] if 'rows' in body else body['addresses']
+                rows = [make_job_row(index, item) for index, item in enumerate(items)]
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {'error': f"잘못된 요청이에요: {e}"})
+                return
+
+            job = gateway.submit(rows, body.get('client', ''))
+            self._send_json(200, {'job_id': job.job_id, 'total': job.total})
+
+        def do_GET(self):
+            parts = urlparse(self.path).path.strip('/').split('/')
+            if parts == ['status']:
+                self._send_json(200, gateway.get_status())
+            elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'stream':
+                self._stream(parts[1])
+            else:
+                self._send_json(404, {'error': 'not found'})
+
+        def do_DELETE(self):
+            parts = urlparse(self.path).path.strip('/').split('/')
+            job = None
+            if len(parts) == 2 and parts[0] == 'jobs' and parts[1].isdigit():
+                job = gateway.cancel(int(parts[1]))
+            if job:
+                self._send_json(200, {'job_id': job.job_id, 'cancelled': True})
+            else:
+                self._send_json(404, {'error': 'not found'})
+
+        def _stream(self, job_id):
+            """결과를 처리되는 대로 한 줄씩 보내기 (끝나면 연결 종료)"""
+            job = gateway.jobs.get(int(job_id)) if job_id.isdigit() else None
+            if not job:
+                self._send_json(404, {'error': 'not found'})
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+            self.end_headers()
+
+            sent = 0
+            while True:
+                events = job.wait_events(sent, timeout=2)
+                # 새 결과가 없어도 가끔 신호를 보내서 클라이언트가 멈춤 요청을 확인할 수 있게
+                lines = events or [{'type': 'ping'}]
+                try:
+                    for event in lines:
+                        self.wfile.write(json.dumps(event, ensure_ascii=False).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+                except OSError:
+                    return  # 클라이언트가 연결을 끊음
+                sent += len(events)
+
+                if events and events[-1]['type'] != 'result':
+                    return
+
+        def _send_json(self, status, data):
+            body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return GatewayHandler
+
+
+def serve(api_keys, host='127.0.0.1', port=DEFAULT_PORT):
+    """게이트웨이 실행"""
+    gateway = LookupGateway(api_keys)
+    server = ThreadingHTTPServer((host, port), make_handler(gateway))
+    server.daemon_threads = True
+    print(f"🚪 검색 게이트웨이 실행 중: http://{host}:{port} (API 키 {len(api_keys)}개)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 게이트웨이를 종료해요")
+    finally:
+        server.server_close()
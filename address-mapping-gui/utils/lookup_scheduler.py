@@ -0,0 +1,305 @@
+# utils/lookup_scheduler.py
+# 주소 검색 순서를 관리하는 스케줄러
+# - 새 주소는 빠른 줄(fast lane)에서 바로 처리
+# - 타임아웃/429 같은 일시적인 실패는 재시도 대기열로 보내서 나중에 다시 시도
+# - 진짜로 전화번호가 없는 주소는 "결과 없음 저장소"에 기억해서 한동안 다시 검색 안 함
+# - API가 장애로 막혀 있으면(회로 차단기 열림) 행을 실패로 만들지 않고 회복될 때까지 붙잡아 둠
+
+import heapq
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import date, timedelta
+
+from utils.api_errors import (TransientAPIError, ContactNotFoundError, QuotaExhaustedError,
+                              ProviderUnavailableError)
+from utils.data_paths import get_data_path
+
+# 실패 이유 (행의 'failure_reason'에 남김, 기록 저장소의 적중 통계는 'not_found'만 못 찾은 걸로 셈)
+FAILURE_NOT_FOUND = 'not_found'  # 검색했는데 전화번호가 없음
+FAILURE_INVALID = 'invalid'  # 행정구역 확인에서 걸려서 검색 안 함
+FAILURE_SKIPPED = 'skipped'  # 최근에 못 찾은 주소라 검색 안 함
+FAILURE_TRANSIENT = 'transient'  # 일시 오류가 재시도 끝까지 계속됨
+FAILURE_ERROR = 'error'  # 그 밖의 오류
+
+
+class NegativeResultStore:
+    """전화번호를 못 찾은 주소를 재시도 날짜와 함께 기억하는 저장소"""
+
+    def __init__(self, file_path=None, retry_after_days=30):
+        self.file_path = file_path or get_data_path("negative_results.json")
+        self.retry_after_days = retry_after_days
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # 여러 스레드가 같이 저장해도 임시 파일이 섞이지 않게
+        self._load()
+
+    def _load(self):
+        """저장된 파일 읽기 (없거나 깨졌으면 빈 상태로 시작)"""
+        if not os.path.exists(self.file_path):
+            return
+
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 결과 없음 기록을 읽지 못했어요: {e}")
+            self.entries = {}
+
+    def get_retry_after(self, address, today=None):
+        """아직 재시도 날짜가 안 됐으면 그 날짜(문자열)를, 검색해도 되면 None 반환"""
+        today = today or date.today()
+
+        with self._lock:
+            entry = self.entries.get(address)
+
+        if not entry:
+            return None
+
+        if entry['retry_after'] > today.isoformat():
+            return entry['retry_after']
+
+        return None
+
+    def add(self, address, error="", today=None):
+        """결과 없는 주소 기록"""
+        today = today or date.today()
+        retry_after = today + timedelta(days=self.retry_after_days)
+
+        with self._lock:
+            self.entries[address] = {
+                'retry_after': retry_after.isoformat(),
+                'error': error,
+                'checked_at': today.isoformat()
+            }
+
+    def remove(self, address):
+        """결과를 찾은 주소는 기록에서 지우기"""
+        with self._lock:
+            self.entries.pop(address, None)
+
+    def save(self):
+        """파일로 저장 (만료된 기록은 정리)"""
+        today = date.today().isoformat()
+
+        with self._lock:
+            self.entries = {
+                address: entry for address, entry in self.entries.items()
+                if entry['retry_after'] > today
+            }
+            data = dict(self.entries)
+
+        temp_path = self.file_path + ".tmp"
+        with self._save_lock:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+            os.replace(temp_path, self.file_path)
+
+
+class LookupScheduler:
+    """빠른 줄 + 재시도 대기열로 주소 검색을 처리하는 스케줄러"""
+
+    def __init__(self, lookup_func, negative_store=None, max_attempts=3,
+                 base_delay=2.0, max_delay=60.0, row_delay=0.0, max_unavailable=900):
+        """
+        lookup_func: 주소 문자열을 받아 연락처 dict를 돌려주는 함수 (예: KakaoAPI.find_contact_info)
+        max_attempts: 일시적인 오류일 때 최대 시도 횟수
+        base_delay / max_delay: 재시도 대기 시간 (지수 백오프, 초)
+        row_delay: 한 건 처리 후 쉬는 시간 (초)
+        max_unavailable: API가 이 시간(초) 넘게 계속 막혀 있으면 남은 주소는 대기중으로 두고 멈춤
+        """
+        self.lookup_func = lookup_func
+        self.negative_store = negative_store
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.row_delay = row_delay
+        self.max_unavailable = max_unavailable
+
+    def get_retry_delay(self, attempts):
+        """시도 횟수에 따른 재시도 대기 시간"""
+        return min(self.max_delay, self.base_delay * (2 ** (attempts - 1)))
+
+    def run(self, address_data, on_success=None, on_error=None, on_progress=None,
+            should_stop=None):
+        """
+        주소 목록 처리
+        on_success(index, addr_data, contact_info)
+        on_error(index, addr_data, message)
+        on_progress(processed, success, error)
+        should_stop(): True를 돌려주면 남은 주소는 '대기중'으로 두고 멈춤
+        API 한도가 다 차면(QuotaExhaustedError) 남은 주소는 '대기중'으로 두고 멈추고
+        stats['paused']에 이유를 남겨요
+        """
+        fast_lane = deque(enumerate(address_data))
+        retry_queue = []  # (재시도 시각, 순번, index, 시도 횟수)
+        attempts = {}
+        known_results = {}  # 이번 실행에서 이미 처리한 주소 → (성공 여부, 결과) (중복 주소 재사용)
+
+        stats = {'processed': 0, 'success': 0, 'error': 0, 'retried': 0, 'skipped': 0,
+                 'duplicates': 0, 'invalid': 0, 'held_seconds': 0.0, 'paused': None}
+        unavailable_since = None  # API가 막히기 시작한 시각
+
+        while fast_lane or retry_queue:
+            if should_stop and should_stop():
+                break
+
+            now = time.time()
+
+            # 재시도 시간이 된 주소가 있으면 먼저, 아니면 새 주소
+            if retry_queue and retry_queue[0][0] <= now:
+                _, _, index, _ = heapq.heappop(retry_queue)
+            elif fast_lane:
+                index, _ = fast_lane.popleft()
+            else:
+                # 남은 건 재시도 대기뿐 → 시간이 될 때까지 조금씩 기다림
+                time.sleep(min(0.5, retry_queue[0][0] - now))
+                continue
+
+            addr_data = address_data[index]
+            address = addr_data['address']
+
+            # 불러올 때 행정구역 확인에서 걸린 주소는 API 호출 없이 실패
+            if addr_data.get('invalid_address'):
+                self._mark_error(index, addr_data, f"주소 확인 필요: {addr_data['address_note']}", stats, on_error,
+                                 FAILURE_INVALID)
+                stats['invalid'] += 1
+                self._report_progress(stats, on_progress)
+                continue
+            
+            # 같은 주소를 이번 실행에서 이미 처리했으면 결과 재사용 (API 호출 없음)
+            # 결과 없음 기록보다 먼저 봐야 첫 행이 방금 못 찾은 주소도 "건너뜀"이 아니라 같은 결과로 채워져요
+            if index not in attempts and address in known_results:
+                found, result = known_results[address]
+                stats['duplicates'] += 1
+                if found:
+                    self._mark_success(index, addr_data, result, stats, on_success)
+                else:
+                    self._mark_error(index, addr_data, result, stats, on_error, FAILURE_NOT_FOUND)
+                self._report_progress(stats, on_progress)
+                continue
+
+            # 처음 시도하는 주소면 결과 없음 기록 확인
+            if index not in attempts and self.negative_store:
+                retry_after = self.negative_store.get_retry_after(address)
+                if retry_after:
+                    message = f"최근에 찾지 못한 주소예요 (재검색 가능일: {retry_after})"
+                    self._mark_error(index, addr_data, message, stats, on_error, FAILURE_SKIPPED)
+                    stats['skipped'] += 1
+                    self._report_progress(stats, on_progress)
+                    continue
+
+            attempts[index] = attempts.get(index, 0) + 1
+
+            try:
+                contact_info = self.lookup_func(address)
+                unavailable_since = None
+                known_results[address] = (True, contact_info)
+
+                if self.negative_store:
+                    self.negative_store.remove(address)
+
+                self._mark_success(index, addr_data, contact_info, stats, on_success)
+
+            except QuotaExhaustedError as e:
+                # 한도가 찼으면 이 주소부터 남은 주소는 그대로 두고 멈춤
+                addr_data['status'] = '대기중'
+                stats['paused'] = str(e)
+                print(f"⏸️ {e} → 남은 주소는 대기중으로 두고 멈춰요")
+                break
+
+            except ProviderUnavailableError as e:
+                # 요청을 보내지도 않았으니 시도 횟수에서 빼고, 이 행을 맨 앞에 돌려놓고 기다림
+                attempts[index] -= 1
+                if not attempts[index]:
+                    del attempts[index]
+                addr_data['status'] = '대기중'
+                fast_lane.appendleft((index, addr_data))
+                
+                now = time.time()
+                if unavailable_since is None:
+                    unavailable_since = now
+                    print(f"🔌 {e} → 남은 주소는 붙잡아 두고 회복을 기다려요")
+                elif now - unavailable_since > self.max_unavailable:
+                    stats['paused'] = str(e)
+                    print(f"⏸️ {self.max_unavailable // 60}분 넘게 응답이 없어서 남은 주소는 대기중으로 두고 멈춰요")
+                    break
+                
+                # 멈춤 요청에 바로 반응할 수 있게 짧게 나눠서 기다림
+                wait = min(max(e.retry_after, 0.2), 1.0)
+                stats['held_seconds'] += wait
+                time.sleep(wait)
+                continue
+
+            except TransientAPIError as e:
+                if attempts[index] < self.max_attempts:
+                    # 재시도 대기열로 (지수 백오프)
+                    delay = self.get_retry_delay(attempts[index])
+                    heapq.heappush(retry_queue, (time.time() + delay, stats['retried'], index, attempts[index]))
+                    addr_data['status'] = '재시도대기'
+                    stats['retried'] += 1
+                    print(f"   🔁 일시 오류, {delay:.1f}초 뒤 재시도 ({attempts[index]}/{self.max_attempts}): {e}")
+                    continue
+
+                self._mark_error(index, addr_data, f"{e} ({attempts[index]}회 시도)", stats, on_error,
+                                 FAILURE_TRANSIENT)
+
+            except ContactNotFoundError as e:
+                unavailable_since = None
+                known_results[address] = (False, str(e))
+                if self.negative_store:
+                    self.negative_store.add(address, str(e))
+                self._mark_error(index, addr_data, str(e), stats, on_error, FAILURE_NOT_FOUND)
+
+            except Exception as e:
+                self._mark_error(index, addr_data, str(e), stats, on_error, FAILURE_ERROR)
+
+            self._report_progress(stats, on_progress)
+
+            if self.row_delay:
+                time.sleep(self.row_delay)
+
+        # 멈춘 경우 재시도 대기 중이던 주소는 다시 대기중으로
+        for _, _, index, _ in retry_queue:
+            address_data[index]['status'] = '대기중'
+
+        if self.negative_store:
+            try:
+                self.negative_store.save()
+            except OSError as e:
+                print(f"⚠️ 결과 없음 기록 저장 실패: {e}")
+
+        return stats
+
+    def _mark_success(self, index, addr_data, contact_info, stats, on_success):
+        """성공 처리"""
+        addr_data['place_name'] = contact_info['place_name']
+        addr_data['phone'] = contact_info['phone']
+        addr_data['category'] = contact_info.get('category', '')
+        addr_data['confidence'] = contact_info.get('confidence_label', '')
+        addr_data['status'] = '성공'
+        addr_data['error'] = None
+        addr_data['failure_reason'] = None
+        stats['success'] += 1
+        stats['processed'] += 1
+
+        if on_success:
+            on_success(index, addr_data, contact_info)
+
+    def _mark_error(self, index, addr_data, message, stats, on_error, reason=FAILURE_ERROR):
+        """실패 처리 (reason: FAILURE_* 중 하나)"""
+        addr_data['status'] = '실패'
+        addr_data['error'] = message
+        addr_data['failure_reason'] = reason
+        stats['error'] += 1
+        stats['processed'] += 1
+
+        if on_error:
+            on_error(index, addr_data, message)
+
+    def _report_progress(self, stats, on_progress):
+        """진행률 콜백 호출"""
+        if on_progress:
+            on_progress(stats['processed'], stats['success'], stats['error'])
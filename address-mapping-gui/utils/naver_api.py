@@ -4,9 +4,24 @@ import re
 from urllib.parse import quote
 from html import unescape
 
+from utils.api_errors import (TransientAPIError, QuotaExhaustedError, ProviderUnavailableError,
+                              APIKeyRejectedError)
+from utils.circuit_breaker import CircuitBreaker
+from utils.rate_limiter import RateLimiter
+
+PROBE_TIMEOUT = 3  # 차단 중 상태 확인 요청 타임아웃
+
 class NaverAPI:
-    def __init__(self, client_id, client_secret, min_interval=0.15):
+    def __init__(self, client_id, client_secret, min_interval=0.15, keyword_stats=None,
+                 ledger=None, backup_credentials=None, hedger=None, archive=None, replay=False):
         self.client_id = client_id
+        # (client_id, client_secret) 목록 - 한도가 차면 다음 키로 교체
+        self.credentials = [(client_id, client_secret)] + list(backup_credentials or [])
+        self.ledger = ledger
+        self.keyword_stats = keyword_stats  # 동네별 키워드 적중 통계 (없으면 고정 순서)
+        self.hedger = hedger  # 느린 응답에 중복 요청 (HedgedRequester, 없으면 사용 안 함)
+        self.archive = archive  # 원본 응답 보관소 (ResponseArchive, 없으면 보관 안 함)
+        self.replay = replay  # True면 API 대신 보관된 응답으로만 검색 (재매칭)
         self.client_secret = client_secret
         self.base_url = "https://openapi.naver.com/v1/search/local.json"
         self.session = requests.Session()
@@ -15,18 +30,31 @@ class NaverAPI:
             'X-Naver-Client-Secret': client_secret,
             'Content-Type': 'application/json'
         })
-        self.last_call_time = 0
         self.min_interval = min_interval
+        self.rate_limiter = RateLimiter(min_interval)
+        # 키별 회로 차단기 (계속 실패하는 키는 요청을 멈추고 가벼운 확인 요청만)
+        self.breakers = {
+            cid: CircuitBreaker(f"네이버 API 키 {number}", probe=lambda cid=cid, secret=secret: self._probe(cid, secret))
+            for number, (cid, secret) in enumerate(self.credentials, start=1)
+        }
 
     def find_contact_info(self, address, keywords=None):
         """주소와 키워드 리스트로 연락처 검색. 실패 시 None 반환."""
         if not keywords:
             keywords = ["맛집", "음식점", "카페", "병원", "편의점", "마트", "상가"]
+        if self.keyword_stats:
+            keywords = self.keyword_stats.order_keywords('naver', address, keywords)
         try:
+            tried = []
             for keyword in keywords:
+                tried.append(keyword)
                 result = self._try_search_with_keyword(address, keyword)
                 if result:
+                    if self.keyword_stats:
+                        self.keyword_stats.record('naver', address, tried, keyword)
                     return result
+            if self.keyword_stats:
+                self.keyword_stats.record('naver', address, tried)
             # 동네 이름만으로도 시도
             parts = address.split()
             if len(parts) > 0:
@@ -37,6 +65,9 @@ class NaverAPI:
                         if result:
                             return result
             return None
+        except (TransientAPIError, QuotaExhaustedError):
+            # 일시적인 오류/한도 초과는 호출한 쪽에서 처리할 수 있게 그대로 올림
+            raise
         except Exception as e:
             return None
 
@@ -45,23 +76,14 @@ class NaverAPI:
         return self._search_by_query(search_query)
 
     def _search_by_query(self, query):
-        self._wait_for_rate_limit()
         params = {
             'query': query,
             'display': 10,
             'start': 1,
             'sort': 'comment'
         }
-        response = self.session.get(self.base_url, params=params, timeout=10)
-        if response.status_code == 401:
-            return None
-        elif response.status_code == 429:
-            time.sleep(1)
-            return None
-        elif response.status_code != 200:
-            return None
-        data = response.json()
-        if not data.get('items'):
+        data = self._get(params)
+        if not data or not data.get('items'):
             return None
         for item in data['items']:
             telephone = item.get('telephone', '').strip()
@@ -77,19 +99,125 @@ class NaverAPI:
                 }
         return None
 
+    def _get(self, params):
+        """API 호출 공통 처리 (요청 오류/429/5xx는 TransientAPIError, 재매칭 모드면 보관된 응답)"""
+        if self.replay:
+            _, data = self.archive.find('naver', self.base_url, params)
+            return data
+        self._check_quota()
+        breaker = self._select_credentials()
+        self._wait_for_rate_limit()
+        started = time.time()
+        try:
+            if self.hedger:
+                response = self.hedger.get(self.base_url, params, headers=self.session.headers,
+                                           timeout=10, can_hedge=self._use_hedge_call)
+            else:
+                response = self.session.get(self.base_url, params=params, timeout=10)
+        except requests.RequestException as e:
+            # 타임아웃/연결 끊김뿐 아니라 응답이 중간에 끊기거나(ChunkedEncodingError)
+            # 리다이렉트가 반복되는 것도 장애라서 차단기에 세고 나중에 다시 시도
+            breaker.record_failure()
+            raise TransientAPIError(f"네이버 API 연결 오류: {e}")
+        finally:
+            if self.ledger:
+                self.ledger.record_call('naver', self.client_id, time.time() - started)
+        if response.status_code == 429:
+            breaker.record_failure()
+            time.sleep(1)
+            raise TransientAPIError("네이버 API 호출 한도 초과 (HTTP 429)")
+        elif response.status_code >= 500:
+            breaker.record_failure()
+            raise TransientAPIError(f"네이버 API 일시 오류 (HTTP {response.status_code})")
+        elif response.status_code in (401, 403):
+            # 키 문제는 재시도해도 그대로라 이 키만 빼고 다른 키로 (_select_credentials가 고름)
+            breaker.mark_dead(f"키가 거부됐어요 (HTTP {response.status_code})")
+            return self._get(params)
+        breaker.record_success()
+        data = None
+        if response.status_code == 200:
+            try:
+                data = response.json()
+            except ValueError:
+                data = None
+        if self.archive:
+            self.archive.record('naver', self.base_url, params, response.status_code, data)
+        return data
+
+    def _use_hedge_call(self):
+        """중복 요청 1번을 호출 한도/속도 제한 안에서 쓸 수 있으면 기록하고 True"""
+        if self.ledger and self.ledger.is_near_limit('naver', self.client_id):
+            return False
+        if not self.rate_limiter.try_acquire():
+            return False
+        if self.ledger:
+            self.ledger.record_call('naver', self.client_id)
+        return True
+
+    def _select_credentials(self):
+        """회로 차단기가 닫힌 키 고르기 (모두 막혔으면 ProviderUnavailableError, 요청 안 보냄)"""
+        breaker = self.breakers[self.client_id]
+        if breaker.allow():
+            return breaker
+        for client_id, client_secret in self.credentials:
+            if client_id == self.client_id or (self.ledger and self.ledger.is_near_limit('naver', client_id)):
+                continue
+            if self.breakers[client_id].allow():
+                self._use_credentials(client_id, client_secret)
+                return self.breakers[client_id]
+        alive = [other for other in self.breakers.values() if not other.is_dead()]
+        if not alive:
+            raise APIKeyRejectedError("네이버 API 키가 모두 거부됐어요 (키를 확인해 주세요)")
+        retry_after = min(other.get_retry_after() for other in alive)
+        raise ProviderUnavailableError(f"네이버 API가 응답하지 않아요 ({retry_after:.0f}초 뒤 다시 확인)",
+                                       retry_after)
+
+    def _probe(self, client_id, client_secret):
+        """차단된 키 상태 확인 (결과 1개짜리 검색, 짧은 타임아웃)"""
+        self._wait_for_rate_limit()
+        try:
+            response = self.session.get(self.base_url, params={'query': "서울역", 'display': 1},
+                                        headers={'X-Naver-Client-Id': client_id,
+                                                 'X-Naver-Client-Secret': client_secret},
+                                        timeout=PROBE_TIMEOUT)
+        except requests.RequestException:
+            return False
+        finally:
+            if self.ledger:
+                self.ledger.record_call('naver', client_id)
+        return response.status_code == 200
+
+    def _use_credentials(self, client_id, client_secret):
+        """사용할 키 바꾸기"""
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.session.headers.update({
+            'X-Naver-Client-Id': client_id,
+            'X-Naver-Client-Secret': client_secret
+        })
+
+    def _check_quota(self):
+        """오늘 한도에 거의 다 찬 키는 다음 키로 교체 (남은 키가 없으면 QuotaExhaustedError)"""
+        if not self.ledger or not self.ledger.is_near_limit('naver', self.client_id):
+            return
+        for client_id, client_secret in self.credentials:
+            if not self.ledger.is_near_limit('naver', client_id):
+                self._use_credentials(client_id, client_secret)
+                return
+        raise QuotaExhaustedError("오늘 네이버 API 호출 한도에 거의 다 찼어요 (모든 키)")
+
     def _strip_html(self, text):
         # 모든 HTML 태그 제거
         return re.sub('<.*?>', '', unescape(text))
 
     def _wait_for_rate_limit(self):
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_call_time
-        if time_since_last_call < self.min_interval:
-            time.sleep(self.min_interval - time_since_last_call)
-        self.last_call_time = time.time()
+        self.rate_limiter.wait()
 
     def test_api_key(self):
-        result = self._search_by_query("강남역 맛집")
+        try:
+            result = self._search_by_query("강남역 맛집")
+        except (TransientAPIError, QuotaExhaustedError):
+            return False
         return bool(result)
 
 # 사용 예시
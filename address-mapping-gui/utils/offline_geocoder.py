@@ -0,0 +1,224 @@
+# utils/offline_geocoder.py
+# 인터넷 없이 주소 → 좌표 변환 (공공 주소/좌표 데이터를 SQLite에 한 번 넣어두고 사용)
+
+import csv
+import os
+import re
+import sqlite3
+import sys
+import threading
+
+from utils.data_paths import get_data_path
+
+# 시도 이름 줄임말 → 정식 이름
+CITY_ALIASES = {
+    '서울': '서울특별시', '서울시': '서울특별시',
+    '부산': '부산광역시', '부산시': '부산광역시',
+    '대구': '대구광역시', '대구시': '대구광역시',
+    '인천': '인천광역시', '인천시': '인천광역시',
+    '광주': '광주광역시', '광주시': '광주광역시',
+    '대전': '대전광역시', '대전시': '대전광역시',
+    '울산': '울산광역시', '울산시': '울산광역시',
+    '세종': '세종특별자치시', '세종시': '세종특별자치시',
+    '경기': '경기도',
+    '강원': '강원특별자치도', '강원도': '강원특별자치도',
+    '충북': '충청북도',
+    '충남': '충청남도',
+    '전북': '전북특별자치도', '전라북도': '전북특별자치도',
+    '전남': '전라남도',
+    '경북': '경상북도',
+    '경남': '경상남도',
+    '제주': '제주특별자치도', '제주도': '제주특별자치도'
+}
+
+# 공공 데이터 파일의 기본 컬럼 이름 (파일마다 다르면 columns로 바꿔서 사용)
+DEFAULT_COLUMNS = {
+    'city': '시도명',
+    'district': '시군구명',
+    'dong': '법정읍면동명',
+    'mountain': '산여부',
+    'main_no': '지번본번',
+    'sub_no': '지번부번',
+    'lat': '위도',
+    'lng': '경도'
+}
+
+# 산여부 컬럼에서 산 번지를 뜻하는 값 (공공 데이터는 보통 0/1)
+MOUNTAIN_FLAGS = ('1', '산', 'Y', 'y')
+
+STREET_NUMBER_PATTERN = re.compile(r'^(산)?(\d+)(?:-(\d+))?(?:번지)?$')
+
+
+def normalize_street_number(street_number):
+    """번지 정리 ("871-0번지" → "871", "산 12-3" → "산12-3")"""
+    text = str(street_number).replace(' ', '')
+    match = STREET_NUMBER_PATTERN.match(text)
+    if not match:
+        return text
+
+    mountain, main_no, sub_no = match.groups()
+    result = f"{mountain or ''}{int(main_no)}"
+    if sub_no and int(sub_no) != 0:
+        result += f"-{int(sub_no)}"
+    return result
+
+
+def normalize_address_key(address):
+    """
+    주소 문자열을 검색용 키로 변환
+    "부산 동래구 온천동 871-95번지" → "부산광역시동래구온천동871-95"
+    """
+    parts = address.split()
+    if not parts:
+        return ""
+
+    parts[0] = CITY_ALIASES.get(parts[0], parts[0])
+    if len(parts) > 1 and STREET_NUMBER_PATTERN.match(parts[-1]):
+        parts[-1] = normalize_street_number(parts[-1])
+    elif len(parts) > 2 and parts[-2] == '산':
+        # "산 12-3"처럼 띄어 쓴 경우
+        parts[-2:] = [normalize_street_number('산' + parts[-1])]
+
+    return ''.join(parts)
+
+
+class OfflineGeocoder:
+    """SQLite에 저장된 주소 좌표로 주소 → 좌표 변환"""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or get_data_path("address_coords.sqlite3")
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS coords (
+                key TEXT PRIMARY KEY,
+                lat REAL NOT NULL,
+                lng REAL NOT NULL,
+                address_name TEXT
+            ) WITHOUT ROWID
+        """)
+        self.conn.commit()
+
+    @classmethod
+    def open_if_exists(cls, db_path=None):
+        """DB 파일이 있을 때만 열기 (없으면 None)"""
+        db_path = db_path or get_data_path("address_coords.sqlite3")
+        if not os.path.exists(db_path):
+            return None
+        return cls(db_path)
+
+    def count(self):
+        """저장된 주소 수"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM coords").fetchone()[0]
+
+    def lookup(self, address):
+        """주소 → {'lat', 'lng', 'address_name'} (모르는 주소면 None)"""
+        key = normalize_address_key(address)
+        if not key:
+            return None
+
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT lat, lng, address_name FROM coords WHERE key = ?", (key,)
+            ).fetchone()
+
+        if not row:
+            return None
+
+        return {
+            'lat': row[0],
+            'lng': row[1],
+            'address_name': row[2]
+        }
+
+    def import_csv(self, file_path, columns=None, encoding='cp949', batch_size=5000,
+                   progress_callback=None):
+        """
+        공공 주소/좌표 CSV 파일 가져오기 (한 번만 하면 돼요)
+        columns: DEFAULT_COLUMNS와 같은 형태로 파일의 컬럼 이름 지정
+                 (위도/경도는 WGS84 기준 값이어야 해요, 산여부 컬럼이 없는 파일은 모두 일반 번지로)
+        progress_callback(imported_count): 진행 상황 알림
+        """
+        columns = dict(DEFAULT_COLUMNS, **(columns or {}))
+        print(f"📥 주소 좌표 파일 가져오는 중: {file_path}")
+
+        imported = 0
+        skipped = 0
+        batch = []
+
+        with open(file_path, 'r', encoding=encoding, newline='') as f:
+            reader = csv.DictReader(f)
+
+            for row in reader:
+                try:
+                    street_number = row[columns['main_no']].strip()
+                    sub_no = row.get(columns['sub_no'], '').strip()
+                    if sub_no and sub_no != '0':
+                        street_number += f"-{sub_no}"
+                    # 산 번지는 같은 숫자의 일반 번지와 다른 땅이라 키에도 "산"을 붙여야 안 겹쳐요
+                    if (row.get(columns['mountain']) or '').strip() in MOUNTAIN_FLAGS:
+                        street_number = '산' + street_number
+
+                    address_name = " ".join(part for part in [
+                        row[columns['city']].strip(),
+                        row[columns['district']].strip(),
+                        row[columns['dong']].strip(),
+                        street_number
+                    ] if part)
+
+                    batch.append((
+                        normalize_address_key(address_name),
+                        float(row[columns['lat']]),
+                        float(row[columns['lng']]),
+                        address_name
+                    ))
+                except (KeyError, ValueError, AttributeError):
+                    skipped += 1
+                    continue
+
+                if len(batch) >= batch_size:
+                    imported += self._insert_batch(batch)
+                    batch = []
+                    if progress_callback:
+                        progress_callback(imported)
+
+        if batch:
+            imported += self._insert_batch(batch)
+            if progress_callback:
+                progress_callback(imported)
+
+        print(f"✅ 주소 좌표 {imported}개 가져오기 완료! (건너뛴 행: {skipped}개)")
+        return imported
+
+    def _insert_batch(self, batch):
+        """여러 행 한꺼번에 저장"""
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO coords (key, lat, lng, address_name) VALUES (?, ?, ?, ?)",
+                batch
+            )
+            self.conn.commit()
+        return len(batch)
+
+    def close(self):
+        """DB 닫기"""
+        with self._lock:
+            self.conn.close()
+
+
+# 명령줄에서 가져오기: python -m utils.offline_geocoder 주소좌표.csv [인코딩]
+def import_from_command_line():
+    """명령줄에서 CSV 가져오기"""
+    if len(sys.argv) < 2:
+        print("사용법: python -m utils.offline_geocoder 주소좌표.csv [인코딩]")
+        return
+
+    encoding = sys.argv[2] if len(sys.argv) > 2 else 'cp949'
+    geocoder = OfflineGeocoder()
+    geocoder.import_csv(sys.argv[1], encoding=encoding)
+    print(f"📦 현재 저장된 주소: {geocoder.count()}개 ({geocoder.db_path})")
+    geocoder.close()
+
+if __name__ == "__main__":
+    import_from_command_line()
@@ -0,0 +1,174 @@
+# utils/pipeline.py
+# 단계별 작업 파이프라인 (단계 사이를 크기가 정해진 큐로 연결)
+# - 단계마다 작업 스레드 수를 따로 정할 수 있어요
+# - 다음 단계 큐가 꽉 차면 앞 단계는 기다려요(backpressure) → 파일이 아무리 커도 메모리는 일정
+# - 단계별 큐 길이/처리 수를 보면 어느 단계가 병목인지 바로 알 수 있어요
+#   (입력 큐가 늘 꽉 차 있는 단계가 병목)
+
+import queue
+import threading
+import time
+
+_END = object()  # 입력이 끝났다는 표시
+
+
+class Stage:
+    """파이프라인의 한 단계"""
+
+    def __init__(self, name, func, workers=1, queue_size=100):
+        """
+        func(item, emit): item 하나 처리, 결과는 emit(item) (다음 단계로) 또는
+                          emit(item, to='단계이름') (특정 단계로 바로) - 여러 번/0번 호출해도 돼요
+        workers: 이 단계의 작업 스레드 수
+        queue_size: 이 단계 입력 큐 크기 (꽉 차면 앞 단계가 기다림)
+        """
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0  # 다음 단계 큐가 꽉 차서 기다린 시간
+        self._lock = threading.Lock()
+        self._active_workers = 0
+
+
+class Pipeline:
+    """Stage들을 순서대로 연결해서 돌리는 실행기"""
+
+    def __init__(self, stages):
+        self.stages = stages
+        self.stages_by_name = {stage.name: stage for stage in stages}
+        self.stop_event = threading.Event()
+        self.draining = threading.Event()  # 멈춘 뒤 남은 입력을 drain_to로 흘려보내는 중
+        self.drain_to = None
+        self.started_at = None
+
+    def run(self, source, on_stats=None, stats_interval=1.0, should_stop=None, drain_to=None):
+        """
+        source: 첫 단계에 넣을 item들 (제너레이터면 필요한 만큼만 읽어요)
+        on_stats(stats): stats_interval초마다 단계별 상태 알림
+        should_stop(): True가 되면 새 입력을 그만 넣고 남은 것만 정리
+        drain_to: 단계 이름을 주면 멈춘 뒤에도 입력은 끝까지 읽고, 첫 단계를 거친 item은
+                  중간 단계를 건너뛰고 이 단계로 바로 보내요 (남은 입력이 결과에서 빠지지 않게)
+        """
+        self.started_at = time.time()
+        self.drain_to = self.stages_by_name[drain_to] if drain_to else None
+        self.draining.clear()
+        threads = []
+        for position, stage in enumerate(self.stages):
+            stage._active_workers = stage.workers
+            for number in range(stage.workers):
+                thread = threading.Thread(target=self._work, args=(position,),
+                                          name=f"{stage.name}-{number + 1}", daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        feeder = threading.Thread(target=self._feed, args=(source, should_stop),
+                                  name="source", daemon=True)
+        feeder.start()
+
+        last_report = time.time()
+        while any(thread.is_alive() for thread in threads):
+            threads[-1].join(0.1)
+            if on_stats and time.time() - last_report >= stats_interval:
+                on_stats(self.get_stats())
+                last_report = time.time()
+
+        feeder.join()
+        if on_stats:
+            on_stats(self.get_stats())
+
+    def stop(self):
+        """새 입력을 그만 넣기 (이미 들어간 item은 끝까지 처리)"""
+        self.stop_event.set()
+
+    def _feed(self, source, should_stop):
+        """입력을 첫 단계 큐에 넣기 (큐가 꽉 차면 기다림)"""
+        first = self.stages[0]
+        try:
+            for item in source:
+                if not self.draining.is_set() and (self.stop_event.is_set() or (should_stop and should_stop())):
+                    if not self.drain_to:
+                        break
+                    self.draining.set()
+                self._put(first, item)
+        except Exception as e:
+            print(f"❌ 입력을 읽다가 오류가 났어요: {e}")
+        finally:
+            for _ in range(first.workers):
+                first.queue.put(_END)
+
+    def _put(self, stage, item):
+        """큐에 넣기 (멈춤 요청이 와도 넣을 자리가 날 때까지 기다려서 item을 잃지 않음)"""
+        stage.queue.put(item)
+
+    def _work(self, position):
+        """단계 작업 스레드"""
+        stage = self.stages[position]
+        next_stage = self.stages[position + 1] if position + 1 < len(self.stages) else None
+
+        def emit(item, to=None):
+            target = self.stages_by_name[to] if to else next_stage
+            if position == 0 and to is None and self.draining.is_set():
+                target = self.drain_to
+            if target is not None:
+                started = time.perf_counter()
+                self._put(target, item)
+                with stage._lock:
+                    stage.blocked_seconds += time.perf_counter() - started
+
+        while True:
+            item = stage.queue.get()
+            if item is _END:
+                break
+
+            started = time.perf_counter()
+            try:
+                stage.func(item, emit)
+            except Exception as e:
+                with stage._lock:
+                    stage.errors += 1
+                print(f"⚠️ [{stage.name}] 처리 중 오류: {e}")
+            finally:
+                with stage._lock:
+                    stage.processed += 1
+                    stage.busy_seconds += time.perf_counter() - started
+
+        # 이 단계의 마지막 작업 스레드가 끝나면 다음 단계에 끝 표시 전달
+        with stage._lock:
+            stage._active_workers -= 1
+            last_worker = stage._active_workers == 0
+        if last_worker and next_stage is not None:
+            for _ in range(next_stage.workers):
+                next_stage.queue.put(_END)
+
+    def get_stats(self):
+        """단계별 상태 [{name, queued, capacity, processed, errors, workers, busy, blocked}]"""
+        elapsed = max(time.time() - (self.started_at or time.time()), 1e-9)
+        return [
+            {
+                'name': stage.name,
+                'queued': stage.queue.qsize(),
+                'capacity': stage.queue.maxsize,
+                'processed': stage.processed,
+                'errors': stage.errors,
+                'workers': stage.workers,
+                # 작업 스레드들이 일한 시간 비율 (1에 가까우면 쉬지 않고 일하는 중)
+                # 다음 단계를 기다린 시간은 빼요 → 진짜 병목 단계만 높게 나와요
+                'busy': (stage.busy_seconds - stage.blocked_seconds) / (elapsed * stage.workers),
+                'blocked': stage.blocked_seconds / (elapsed * stage.workers)
+            }
+            for stage in self.stages
+        ]
+
+    @staticmethod
+    def format_stats(stats):
+        """단계별 상태 → 한 줄 (입력 큐가 꽉 찬 단계에 ◀ 표시)"""
+        parts = []
+        for stage in stats:
+            mark = " ◀" if stage['queued'] >= stage['capacity'] else ""
+            parts.append(f"{stage['name']} {stage['queued']}/{stage['capacity']} "
+                         f"(처리 {stage['processed']}, {stage['busy'] * 100:.0f}%){mark}")
+        return " | ".join(parts)
@@ -0,0 +1,84 @@
+# utils/prefetch.py
+# 파일과 API 키가 준비된 뒤 "매핑 시작"을 누르기 전까지 노는 시간에 좌표를 미리 구해두기
+# - 구한 좌표는 kakao_api.coords_cache에 들어가서 매핑/묶음 검색 1단계에서 호출 없이 재사용
+# - 호출 수는 budget 안에서만 (한도가 차가면 바로 멈춤)
+#   이 작업 스레드가 쓴 호출만 세니까 같은 KakaoAPI로 동시에 하는 검색은 budget에 안 들어가요
+# - 매핑을 시작하면 멈추고, 그때까지 구한 만큼만 이어서 써요
+
+import threading
+
+from utils.api_errors import TransientAPIError, QuotaExhaustedError
+
+PREFETCH_BUDGET = 200  # 미리 쓰는 최대 API 호출 수
+
+
+class Prefetcher:
+    """남는 시간에 주소 좌표를 미리 구하는 백그라운드 작업"""
+
+    def __init__(self, kakao_api, budget=PREFETCH_BUDGET):
+        self.kakao_api = kakao_api
+        self.budget = budget
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.stats = {'geocoded': 0, 'calls': 0, 'skipped': 0}
+
+    def start(self, address_data, is_known=None, on_done=None):
+        """
+        백그라운드에서 좌표 구하기 시작
+        is_known(addresses): 기록 저장소 등에 이미 결과가 있는 주소 집합 (검색 안 할 주소는 건너뜀)
+        on_done(stats): 끝나거나 멈췄을 때 (작업 스레드에서 호출)
+        """
+        self.stop()
+        self.stop_event = threading.Event()
+        # 시작할 때마다 새로 세기 (멈춘 이전 작업이 마저 끝내는 호출은 이전 stats에 들어가요)
+        self.stats = {'geocoded': 0, 'calls': 0, 'skipped': 0}
+        self.thread = threading.Thread(target=self._run, args=(address_data, is_known, on_done,
+                                                               self.stop_event, self.stats), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """멈추기 (지금 하던 호출 하나는 끝까지)"""
+        self.stop_event.set()
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def _run(self, address_data, is_known, on_done, stop_event, stats):
+        """아직 결과가 없는 주소를 앞에서부터 budget 안에서 좌표로"""
+        addresses = list(dict.fromkeys(
+            addr['address'] for addr in address_data
+            if addr['status'] != '성공' and not addr.get('invalid_address')
+        ))
+        if is_known:
+            known = is_known(addresses)
+            stats['skipped'] = len(known)
+            addresses = [address for address in addresses if address not in known]
+
+        try:
+            for address in addresses:
+                if stop_event.is_set() or stats['calls'] >= self.budget:
+                    break
+                if address in self.kakao_api.coords_cache:
+                    continue
+
+                calls_before = self.kakao_api.get_thread_calls()
+                try:
+                    coords = self.kakao_api.get_coordinates(address)
+                except TransientAPIError:
+                    continue
+                finally:
+                    stats['calls'] += self.kakao_api.get_thread_calls() - calls_before
+
+                if coords:
+                    stats['geocoded'] += 1
+
+        except QuotaExhaustedError as e:
+            print(f"⏸️ 미리 구하기 중 한도 도달: {e}")
+
+        if on_done:
+            on_done(dict(stats))
+
+    def format_stats(self):
+        """로그용 한 줄"""
+        return (f"🛫 미리 구한 좌표 {self.stats['geocoded']}개 "
+                f"(API {self.stats['calls']}/{self.budget}번 사용, 이미 아는 주소 {self.stats['skipped']}개 건너뜀)")
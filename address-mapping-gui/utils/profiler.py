@@ -0,0 +1,174 @@
+# utils/profiler.py
+# 느린 실행의 원인을 찾는 샘플링 프로파일러
+# - 일정 간격으로 모든 스레드의 호출 스택을 찍어서 어디서 시간을 쓰는지 기록
+#   (엑셀 읽기, 주소 정리, requests 연결, 속도 제한 대기, Tk 화면 그리기 등)
+# - flamegraph.pl / speedscope 에서 바로 열 수 있는 .folded 파일과
+#   스레드별(UI / 작업) 상위 함수 요약 .txt 파일을 만들어요
+#
+# 사용법 (명령줄): python main.py --profile 주소.xlsx --api-key 카카오키
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from utils.data_paths import get_data_path
+
+DEFAULT_INTERVAL = 0.005  # 5ms마다 한 번씩 스택 기록
+
+
+def format_frame(frame):
+    """프레임 → "함수 (파일:줄)" (같은 함수는 같은 이름이 되도록 함수 시작 줄 사용)"""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """모든 스레드의 스택을 주기적으로 찍는 프로파일러"""
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()  # (스레드 이름, (바깥 함수, ..., 안쪽 함수)) → 샘플 수
+        self.sample_count = 0
+        self.started_at = None
+        self.elapsed = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """샘플링 시작 (이미 돌고 있으면 무시)"""
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        print(f"🔬 프로파일링 시작 ({self.interval * 1000:.0f}ms 간격)")
+
+    def stop(self):
+        """샘플링 멈추기"""
+        if not self.is_running:
+            return
+
+        self._stop_event.set()
+        self._thread.join()
+        self.elapsed += time.perf_counter() - self.started_at
+        print(f"🔬 프로파일링 끝 ({self.elapsed:.1f}초, 샘플 {self.sample_count}개)")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _run(self):
+        """샘플링 스레드"""
+        own_id = threading.get_ident()
+
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: self.get_thread_label(thread) for thread in threading.enumerate()}
+
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    stack.append(format_frame(frame))
+                    frame = frame.f_back
+                stack.reverse()
+
+                self.stacks[(names.get(thread_id, f"worker:{thread_id}"), tuple(stack))] += 1
+
+            self.sample_count += 1
+
+    @staticmethod
+    def get_thread_label(thread):
+        """스레드 이름에 UI / 작업 구분 붙이기"""
+        if thread is threading.main_thread():
+            return f"UI:{thread.name}"
+        return f"worker:{thread.name}"
+
+    def get_thread_totals(self):
+        """스레드별 샘플 수"""
+        totals = Counter()
+        for (thread_name, _), count in self.stacks.items():
+            totals[thread_name] += count
+        return totals
+
+    def get_top_functions(self, thread_name, limit=20):
+        """
+        스레드 하나의 상위 함수
+        반환: [(함수, 자기 샘플 수, 포함 샘플 수), ...] (포함 샘플 수 순)
+        - 자기(self): 그 함수 안에서 직접 시간을 쓴 샘플
+        - 포함(total): 그 함수가 스택 어딘가에 있던 샘플 (호출한 함수 시간 포함)
+        """
+        self_counts = Counter()
+        total_counts = Counter()
+
+        for (name, stack), count in self.stacks.items():
+            if name != thread_name or not stack:
+                continue
+            self_counts[stack[-1]] += count
+            # 재귀 호출이 있어도 한 샘플에서 한 번만 셈
+            for function in set(stack):
+                total_counts[function] += count
+
+        return [
+            (function, self_counts[function], total)
+            for function, total in total_counts.most_common(limit)
+        ]
+
+    def write_folded(self, file_path):
+        """flamegraph 형식 저장 (한 줄에 "스레드;바깥;...;안쪽 샘플수")"""
+        with open(file_path, 'w', encoding='utf-8') as f:
+            for (thread_name, stack), count in sorted(self.stacks.items()):
+                frames = ";".join(frame.replace(';', ',') for frame in (thread_name,) + stack)
+                f.write(f"{frames} {count}\n")
+
+    def write_summary(self, file_path, limit=20, title=""):
+        """스레드별 상위 함수 요약 저장"""
+        lines = [
+            f"# 프로파일 요약 {title}".rstrip(),
+            f"기록 시간: {self.elapsed:.1f}초, 샘플 간격: {self.interval * 1000:.0f}ms, "
+            f"샘플: {self.sample_count}개",
+            ""
+        ]
+
+        # GIL 때문에 실제 간격이 interval보다 길 수 있어서 샘플 비율로 시간 계산
+        seconds_per_sample = self.elapsed / self.sample_count if self.sample_count else 0
+        for thread_name, thread_total in self.get_thread_totals().most_common():
+            lines.append(f"## {thread_name} (샘플 {thread_total}개, 약 {thread_total * seconds_per_sample:.1f}초)")
+            lines.append(f"{'자기%':>7} {'포함%':>7}  함수")
+            for function, self_count, total_count in self.get_top_functions(thread_name, limit):
+                lines.append(f"{self_count / thread_total * 100:6.1f}% {total_count / thread_total * 100:6.1f}%  {function}")
+            lines.append("")
+
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines))
+
+    def save_report(self, folder=None, name=None, limit=20):
+        """
+        .folded + .txt 저장 (기본 위치: data/profiles)
+        반환: (folded 경로, 요약 경로)
+        """
+        folder = folder or get_data_path("profiles")
+        os.makedirs(folder, exist_ok=True)
+        name = name or f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+        folded_path = os.path.join(folder, f"{name}.folded")
+        summary_path = os.path.join(folder, f"{name}.txt")
+        self.write_folded(folded_path)
+        self.write_summary(summary_path, limit, title=name)
+
+        print(f"📄 프로파일 저장: {folded_path}")
+        print(f"📄 요약 저장: {summary_path}")
+        return folded_path, summary_path
@@ -0,0 +1,202 @@
+# utils/quota.py
+# API 사용량 관리
+# - UsageLedger: API 키별 / 날짜별 호출 수를 파일에 기록 (한도 근처면 키 교체 또는 멈춤)
+# - QuotaPlanner: 실제로 돌리기 전에 호출 수와 걸리는 시간을 미리 계산
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date
+
+from utils.data_paths import get_data_path
+
+# 하루 호출 한도 (기본 무료 한도 기준)
+DAILY_LIMITS = {
+    'kakao': 100000,
+    'naver': 25000
+}
+
+# 기록이 없을 때 사용할 주소 1건당 평균 호출 수 / 호출 1번 평균 시간(초)
+DEFAULT_CALLS_PER_ROW = {
+    'kakao': 3.0,
+    'naver': 4.0
+}
+DEFAULT_SECONDS_PER_CALL = 0.25
+
+
+class UsageLedger:
+    """API 키별 하루 호출 수 장부"""
+
+    def __init__(self, file_path=None, daily_limits=None, safety_margin=0.02, autosave_every=200):
+        """
+        safety_margin: 한도의 이 비율만큼 남으면 "거의 다 찼다"고 판단
+        autosave_every: 호출 몇 번마다 파일에 저장할지
+        """
+        self.file_path = file_path or get_data_path("api_usage.json")
+        self.daily_limits = dict(DAILY_LIMITS, **(daily_limits or {}))
+        self.safety_margin = safety_margin
+        self.autosave_every = autosave_every
+        self.data = {'usage': {}, 'history': {}}
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """저장된 장부 읽기"""
+        if not os.path.exists(self.file_path):
+            return
+
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                loaded = json.load(f)
+            self.data['usage'] = loaded.get('usage', {})
+            self.data['history'] = loaded.get('history', {})
+        except (OSError, ValueError) as e:
+            print(f"⚠️ API 사용량 장부를 읽지 못했어요: {e}")
+
+    @staticmethod
+    def get_key_id(api_key):
+        """키 원문 대신 저장할 식별자 (앞 10자리 해시)"""
+        return hashlib.sha1(api_key.encode('utf-8')).hexdigest()[:10]
+
+    def record_call(self, provider, api_key, elapsed=None):
+        """API 호출 1번 기록"""
+        today = date.today().isoformat()
+        key_id = self.get_key_id(api_key)
+
+        with self._lock:
+            day = self.data['usage'].setdefault(today, {})
+            entry = day.setdefault(key_id, {'provider': provider, 'calls': 0})
+            entry['calls'] += 1
+
+            if elapsed is not None:
+                history = self.data['history'].setdefault(provider, {})
+                history['call_seconds'] = history.get('call_seconds', 0.0) + elapsed
+                history['timed_calls'] = history.get('timed_calls', 0) + 1
+
+            self._unsaved += 1
+            should_save = self._unsaved >= self.autosave_every
+
+        if should_save:
+            self.save()
+
+    def record_row(self, provider, calls):
+        """주소 1건을 처리하는 데 쓴 호출 수 기록 (다음 예측에 사용)"""
+        with self._lock:
+            history = self.data['history'].setdefault(provider, {})
+            history['rows'] = history.get('rows', 0) + 1
+            history['calls'] = history.get('calls', 0) + calls
+
+    def get_calls_today(self, provider, api_key):
+        """오늘 이 키로 호출한 횟수"""
+        today = date.today().isoformat()
+        key_id = self.get_key_id(api_key)
+
+        with self._lock:
+            entry = self.data['usage'].get(today, {}).get(key_id)
+            return entry['calls'] if entry else 0
+
+    def get_remaining(self, provider, api_key):
+        """오늘 남은 호출 수"""
+        return max(0, self.daily_limits[provider] - self.get_calls_today(provider, api_key))
+
+    def is_near_limit(self, provider, api_key):
+        """한도에 거의 다 찼는지"""
+        margin = self.daily_limits[provider] * self.safety_margin
+        return self.get_remaining(provider, api_key) <= margin
+
+    def get_calls_per_row(self, provider):
+        """지금까지 기록된 주소 1건당 평균 호출 수"""
+        with self._lock:
+            history = self.data['history'].get(provider, {})
+            if history.get('rows', 0) >= 20:
+                return history['calls'] / history['rows']
+        return DEFAULT_CALLS_PER_ROW.get(provider, 3.0)
+
+    def get_seconds_per_call(self, provider):
+        """지금까지 기록된 호출 1번 평균 시간"""
+        with self._lock:
+            history = self.data['history'].get(provider, {})
+            if history.get('timed_calls', 0) >= 20:
+                return history['call_seconds'] / history['timed_calls']
+        return DEFAULT_SECONDS_PER_CALL
+
+    def save(self):
+        """장부 저장 (최근 30일치만 남김)"""
+        with self._lock:
+            for day in sorted(self.data['usage'])[:-30]:
+                del self.data['usage'][day]
+            text = json.dumps(self.data, ensure_ascii=False)
+            self._unsaved = 0
+
+        temp_path = self.file_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, self.file_path)
+
+
+class QuotaPlanner:
+    """실행 전에 API 호출 수와 시간을 예측하는 플래너 (실제 호출은 안 함)"""
+
+    def __init__(self, ledger, provider='kakao', min_interval=0.1, row_delay=0.15):
+        self.ledger = ledger
+        self.provider = provider
+        self.min_interval = min_interval
+        self.row_delay = row_delay
+
+    def estimate(self, address_data, api_keys, is_cached=None):
+        """
+        예측 결과 dict 반환
+        is_cached(address): 이미 결과를 알고 있어서 호출이 필요 없는 주소면 True
+        """
+        rows = len(address_data)
+        unique_addresses = {addr['address'] for addr in address_data}
+        unique = len(unique_addresses)
+
+        cached = 0
+        if is_cached:
+            cached = sum(1 for address in unique_addresses if is_cached(address))
+
+        lookups = unique - cached
+        calls_per_row = self.ledger.get_calls_per_row(self.provider)
+        calls = int(round(lookups * calls_per_row))
+
+        seconds_per_call = max(self.min_interval, self.ledger.get_seconds_per_call(self.provider))
+        seconds = calls * seconds_per_call + lookups * self.row_delay
+
+        remaining = sum(self.ledger.get_remaining(self.provider, key) for key in api_keys)
+
+        return {
+            'rows': rows,
+            'unique': unique,
+            'duplicate_ratio': (rows - unique) / rows if rows else 0.0,
+            'cached': cached,
+            'cache_coverage': cached / unique if unique else 0.0,
+            'lookups': lookups,
+            'calls_per_row': calls_per_row,
+            'calls': calls,
+            'seconds': seconds,
+            'remaining_quota': remaining,
+            'fits_quota': calls <= remaining
+        }
+
+    @staticmethod
+    def format_estimate(estimate):
+        """예측 결과를 사람이 읽기 좋은 문장들로"""
+        hours, rest = divmod(int(estimate['seconds']), 3600)
+        minutes = rest // 60
+
+        lines = [
+            f"📊 총 {estimate['rows']}행 (중복 제외 {estimate['unique']}개, 중복률 {estimate['duplicate_ratio']:.0%})",
+            f"💾 이미 결과를 아는 주소: {estimate['cached']}개 ({estimate['cache_coverage']:.0%})",
+            f"📞 예상 API 호출: 약 {estimate['calls']}번 (주소당 {estimate['calls_per_row']:.1f}번)",
+            f"⏱️ 예상 시간: 약 {hours}시간 {minutes}분",
+            f"🔑 오늘 남은 호출 한도: {estimate['remaining_quota']}번"
+        ]
+
+        if not estimate['fits_quota']:
+            lines.append("⚠️ 오늘 한도 안에 다 못 끝날 수 있어요! (한도에 닿으면 자동으로 멈춰요)")
+
+        return lines
@@ -0,0 +1,50 @@
+# utils/rate_limiter.py
+# API 호출 간격 관리 (여러 스레드가 같은 API를 불러도 간격이 지켜지도록)
+# - priority=True 로 기다리는 호출(예: 창에서 주소 하나 바로 찾기)이 있으면
+#   일반 호출(일괄 검색)보다 먼저 다음 차례를 받아요
+
+import threading
+import time
+
+
+class RateLimiter:
+    """호출 사이에 최소 간격(min_interval초)을 두는 속도 제한기"""
+
+    def __init__(self, min_interval=0.1):
+        self.min_interval = min_interval
+        self.last_call_time = 0
+        self._condition = threading.Condition()
+        self._priority_waiting = 0  # 차례를 기다리는 우선 호출 수
+
+    def wait(self, priority=False):
+        """다음 호출 차례가 될 때까지 기다리기 (priority면 일반 호출보다 먼저)"""
+        with self._condition:
+            if priority:
+                self._priority_waiting += 1
+            try:
+                while True:
+                    now = time.time()
+                    if not priority and self._priority_waiting:
+                        # 우선 호출이 차례를 가져갈 때까지 양보
+                        self._condition.wait(self.min_interval)
+                        continue
+
+                    next_time = self.last_call_time + self.min_interval
+                    if now >= next_time:
+                        self.last_call_time = now
+                        return
+
+                    self._condition.wait(next_time - now)
+            finally:
+                if priority:
+                    self._priority_waiting -= 1
+                    self._condition.notify_all()
+
+    def try_acquire(self):
+        """지금 바로 호출할 수 있으면 차례를 쓰고 True, 아니면 기다리지 않고 False"""
+        with self._condition:
+            now = time.time()
+            if self._priority_waiting or now - self.last_call_time < self.min_interval:
+                return False
+            self.last_call_time = now
+            return True
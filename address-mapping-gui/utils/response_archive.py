@@ -0,0 +1,195 @@
+# utils/response_archive.py
+# API 원본 응답 보관소 (SQLite, zlib 압축, 추가만 함)
+# - 카카오/네이버 응답을 "요청(주소 + 파라미터)" 기준으로 그대로 압축해서 쌓아둬요
+# - 매칭 규칙(_is_address_similar, 전화번호 있는 첫 결과 등)을 바꾼 뒤
+#   재매칭(replay) 모드로 돌리면 API 호출 없이 보관된 응답으로 지금 규칙을 다시 적용해요
+#   → 5만 행짜리 파일도 몇 초 만에 다시 채점
+
+import json
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+
+from utils.api_errors import ContactNotFoundError
+from utils.data_paths import get_data_path
+from utils.kakao_api import KakaoAPI
+from utils.lookup_scheduler import LookupScheduler, FAILURE_NOT_FOUND, FAILURE_SKIPPED
+from utils.naver_api import NaverAPI
+from utils.spatial_clustering import ClusterPlanner
+from utils.verification import MatchVerifier
+
+COMMIT_EVERY = 50  # 이만큼 쌓이면 디스크에 반영 (close() 때도 반영)
+
+
+def get_request_key(url, params):
+    """요청 → 보관 키 (파라미터 순서와 상관없이 같은 요청이면 같은 키)"""
+    return url + "?" + json.dumps(params, ensure_ascii=False, sort_keys=True, default=str)
+
+
+class ResponseArchive:
+    """요청별 원본 응답을 압축해서 쌓는 보관소"""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or get_data_path("responses.sqlite3")
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.hits = 0  # 재매칭에서 보관된 응답을 찾은 횟수
+        self.misses = 0  # 재매칭에서 보관된 응답이 없던 횟수
+        self._create_tables()
+
+    def _create_tables(self):
+        """테이블과 인덱스 만들기"""
+        with self._lock:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    id INTEGER PRIMARY KEY,
+                    provider TEXT NOT NULL,
+                    request_key TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    body BLOB,
+                    created_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_responses_key ON responses(provider, request_key, id);
+            """)
+            self.conn.commit()
+
+    def record(self, provider, url, params, status, data):
+        """
+        응답 하나 보관 (같은 요청이 또 오면 새로 쌓고, 찾을 때는 가장 최근 것을 써요)
+        status: HTTP 상태 코드, data: 파싱한 JSON (실패했으면 None)
+        """
+        body = None
+        if data is not None:
+            body = zlib.compress(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO responses (provider, request_key, status, body, created_at) VALUES (?, ?, ?, ?, ?)",
+                (provider, get_request_key(url, params), status, body,
+                 datetime.now().isoformat(timespec='seconds'))
+            )
+            self._pending += 1
+            if self._pending >= COMMIT_EVERY:
+                self.conn.commit()
+                self._pending = 0
+
+    def find(self, provider, url, params):
+        """
+        보관된 가장 최근 응답 → (찾았는지, JSON 또는 None)
+        재매칭에서 "응답이 없었음"과 "보관 안 됨"을 구분하려고 찾았는지를 같이 돌려줘요
+        """
+        with self._lock:
+            row = self.conn.execute("""
+                SELECT status, body FROM responses
+                WHERE provider = ? AND request_key = ?
+                ORDER BY id DESC LIMIT 1
+            """, (provider, get_request_key(url, params))).fetchone()
+
+            if not row:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+
+        status, body = row
+        if status != 200 or body is None:
+            return True, None
+        return True, json.loads(zlib.decompress(body).decode('utf-8'))
+
+    def has_requests(self, provider, param=None):
+        """
+        이 제공자(와 파라미터)로 보관된 요청이 하나라도 있는지
+        재매칭에서 원래 실행이 묶음 검색(rect)이나 네이버를 썼는지 알아낼 때 써요
+        """
+        pattern = f'%"{param}": %' if param else '%'
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM responses WHERE provider = ? AND request_key LIKE ? LIMIT 1",
+                (provider, pattern)
+            ).fetchone()
+        return row is not None
+
+    def count(self):
+        """보관된 응답 수"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def format_stats(self):
+        """재매칭 로그용 한 줄"""
+        return f"🗃️ 보관된 응답 {self.hits}번 사용, 보관 안 된 요청 {self.misses}번 (결과 없음으로 처리)"
+
+    def flush(self):
+        """쌓아둔 기록을 디스크에 반영"""
+        with self._lock:
+            self.conn.commit()
+            self._pending = 0
+
+    def close(self):
+        """남은 기록 반영 후 연결 닫기"""
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
+
+
+def rematch_addresses(address_data, archive, geocoder=None, on_progress=None, use_clusters=None,
+                      use_naver=None):
+    """
+    보관된 응답만으로 지금 매칭 규칙을 다시 적용 (API 호출 0번)
+    address_data의 결과/상태를 새로 채우고 LookupScheduler와 같은 stats 반환 (+ 'unreplayable')
+    geocoder: 원래 실행에서 오프라인 좌표 DB를 썼다면 같은 것을 넘겨야 좌표 요청이 맞아요
+    use_clusters / use_naver: 원래 실행처럼 묶음 검색(ClusterPlanner) / 네이버 교차 확인도 다시 돌릴지
+                              (None이면 보관소에 그 요청이 있는지 보고 정해요)
+    보관된 응답이 없어서 끝까지 못 본 주소는 "못 찾음"이 아니라 건너뜀(skipped)으로 남겨요
+    """
+    for addr in address_data:
+        addr.update({'status': '대기중', 'place_name': None, 'phone': None, 'category': None,
+                     'error': None, 'confidence': None, 'prefilled': False})
+
+    if use_clusters is None:
+        use_clusters = archive.has_requests('kakao', 'rect')
+    if use_naver is None:
+        use_naver = archive.has_requests('naver')
+
+    # 키워드 통계 없이 고정 순서로 (통계는 실제 검색 결과로만 쌓아요)
+    kakao_api = KakaoAPI("", geocoder=geocoder, archive=archive, replay=True)
+    naver_api = NaverAPI("", "", archive=archive, replay=True) if use_naver else None
+    verifier = MatchVerifier(kakao_api, naver_api=naver_api)
+
+    lookup_func = kakao_api.find_contact_info
+    if use_clusters:
+        # 원래 실행과 같은 칸/영역으로 묶어야 보관된 영역 검색 응답이 맞고,
+        # 근처를 이미 본 주소는 주소별 근처 검색 응답이 없어서 같은 계획이 필요해요
+        planner = ClusterPlanner(kakao_api)
+        planner.plan(address_data)
+        lookup_func = planner.lookup
+
+    unreplayable = set()
+
+    def lookup(address):
+        # 스케줄러는 한 주소씩 차례로 검색해서 그동안 늘어난 misses가 이 주소 몫이에요
+        misses = archive.misses
+        try:
+            return lookup_func(address)
+        except ContactNotFoundError:
+            if archive.misses > misses:
+                unreplayable.add(address)
+            raise
+
+    scheduler = LookupScheduler(verifier.wrap(lookup), max_attempts=1)
+    stats = scheduler.run(address_data, on_progress=on_progress)
+
+    stats['unreplayable'] = 0
+    for addr in address_data:
+        if addr['address'] in unreplayable and addr.get('failure_reason') == FAILURE_NOT_FOUND:
+            addr['failure_reason'] = FAILURE_SKIPPED
+            addr['error'] = "보관된 응답이 없어서 다시 매칭하지 못했어요"
+            stats['unreplayable'] += 1
+
+    print(f"🔁 재매칭 {stats['processed']}개: 성공 {stats['success']}개, 실패 {stats['error']}개")
+    if stats['unreplayable']:
+        print(f"   ⚠️ 그중 {stats['unreplayable']}개는 보관된 응답이 모자라 다시 매칭하지 못했어요 "
+              f"(못 찾음이 아니라 건너뜀으로 남겨요)")
+    print(verifier.format_stats())
+    print(archive.format_stats())
+    return stats
@@ -0,0 +1,255 @@
+# utils/results_store.py
+# 지금까지 돌린 모든 결과를 모아두는 저장소 (SQLite)
+# - "이 주소 전화번호 이미 있나?"를 엑셀 파일을 열지 않고 바로 확인
+# - 새 작업을 시작하기 전에 이미 아는 주소는 결과를 미리 채워서 API 호출 절약
+# - 실패 행은 이유(failure_reason)도 남겨서 적중 통계에는 "검색했는데 없음"만 못 찾은 걸로 셈
+
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from utils.data_paths import get_data_path
+from utils.offline_geocoder import normalize_address_key
+
+# 한 번에 IN (...)으로 묻는 주소 수 (SQLite 변수 개수 제한보다 작게)
+QUERY_CHUNK_SIZE = 500
+
+# 이유 칸이 생기기 전에 저장된 실패 행은 오류 문구로 이유를 추정
+LEGACY_FAILURE_REASONS = """
+    CASE
+        WHEN error LIKE '주소 확인 필요%' THEN 'invalid'
+        WHEN error LIKE '최근에 찾지 못한%' THEN 'skipped'
+        WHEN error LIKE '%회 시도)' THEN 'transient'
+        ELSE 'not_found'
+    END
+"""
+
+
+class ResultsStore:
+    """실행 결과 저장소 (정규화된 주소, 구/동, 전화번호로 빠르게 검색)"""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or get_data_path("results.sqlite3")
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._create_tables()
+
+    def _create_tables(self):
+        """테이블과 인덱스 만들기"""
+        with self._lock:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY,
+                    source TEXT,
+                    finished_at TEXT NOT NULL,
+                    rows INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS results (
+                    id INTEGER PRIMARY KEY,
+                    run_id INTEGER NOT NULL REFERENCES runs(id),
+                    address_key TEXT NOT NULL,
+                    address TEXT NOT NULL,
+                    city TEXT,
+                    district TEXT,
+                    dong TEXT,
+                    street_number TEXT,
+                    additional_info TEXT,
+                    status TEXT NOT NULL,
+                    place_name TEXT,
+                    phone TEXT,
+                    category TEXT,
+                    error TEXT,
+                    failure_reason TEXT,
+                    created_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_results_key ON results(address_key, id);
+                CREATE INDEX IF NOT EXISTS idx_results_area ON results(district, dong, id);
+                CREATE INDEX IF NOT EXISTS idx_results_phone ON results(phone);
+            """)
+
+            # 예전 DB에는 실패 이유 칸 추가
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(results)")]
+            if 'failure_reason' not in columns:
+                self.conn.execute("ALTER TABLE results ADD COLUMN failure_reason TEXT")
+                self.conn.execute(f"UPDATE results SET failure_reason = {LEGACY_FAILURE_REASONS} "
+                                  "WHERE status = '실패'")
+            self.conn.commit()
+
+    def add_run(self, address_data, source=""):
+        """끝난 실행의 결과 저장 (성공/실패로 끝난 행만), 저장한 행 수 반환"""
+        now = datetime.now().isoformat(timespec='seconds')
+        rows = [
+            (
+                normalize_address_key(item['address']),
+                item['address'],
+                item.get('city', ''),
+                item.get('district', ''),
+                item.get('dong', ''),
+                item.get('street_number', ''),
+                item.get('additional_info', ''),
+                item['status'],
+                item.get('place_name'),
+                item.get('phone'),
+                item.get('category'),
+                item.get('error'),
+                item.get('failure_reason') if item['status'] == '실패' else None,
+                now
+            )
+            for item in address_data
+            if item.get('status') in ('성공', '실패') and not item.get('prefilled')
+        ]
+
+        if not rows:
+            return 0
+
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (source, finished_at, rows) VALUES (?, ?, ?)",
+                (source, now, len(rows))
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany("""
+                INSERT INTO results (run_id, address_key, address, city, district, dong,
+                                     street_number, additional_info, status, place_name,
+                                     phone, category, error, failure_reason, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(run_id,) + row for row in rows])
+            self.conn.commit()
+
+        print(f"🗄️ 결과 {len(rows)}개를 기록 저장소에 저장했어요")
+        return len(rows)
+
+    def find(self, address):
+        """이 주소로 찾았던 가장 최근 성공 결과 (없으면 None)"""
+        results = self.find_many([address])
+        return results.get(normalize_address_key(address))
+
+    def has_result(self, address):
+        """이 주소의 성공 결과가 있는지"""
+        return self.find(address) is not None
+
+    def find_many(self, addresses, max_age_days=None):
+        """여러 주소를 한꺼번에 조회 → {정규화된 주소: 결과 dict}"""
+        keys = list({normalize_address_key(address) for address in addresses})
+        since = ""
+        if max_age_days:
+            since = (datetime.now() - timedelta(days=max_age_days)).isoformat(timespec='seconds')
+
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), QUERY_CHUNK_SIZE):
+                chunk = keys[start:start + QUERY_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                # id 순서로 읽어서 나중(최근) 결과가 덮어쓰게 함
+                cursor = self.conn.execute(f"""
+                    SELECT address_key, place_name, phone, category, created_at
+                    FROM results
+                    WHERE address_key IN ({placeholders}) AND status = '성공' AND created_at >= ?
+                    ORDER BY id
+                """, chunk + [since])
+
+                for key, place_name, phone, category, created_at in cursor:
+                    found[key] = {
+                        'place_name': place_name,
+                        'phone': phone,
+                        'category': category or '',
+                        'found_at': created_at
+                    }
+
+        return found
+
+    def prefill(self, address_data, max_age_days=None):
+        """
+        이미 아는 주소는 API 호출 전에 결과 채우기
+        채운 행은 status='성공', prefilled=True 로 표시 (채운 개수 반환)
+        """
+        found = self.find_many([item['address'] for item in address_data], max_age_days)
+
+        filled = 0
+        for item in address_data:
+            result = found.get(normalize_address_key(item['address']))
+            if not result:
+                continue
+
+            item['place_name'] = result['place_name']
+            item['phone'] = result['phone']
+            item['category'] = result['category']
+            item['status'] = '성공'
+            item['error'] = None
+            item['prefilled'] = True
+            filled += 1
+
+        return filled
+
+    def search(self, text, limit=100):
+        """
+        기록 검색 (인덱스만 타도록 앞부분 일치로 검색)
+        - 숫자/하이픈만 있으면 전화번호 앞자리로 (최근 것부터)
+        - "구 동" 두 단어면 구/동으로 (최근 것부터)
+        - 그 외에는 정규화된 주소 앞부분으로
+        """
+        text = text.strip()
+        if not text:
+            return []
+
+        columns = "address, place_name, phone, category, status, created_at"
+        compact = text.replace('-', '').replace(' ', '')
+        parts = text.split()
+
+        if compact.isdigit():
+            # 하이픈 있는/없는 전화번호 모두 앞자리 범위로 검색 (인덱스 사용)
+            query = f"""
+                SELECT {columns} FROM results
+                WHERE (phone >= ? AND phone < ?) OR (phone >= ? AND phone < ?)
+                ORDER BY id DESC LIMIT ?
+            """
+            params = [text, text + '\uffff', compact, compact + '\uffff', limit]
+        elif len(parts) == 2 and parts[0].endswith(('구', '군', '시')):
+            query = f"""
+                SELECT {columns} FROM results
+                WHERE district = ? AND dong = ?
+                ORDER BY id DESC LIMIT ?
+            """
+            params = [parts[0], parts[1], limit]
+        else:
+            key = normalize_address_key(text)
+            query = f"""
+                SELECT {columns} FROM results
+                WHERE address_key >= ? AND address_key < ?
+                ORDER BY address_key DESC, id DESC LIMIT ?
+            """
+            params = [key, key + '\uffff', limit]
+
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+
+        return [
+            dict(zip(('address', 'place_name', 'phone', 'category', 'status', 'created_at'), row))
+            for row in rows
+        ]
+
+    def get_outcome_counts(self):
+        """
+        구/동/번지 유무별 성공·실패 수 → [(구, 동, 번지 있음, 상태, 행 수)] (적중 확률 추정용)
+        실패는 검색했는데 전화번호가 없던 행만 (주소 확인 필요/검색 건너뜀/일시 오류는 빼요)
+        """
+        with self._lock:
+            rows = self.conn.execute("""
+                SELECT district, dong, TRIM(COALESCE(street_number, '')) != '', status, COUNT(*)
+                FROM results
+                WHERE status = '성공' OR (status = '실패' AND failure_reason = 'not_found')
+                GROUP BY 1, 2, 3, 4
+            """).fetchall()
+
+        return [(district or '', dong or '', bool(numbered), status, count)
+                for district, dong, numbered, status, count in rows]
+
+    def count(self):
+        """저장된 결과 행 수"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        """DB 닫기"""
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,163 @@
+# utils/row_priority.py
+# 시간이나 API 호출이 모자랄 때 "찾을 가능성이 높고 싼 주소"부터 검색하기
+# - 기록 저장소의 지난 결과로 행마다 전화번호를 찾을 확률을 추정
+#   (같은 동 → 같은 구 → 전체 순으로 기록이 적을수록 위 단계 값에 가깝게, 번지가 있는지도 따로 봄)
+# - 찾으면 키워드를 몇 개만 쓰고 끝나지만 못 찾으면 전부 써보니까 실패 쪽 호출 수를 더 크게 잡음
+# - 행 가치 = 찾을 확률 / 예상 호출 수 → 높은 순서로 처리하면 제한 안에서 찾는 전화번호가 가장 많아요
+# - TimeBox: 마감 시간 / 호출 예산에 닿으면 다음 행을 시작하지 않고 멈추기
+
+import time
+
+# 못 찾은 주소는 찾은 주소보다 호출을 이만큼 더 씀 (모든 키워드 + 기존 방법까지 시도)
+MISS_COST_RATIO = 2.0
+
+# 위 단계(구/전체) 값을 기록 몇 건만큼으로 섞을지 (기록이 적은 동은 구 평균에 가깝게)
+PRIOR_WEIGHT = 5
+
+
+def has_street_number(addr):
+    """번지가 있는 행인지"""
+    return bool(str(addr.get('street_number') or '').strip())
+
+
+class HitEstimator:
+    """지난 결과로 행별 적중 확률과 예상 호출 수를 추정"""
+
+    def __init__(self, results_store, ledger=None, negative_store=None, provider='kakao',
+                 prior_weight=PRIOR_WEIGHT):
+        self.ledger = ledger
+        self.negative_store = negative_store
+        self.provider = provider
+        self.prior_weight = prior_weight
+        # {번지 있음: [시도, 적중]}, {(구, 번지 있음): ...}, {(구, 동, 번지 있음): ...}
+        self.overall = {}
+        self.districts = {}
+        self.dongs = {}
+        self._load(results_store)
+
+    def _load(self, results_store):
+        """기록 저장소에서 구/동/번지 유무별 성공·실패 수 모으기"""
+        for district, dong, numbered, status, count in results_store.get_outcome_counts():
+            hits = count if status == '성공' else 0
+            for table, key in ((self.overall, numbered),
+                               (self.districts, (district, numbered)),
+                               (self.dongs, (district, dong, numbered))):
+                counts = table.setdefault(key, [0, 0])
+                counts[0] += count
+                counts[1] += hits
+
+    def _shrink(self, counts, prior):
+        """기록 수가 적을수록 prior 쪽으로 당긴 적중률"""
+        tries, hits = counts or (0, 0)
+        return (hits + self.prior_weight * prior) / (tries + self.prior_weight)
+
+    def get_hit_probability(self, addr):
+        """이 행에서 전화번호를 찾을 확률 (0~1)"""
+        if addr.get('invalid_address'):
+            return 0.0
+        if self.negative_store and self.negative_store.get_retry_after(addr['address']):
+            return 0.0
+
+        numbered = has_street_number(addr)
+        district = addr.get('district') or ''
+        dong = addr.get('dong') or ''
+
+        # 기록이 하나도 없으면 반반에서 시작
+        overall = self._shrink(self.overall.get(numbered), 0.5)
+        district_rate = self._shrink(self.districts.get((district, numbered)), overall)
+        return self._shrink(self.dongs.get((district, dong, numbered)), district_rate)
+
+    def get_hit_calls(self):
+        """
+        찾은 행 1건의 예상 호출 수
+        장부의 평균(주소 1건당 호출 수)을 전체 적중률로 찾은 행/못 찾은 행에 나눠서 계산
+        """
+        calls_per_row = self.ledger.get_calls_per_row(self.provider) if self.ledger else 3.0
+        tries = sum(counts[0] for counts in self.overall.values())
+        hits = sum(counts[1] for counts in self.overall.values())
+        hit_rate = hits / tries if tries else 0.5
+        return calls_per_row / (hit_rate + MISS_COST_RATIO * (1 - hit_rate))
+
+    def score(self, address_data):
+        """
+        행마다 추정값 붙이기 → [(행, 적중 확률, 예상 호출 수, 가치)]
+        검색하지 않을 행(주소 확인 필요, 최근에 못 찾음)은 호출 0, 가치 0
+        """
+        hit_calls = self.get_hit_calls()
+        scored = []
+        for addr in address_data:
+            probability = self.get_hit_probability(addr)
+            if probability <= 0:
+                scored.append((addr, 0.0, 0.0, 0.0))
+                continue
+
+            calls = probability * hit_calls + (1 - probability) * hit_calls * MISS_COST_RATIO
+            scored.append((addr, probability, calls, probability / calls))
+        return scored
+
+    def order(self, address_data):
+        """가치가 높은 행부터 (같으면 원래 순서), 점수 목록도 같은 순서로 반환"""
+        scored = self.score(address_data)
+        scored.sort(key=lambda item: -item[3])
+        return [item[0] for item in scored], scored
+
+    def estimate_hits(self, scored, max_calls=None, max_seconds=None, row_delay=0.15):
+        """
+        scored 순서대로 처리했을 때 제한 안에서 예상되는 (처리 행 수, 찾을 전화번호 수)
+        시간은 장부의 호출 1번 평균 시간 + 행마다 쉬는 시간으로 계산
+        """
+        seconds_per_call = self.ledger.get_seconds_per_call(self.provider) if self.ledger else 0.3
+        calls_used = 0.0
+        seconds_used = 0.0
+        rows = 0
+        hits = 0.0
+
+        for _, probability, calls, _ in scored:
+            if max_calls is not None and calls_used >= max_calls:
+                break
+            if max_seconds is not None and seconds_used >= max_seconds:
+                break
+            calls_used += calls
+            if calls:
+                seconds_used += calls * seconds_per_call + row_delay
+            rows += 1
+            hits += probability
+
+        return rows, hits
+
+
+class TimeBox:
+    """
+    마감 시간 / 호출 예산 감시
+    should_stop()을 스케줄러에 넘기면 제한에 닿은 뒤로는 새 행을 시작하지 않아요
+    (이미 검색 중인 행은 끝까지 하니까 호출 예산을 몇 번 넘을 수 있어요)
+    """
+
+    def __init__(self, deadline_seconds=None, max_calls=None, call_counter=None, stop_event=None):
+        """
+        call_counter(): 지금까지 쓴 API 호출 수 (예: lambda: kakao_api.call_count)
+        stop_event: 사용자가 누른 취소도 같이 보려면 넘기기
+        """
+        self.deadline = time.time() + deadline_seconds if deadline_seconds else None
+        self.max_calls = max_calls
+        self.call_counter = call_counter
+        self.calls_at_start = call_counter() if call_counter else 0
+        self.stop_event = stop_event
+        self.reason = None  # 제한 때문에 멈췄으면 이유
+
+    def get_calls_used(self):
+        if not self.call_counter:
+            return 0
+        return self.call_counter() - self.calls_at_start
+
+    def should_stop(self):
+        if self.stop_event and self.stop_event.is_set():
+            return True
+        if self.reason:
+            return True
+
+        if self.deadline and time.time() >= self.deadline:
+            self.reason = "마감 시간이 됐어요"
+        elif self.max_calls and self.get_calls_used() >= self.max_calls:
+            self.reason = f"호출 예산 {self.max_calls}번을 다 썼어요"
+        return self.reason is not None
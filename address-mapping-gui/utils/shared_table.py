@@ -0,0 +1,398 @@
+# utils/shared_table.py
+# 여러 프로세스가 같이 보는 주소 표 (공유 메모리, 컬럼별로 저장)
+# - address_data(딕셔너리 리스트)를 워커마다 피클로 넘기지 않고
+#   공유 메모리 블록 하나에 컬럼별로 한 번만 써두면 워커는 이름으로 붙어서 복사 없이 읽어요
+# - 글자 컬럼: 행마다 시작 위치(int64) + UTF-8 바이트를 이어 붙인 덩어리
+# - 결과 컬럼: 행 번호 자리에 미리 잡아둔 고정 크기 칸 (워커가 자기 행 칸에 바로 씀, 너무 길면 잘림)
+# - 워커는 다음 행 묶음을 공유 커서로 가져가고, 진행 수(처리/성공/실패)도 블록 머리에 같이 세요
+# - 키 하나에 프로세스 하나 (키마다 호출 간격은 각 프로세스의 KakaoAPI가 지켜요)
+# - 호출 장부/키워드 통계는 워커가 늘어난 만큼만 돌려주고 만든 쪽이 합쳐서 한 번 저장
+#   (프로세스마다 파일을 통째로 덮어쓰면 서로의 기록이 사라지니까)
+
+import copy
+import signal
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_EXCEPTION
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+# 워커가 한 번에 가져가는 행 수
+CHUNK_SIZE = 50
+
+# 공유 메모리로 넘기는 입력 컬럼
+TEXT_FIELDS = ('address', 'city', 'district', 'dong', 'street_number', 'additional_info', 'address_note')
+
+# 결과 컬럼과 행마다 잡아두는 칸 크기 (UTF-8 바이트)
+RESULT_FIELDS = (('place_name', 160), ('phone', 32), ('category', 200), ('error', 300),
+                 ('failure_reason', 16), ('confidence', 16))
+
+# 상태는 행마다 1바이트 코드로
+STATUS_CODES = {'대기중': 0, '성공': 1, '실패': 2}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+# 블록 머리 (int64 칸): 다음에 가져갈 행, 처리, 성공, 실패, 멈춤 요청
+HEADER_SLOTS = ('cursor', 'processed', 'success', 'error', 'stop')
+HEADER_SIZE = 8 * len(HEADER_SLOTS)
+
+
+class SharedAddressTable:
+    """
+    공유 메모리에 올린 주소 표
+    만든 쪽(create)이 unlink 하고, 붙은 쪽(attach)은 close만 해요
+    """
+
+    def __init__(self, shm, spec, owner):
+        self.shm = shm
+        self.spec = spec  # 워커에 넘기는 건 이 작은 dict뿐 (블록 이름, 행 수, 컬럼 위치)
+        self.rows = spec['rows']
+        self.owner = owner
+        self._views = []
+
+        self.header = self._cast(self._view(0, HEADER_SIZE), 'q')
+        self.ids = self._cast(self._slice('id'), 'q')
+        self.invalid = self._slice('invalid')
+        self.status = self._slice('status')
+        self.offsets = {field: self._cast(self._slice(f'{field}:offsets'), 'q') for field in TEXT_FIELDS}
+        self.texts = {field: self._slice(f'{field}:text') for field in TEXT_FIELDS}
+        self.results = {field: self._slice(field) for field, _ in RESULT_FIELDS}
+
+    def _view(self, start, size):
+        view = self.shm.buf[start:start + size]
+        self._views.append(view)
+        return view
+
+    def _slice(self, name):
+        return self._view(*self.spec['layout'][name])
+
+    def _cast(self, view, fmt):
+        view = view.cast(fmt)
+        self._views.append(view)
+        return view
+
+    @classmethod
+    def create(cls, address_data):
+        """address_data를 공유 메모리 블록 하나에 컬럼별로 쓰기"""
+        rows = len(address_data)
+        encoded = {field: [str(addr.get(field) or '').encode('utf-8') for addr in address_data]
+                   for field in TEXT_FIELDS}
+
+        # 컬럼 위치 정하기 (int64 컬럼은 8바이트 단위로 맞춤)
+        layout = {}
+        position = HEADER_SIZE
+
+        def place(name, size, align=1):
+            nonlocal position
+            position = (position + align - 1) // align * align
+            layout[name] = (position, size)
+            position += size
+
+        place('id', 8 * rows, 8)
+        place('invalid', rows)
+        place('status', rows)
+        for field in TEXT_FIELDS:
+            place(f'{field}:offsets', 8 * (rows + 1), 8)
+            place(f'{field}:text', sum(len(value) for value in encoded[field]))
+        for field, width in RESULT_FIELDS:
+            place(field, width * rows)
+
+        shm = SharedMemory(create=True, size=max(position, 1))
+        table = cls(shm, {'name': shm.name, 'rows': rows, 'layout': layout}, owner=True)
+
+        try:
+            for slot in range(len(HEADER_SLOTS)):
+                table.header[slot] = 0
+            for row, addr in enumerate(address_data):
+                table.ids[row] = int(addr['id'])
+                table.invalid[row] = 1 if addr.get('invalid_address') else 0
+                table.status[row] = STATUS_CODES.get(addr.get('status'), 0)
+
+            for field in TEXT_FIELDS:
+                offsets = table.offsets[field]
+                text = table.texts[field]
+                end = 0
+                offsets[0] = 0
+                for row, value in enumerate(encoded[field]):
+                    text[end:end + len(value)] = value
+                    end += len(value)
+                    offsets[row + 1] = end
+
+            for field, width in RESULT_FIELDS:
+                table.results[field][:] = bytes(width * rows)
+            # 이미 결과가 있는 행(미리 채운 행 등)은 결과도 같이 올려서 read_results가 지우지 않게
+            for row, addr in enumerate(address_data):
+                if table.status[row]:
+                    table.write_result(row, addr)
+        except Exception:
+            table.close()
+            raise
+
+        return table
+
+    @classmethod
+    def attach(cls, spec):
+        """워커 프로세스에서 이름으로 붙기 (복사 없음)"""
+        return cls(SharedMemory(name=spec['name']), spec, owner=False)
+
+    def get_text(self, row, field):
+        offsets = self.offsets[field]
+        return bytes(self.texts[field][offsets[row]:offsets[row + 1]]).decode('utf-8')
+
+    def get_row(self, row):
+        """행 하나를 address_data 모양 dict로 (검색하는 동안만 쓰는 작은 사본)"""
+        addr = {field: self.get_text(row, field) for field in TEXT_FIELDS}
+        addr.update(id=self.ids[row], invalid_address=bool(self.invalid[row]),
+                    status=STATUS_NAMES[self.status[row]])
+        addr.update(self.get_result(row))
+        return addr
+
+    def get_result(self, row):
+        """행의 결과 컬럼 읽기 (빈 칸은 None)"""
+        result = {}
+        for field, width in RESULT_FIELDS:
+            value = bytes(self.results[field][row * width:(row + 1) * width]).rstrip(b'\0')
+            # 잘린 칸은 글자 중간에서 끝날 수 있어서 깨진 끝 글자는 버림
+            result[field] = value.decode('utf-8', errors='ignore') or None
+        return result
+
+    def write_result(self, row, addr):
+        """워커가 자기 행 칸에 결과 쓰기 (상태는 마지막에 써서 반쯤 쓴 결과가 보이지 않게)"""
+        for field, width in RESULT_FIELDS:
+            value = str(addr.get(field) or '').encode('utf-8')[:width]
+            self.results[field][row * width:(row + 1) * width] = value.ljust(width, b'\0')
+        self.status[row] = STATUS_CODES.get(addr['status'], 0)
+
+    def claim(self, lock, size=CHUNK_SIZE):
+        """다음 행 묶음 가져가기 → range (남은 행이 없으면 빈 range)"""
+        with lock:
+            start = self.header[0]
+            stop = min(self.rows, start + size)
+            self.header[0] = stop
+        return range(start, stop)
+
+    def count(self, lock, success):
+        """처리 수 세기 (워커가 행 하나 끝낼 때마다)"""
+        with lock:
+            self.header[1] += 1
+            self.header[2 if success else 3] += 1
+
+    def get_progress(self):
+        """(처리, 성공, 실패)"""
+        return self.header[1], self.header[2], self.header[3]
+
+    def request_stop(self, lock):
+        """워커들이 새 묶음을 가져가지 않고, 지금 묶음도 다음 행부터는 멈추게"""
+        with lock:
+            self.header[0] = self.rows
+            self.header[4] = 1
+
+    def is_stopped(self):
+        return bool(self.header[4])
+
+    def read_results(self, address_data):
+        """공유 결과 컬럼을 원래 address_data에 옮기기 (만든 쪽에서, 끝난 뒤에)"""
+        for row, addr in enumerate(address_data):
+            status = STATUS_NAMES[self.status[row]]
+            if status == '대기중':
+                continue
+            addr.update(self.get_result(row))
+            addr['status'] = status
+
+    def close(self):
+        """블록에서 떨어지기 (만든 쪽이면 블록도 지움)"""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self.header = self.ids = self.invalid = self.status = None
+        self.offsets = self.texts = self.results = {}
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+# 워커 프로세스마다 한 번 붙은 표와 잠금
+_worker_table = None
+_worker_lock = None
+
+
+def _init_worker(spec, lock):
+    """워커 프로세스 시작 시 공유 표에 붙기 (Ctrl+C는 만든 쪽이 받아서 멈춤 요청으로 전해요)"""
+    global _worker_table, _worker_lock
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_table = SharedAddressTable.attach(spec)
+    _worker_lock = lock
+
+
+def subtract_counts(current, base):
+    """current - base (숫자/숫자 목록만 빼고 달라진 게 없는 항목은 빠짐, 문자열은 그대로)"""
+    if isinstance(current, dict):
+        base = base if isinstance(base, dict) else {}
+        delta = {}
+        for key, value in current.items():
+            changed = subtract_counts(value, base.get(key))
+            if changed is not None:
+                delta[key] = changed
+        # 문자열(제공자 이름 등)만 남았으면 바뀐 게 없는 것
+        if all(isinstance(value, str) for value in delta.values()):
+            return None
+        return delta
+    if isinstance(current, list):
+        base = base if isinstance(base, list) else [0] * len(current)
+        delta = [value - old for value, old in zip(current, base)]
+        return delta if any(delta) else None
+    if isinstance(current, (int, float)):
+        return (current - (base or 0)) or None
+    return current
+
+
+def add_counts(target, delta):
+    """subtract_counts로 만든 늘어난 만큼을 target에 더하기"""
+    for key, value in delta.items():
+        if isinstance(value, dict):
+            add_counts(target.setdefault(key, {}), value)
+        elif isinstance(value, list):
+            counts = target.setdefault(key, [0] * len(value))
+            for position, amount in enumerate(value):
+                counts[position] += amount
+        elif isinstance(value, str):
+            target.setdefault(key, value)
+        else:
+            target[key] = target.get(key, 0) + value
+
+
+def _lookup_worker(api_key):
+    """
+    워커 프로세스: 키 하나로 행 묶음을 계속 가져가서 검색하고 결과 칸에 쓰기
+    반환: {'paused': 한도 때문에 멈췄으면 그 이유, 'ledger': 장부 늘어난 만큼, 'keywords': 키워드 통계 늘어난 만큼}
+    """
+    from utils.kakao_api import KakaoAPI
+    from utils.keyword_stats import KeywordStats
+    from utils.lookup_scheduler import LookupScheduler
+    from utils.offline_geocoder import OfflineGeocoder
+    from utils.quota import UsageLedger
+    from utils.verification import MatchVerifier
+
+    table = _worker_table
+    # 장부는 오늘 쓴 호출 수를 알아야 한도에서 멈추니까 읽어오되, 파일 저장은 만든 쪽이 한 번만
+    ledger = UsageLedger(autosave_every=float('inf'))
+    keyword_stats = KeywordStats()
+    ledger_base = copy.deepcopy(ledger.data)
+    keywords_base = copy.deepcopy(keyword_stats.data)
+
+    kakao_api = KakaoAPI(api_key, keyword_stats=keyword_stats, ledger=ledger,
+                         geocoder=OfflineGeocoder.open_if_exists())
+    verifier = MatchVerifier(kakao_api)
+    scheduler = LookupScheduler(verifier.wrap(kakao_api.find_contact_info), row_delay=0.15)
+
+    result = {'paused': None}
+    try:
+        result['paused'] = _lookup_chunks(table, scheduler)
+    finally:
+        result['ledger'] = subtract_counts(ledger.data, ledger_base)
+        result['keywords'] = subtract_counts(keyword_stats.data, keywords_base)
+    return result
+
+
+def _lookup_chunks(table, scheduler):
+    """행 묶음을 계속 가져가서 검색 → 한도 때문에 멈췄으면 그 이유"""
+    while True:
+        rows = table.claim(_worker_lock)
+        if not rows:
+            return None
+
+        chunk = [table.get_row(row) for row in rows]
+        pending = [(row, addr) for row, addr in zip(rows, chunk) if addr['status'] == '대기중']
+
+        def on_done(index, addr_data, *args):
+            row = pending[index][0]
+            table.write_result(row, addr_data)
+            table.count(_worker_lock, addr_data['status'] == '성공')
+
+        stats = scheduler.run([addr for _, addr in pending], on_success=on_done, on_error=on_done,
+                              should_stop=table.is_stopped)
+        if stats['paused']:
+            return stats['paused']
+
+
+def run_parallel_lookup(address_data, api_keys, on_progress=None, progress_interval=2.0):
+    """
+    키마다 프로세스 하나로 나눠 검색 (주소 표는 공유 메모리로 한 번만 올림)
+    결과는 address_data에 다시 옮겨 담고, 못 끝낸 행은 대기중으로 남아요
+    (워커가 오류로 죽거나 Ctrl+C로 멈춰도 그때까지의 결과는 옮겨 담아요)
+    호출 장부/키워드 통계는 워커들이 늘린 만큼 합쳐서 저장
+    on_progress(processed, success, error): progress_interval초마다
+    반환: {'processed', 'success', 'error', 'paused', 'stopped', 'failures'(워커 오류 문구 목록)}
+    """
+    context = get_context()
+    lock = context.Lock()
+    failures = []
+    stopped = False
+
+    with SharedAddressTable.create(address_data) as table:
+        print(f"🧠 주소 {table.rows}개를 공유 메모리({table.shm.size / 1024 / 1024:.1f}MB)에 올렸어요 "
+              f"→ 프로세스 {len(api_keys)}개로 검색")
+
+        with ProcessPoolExecutor(max_workers=len(api_keys), mp_context=context,
+                                 initializer=_init_worker, initargs=(table.spec, lock)) as executor:
+            futures = [executor.submit(_lookup_worker, api_key) for api_key in api_keys]
+
+            while True:
+                try:
+                    done, running = wait(futures, timeout=progress_interval, return_when=FIRST_EXCEPTION)
+                except KeyboardInterrupt:
+                    # 워커들은 지금 행까지만 하고 멈춤 → 기다렸다가 결과는 그대로 옮겨 담음
+                    print("⏹️ 멈추는 중이에요 (검색 중인 행까지만 끝내요)")
+                    table.request_stop(lock)
+                    stopped = True
+                    continue
+                if on_progress:
+                    on_progress(*table.get_progress())
+                if any(future.exception() for future in done) and not table.is_stopped():
+                    # 한 워커가 죽으면 나머지도 멈추게
+                    table.request_stop(lock)
+                if not running:
+                    break
+
+            # 워커 오류는 다시 올리지 않고 모아서 알려줌 (결과 옮겨 담기가 먼저)
+            results = []
+            for future in futures:
+                error = future.exception()
+                if error:
+                    failures.append(f"{type(error).__name__}: {error}")
+                else:
+                    results.append(future.result())
+
+        table.read_results(address_data)
+        processed, success, error = table.get_progress()
+
+    paused = [result['paused'] for result in results if result['paused']]
+    _save_worker_counts(results)
+    for failure in failures:
+        print(f"❌ 검색 프로세스 오류: {failure}")
+
+    return {'processed': processed, 'success': success, 'error': error,
+            'paused': paused[0] if paused else None, 'stopped': stopped, 'failures': failures}
+
+
+def _save_worker_counts(results):
+    """워커들이 늘린 호출 장부/키워드 통계를 합쳐서 저장"""
+    from utils.keyword_stats import KeywordStats
+    from utils.quota import UsageLedger
+
+    ledger = UsageLedger()
+    keyword_stats = KeywordStats()
+    for result in results:
+        if result['ledger']:
+            add_counts(ledger.data, result['ledger'])
+        if result['keywords']:
+            add_counts(keyword_stats.data, result['keywords'])
+
+    try:
+        ledger.save()
+        keyword_stats.save()
+    except OSError as e:
+        print(f"⚠️ 통계 저장 실패: {e}")
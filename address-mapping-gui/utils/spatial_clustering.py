@@ -0,0 +1,183 @@
+# utils/spatial_clustering.py
+# 가까운 주소끼리 묶어서 근처 검색을 한 번만 하기
+# - 먼저 모든 주소를 좌표로 바꾸고 (오프라인 DB가 있으면 호출 없이)
+# - 좌표를 격자(기본 500m 칸)로 묶은 뒤, 칸마다 영역(rect) 검색을 페이지 넘겨가며 한 번만
+# - 칸 안의 주소들은 같은 후보 목록에서 각자 가장 가까운 "주소가 비슷하고 전화번호 있는 곳"을 찾아요
+#   → 근처 검색 호출 수가 주소 수가 아니라 칸 수만큼만 늘어나요
+# - 후보에서 못 찾은 주소는 평소처럼 키워드 검색(3단계)으로 넘어가요
+
+import math
+from collections import defaultdict
+
+from utils.api_errors import TransientAPIError, QuotaExhaustedError
+from utils.kakao_api import NEARBY_RADIUS
+
+METERS_PER_DEGREE = 111320  # 위도 1도 ≈ 111.32km
+
+
+def get_grid_cell(lat, lng, cell_size):
+    """좌표 → 격자 칸 번호 (cell_size m 정사각형)"""
+    lat_step = cell_size / METERS_PER_DEGREE
+    lng_step = cell_size / (METERS_PER_DEGREE * math.cos(math.radians(lat)))
+    row = math.floor(lat / lat_step)
+    return row, math.floor(lng / lng_step)
+
+
+def get_distance(coords1, coords2):
+    """두 좌표 사이 거리 (m, 가까운 거리용 근사)"""
+    lat = math.radians((coords1['lat'] + coords2['lat']) / 2)
+    dy = (coords1['lat'] - coords2['lat']) * METERS_PER_DEGREE
+    dx = (coords1['lng'] - coords2['lng']) * METERS_PER_DEGREE * math.cos(lat)
+    return math.hypot(dx, dy)
+
+
+class ClusterPlanner:
+    """주소를 격자로 묶어 칸마다 근처 검색을 한 번만 하는 계획 단계"""
+
+    def __init__(self, kakao_api, cell_size=500, margin=NEARBY_RADIUS, max_pages=3, query='음식점',
+                 min_cluster_size=2):
+        """
+        cell_size: 격자 칸 크기 (m)
+        margin: 주소들을 덮는 영역 밖으로 넓혀서 검색할 거리 (m)
+                2단계 근처 검색 반경(NEARBY_RADIUS)보다 작으면 가장자리 주소는 반경을 다 못 보니까
+                묶음 검색 뒤에도 평소 근처 검색을 해요
+        max_pages: 칸마다 넘겨볼 최대 페이지 수 (페이지당 15곳)
+        min_cluster_size: 이보다 적은 주소가 있는 칸은 묶지 않고 평소처럼 검색
+        """
+        self.kakao_api = kakao_api
+        self.cell_size = cell_size
+        self.margin = margin
+        self.max_pages = max_pages
+        self.query = query
+        self.min_cluster_size = min_cluster_size
+
+        self.results = {}  # 주소 → 묶음 검색으로 찾은 결과
+        self.checked = set()  # 묶음 검색으로 근처를 이미 찾아본 주소
+        self.stats = {'geocoded': 0, 'clusters': 0, 'clustered_rows': 0, 'matched': 0, 'search_calls': 0}
+
+    def plan(self, address_data, should_stop=None, on_progress=None):
+        """
+        검색 전에 좌표 변환 + 묶음 검색
+        on_progress(stage, done, total): 'geocode' / 'cluster' 진행 알림
+        API 한도가 차면 거기까지만 계획하고 나머지는 평소 검색으로 넘겨요
+        """
+        cells = defaultdict(list)  # 칸 → [(주소, 좌표)]
+        addresses = list(dict.fromkeys(addr['address'] for addr in address_data))
+
+        try:
+            for done, address in enumerate(addresses, start=1):
+                if should_stop and should_stop():
+                    return
+                try:
+                    coords = self.kakao_api.get_coordinates(address)
+                except TransientAPIError:
+                    continue
+                if coords:
+                    self.stats['geocoded'] += 1
+                    cells[get_grid_cell(coords['lat'], coords['lng'], self.cell_size)].append((address, coords))
+                if on_progress:
+                    on_progress('geocode', done, len(addresses))
+
+            clusters = [members for members in cells.values() if len(members) >= self.min_cluster_size]
+            for done, members in enumerate(clusters, start=1):
+                if should_stop and should_stop():
+                    return
+                try:
+                    self._search_cluster(members)
+                except TransientAPIError as e:
+                    print(f"   ⚠️ 묶음 검색 일시 오류 (평소 검색으로 넘겨요): {e}")
+                if on_progress:
+                    on_progress('cluster', done, len(clusters))
+
+        except QuotaExhaustedError as e:
+            print(f"⏸️ 묶음 검색 중 한도 도달: {e}")
+
+        print(f"🗺️ 주소 {len(addresses)}개 → 묶음 {self.stats['clusters']}개 "
+              f"(근처 검색 {self.stats['search_calls']}번으로 {self.stats['matched']}개 찾음)")
+
+    def _search_cluster(self, members):
+        """칸 하나: 영역 검색(여러 페이지) 후 주소마다 가장 가까운 후보 고르기"""
+        rect = self._get_rect(members)
+        candidates = []
+        meta = None
+        for page in range(1, self.max_pages + 1):
+            places, meta = self.kakao_api.search_in_rect(rect, self.query, page=page)
+            self.stats['search_calls'] += 1
+            if meta is None:
+                break  # 요청 실패 - 영역을 다 봤다고 할 수 없음
+            candidates.extend(places)
+            if meta.get('is_end', True):
+                break
+
+        # 응답을 제대로 받았고 영역 안 전체 장소를 후보로 다 받았을 때만 "근처 검색 끝"
+        # (is_end는 넘겨볼 수 있는 45곳까지만 기준이라 total_count와 비교해요)
+        complete = (meta is not None and 'total_count' in meta
+                    and len(candidates) >= meta['total_count'])
+
+        self.stats['clusters'] += 1
+        self.stats['clustered_rows'] += len(members)
+
+        for address, coords in members:
+            # 후보를 끝까지 다 봤고 영역이 근처 검색 반경을 다 덮을 때만 "근처 검색 끝"으로 표시
+            # (요청이 실패했거나 후보가 남았거나 margin이 작으면 평소 근처 검색도 함)
+            if complete and self.margin >= NEARBY_RADIUS:
+                self.checked.add(address)
+            result = self._match(address, coords, candidates)
+            if result:
+                self.results[address] = result
+                self.stats['matched'] += 1
+
+    def _get_rect(self, members):
+        """묶음 주소를 모두 덮는 영역 + margin"""
+        lats = [coords['lat'] for _, coords in members]
+        lngs = [coords['lng'] for _, coords in members]
+        lat_margin = self.margin / METERS_PER_DEGREE
+        lng_margin = self.margin / (METERS_PER_DEGREE * math.cos(math.radians(sum(lats) / len(lats))))
+        return (min(lngs) - lng_margin, min(lats) - lat_margin,
+                max(lngs) + lng_margin, max(lats) + lat_margin)
+
+    def _match(self, address, coords, candidates):
+        """후보 중 반경 안, 전화번호 있고 주소가 비슷한 가장 가까운 곳 (KakaoAPI 2단계와 같은 기준)"""
+        best = None
+        best_distance = None
+
+        for place in candidates:
+            phone = (place.get('phone') or '').strip()
+            place_address = (place.get('address_name') or '').strip()
+            if not phone or not self.kakao_api._is_address_similar(address, place_address):
+                continue
+
+            try:
+                distance = get_distance(coords, {'lat': float(place['y']), 'lng': float(place['x'])})
+            except (KeyError, TypeError, ValueError):
+                continue
+
+            if distance > NEARBY_RADIUS:
+                continue
+            if best is None or distance < best_distance:
+                best, best_distance = place, distance
+
+        if not best:
+            return None
+
+        return {
+            'place_name': (best.get('place_name') or '').strip(),
+            'phone': best['phone'].strip(),
+            'address': best['address_name'].strip(),
+            'category': best.get('category_name', ''),
+            'match_type': 'exact_location'
+        }
+
+    def lookup(self, address):
+        """
+        LookupScheduler용 검색 함수
+        묶음 검색으로 찾았으면 호출 없이 결과를, 근처를 이미 봤으면 바로 키워드 검색으로
+        """
+        if address in self.results:
+            return dict(self.results[address])
+        return self.kakao_api.find_contact_info(address, nearby_checked=address in self.checked)
+
+    def format_stats(self):
+        """로그용 한 줄"""
+        return (f"🗺️ 묶음 검색: {self.stats['clustered_rows']}개 주소를 {self.stats['clusters']}개 묶음으로, "
+                f"근처 검색 {self.stats['search_calls']}번으로 {self.stats['matched']}개 찾음")
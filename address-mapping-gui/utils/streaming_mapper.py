@@ -0,0 +1,335 @@
+# utils/streaming_mapper.py
+# 아주 큰 엑셀을 읽기 → 검색 → 쓰기 단계로 흘려보내며 처리
+# - 읽기(parse) → 정리/중복(dedupe) → 저장된 결과 확인(cache) → 검색(lookup) → 쓰기(sink)
+# - 단계 사이 큐 크기가 정해져 있어서 검색이 느리면 읽기도 같이 기다려요
+#   → 10만 행짜리 파일도 메모리에 다 올리지 않고, 쓴 행은 바로 파일로 나가요
+# - 결과 파일의 행 순서는 처리가 끝난 순서예요 (원래 순서는 '순번' 컬럼으로 정렬)
+
+import threading
+import time
+from collections import OrderedDict
+
+from utils.api_errors import (TransientAPIError, ContactNotFoundError, QuotaExhaustedError,
+                              ProviderUnavailableError)
+from utils.admin_areas import get_default_index
+from utils.lookup_scheduler import (FAILURE_NOT_FOUND, FAILURE_INVALID, FAILURE_SKIPPED, FAILURE_TRANSIENT,
+                                    FAILURE_ERROR)
+from utils.offline_geocoder import normalize_address_key
+from utils.pipeline import Pipeline, Stage
+
+STORE_BATCH_SIZE = 1000  # 결과 저장소에 한 번에 넣는 행 수
+KNOWN_RESULTS_SIZE = 20000  # 중복 확인용으로 기억하는 최근 주소 결과 수 (넘으면 오래된 것부터 잊음)
+
+# 중복 행에 복사하는 결과 항목 (행 전체 대신 이것만 기억)
+RESULT_FIELDS = ('status', 'place_name', 'phone', 'category', 'error', 'failure_reason', 'confidence',
+                 'prefilled')
+
+
+class StreamingMapper:
+    """엑셀 파일 하나를 단계별 파이프라인으로 처리"""
+
+    def __init__(self, excel_handler, lookup_func, results_store=None, negative_store=None,
+                 lookup_workers=1, queue_size=200, max_attempts=3, base_delay=2.0, max_delay=60.0,
+                 max_unavailable=900):
+        """
+        lookup_func: 주소 → 연락처 dict (예: KakaoAPI.find_contact_info, MatchVerifier.wrap(...))
+        lookup_workers: 검색 단계 스레드 수 (호출 간격은 API 쪽 RateLimiter가 지켜요)
+        queue_size: 단계마다 대기할 수 있는 최대 행 수
+        max_attempts / base_delay / max_delay: 일시 오류 재시도 (LookupScheduler와 같은 규칙)
+        max_unavailable: API가 이 시간(초) 넘게 막혀 있으면 남은 행은 대기중으로 두고 멈춤
+        """
+        self.excel_handler = excel_handler
+        self.lookup_func = lookup_func
+        self.results_store = results_store
+        self.negative_store = negative_store
+        self.lookup_workers = lookup_workers
+        self.queue_size = queue_size
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_unavailable = max_unavailable
+
+        self.pipeline = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def run(self, input_path, output_path, on_stats=None, should_stop=None):
+        """
+        input_path를 읽어 output_path에 결과 쓰기
+        on_stats(stage_stats, stats): 1초마다 단계별 큐 상태 + 지금까지 결과
+        should_stop(): True가 되면 새 행은 검색하지 않고, 남은 행은 끝까지 읽어서 대기중으로 씀
+        반환: stats (LookupScheduler와 같은 키 + 'cached')
+        """
+        self._stop_event.clear()
+        self.stats = {'processed': 0, 'success': 0, 'error': 0, 'retried': 0, 'skipped': 0,
+                      'duplicates': 0, 'invalid': 0, 'cached': 0, 'paused': None}
+        self._next_id = 0
+        # 정규화된 주소 → 결과 항목 dict
+        # 최근 KNOWN_RESULTS_SIZE개만 기억해서 파일이 커져도 메모리는 일정 (잊은 주소는 결과 저장소가 받아줌)
+        self._known = OrderedDict()
+        self._in_flight = set()  # 첫 행이 아직 처리 중인 주소 (큐 크기만큼이라 작아요)
+        self._waiting = {}  # 정규화된 주소 → 첫 결과를 기다리는 중복 행들
+        self._store_batch = []
+        self._unavailable_since = None  # API가 막히기 시작한 시각 (검색 스레드들이 같이 봄)
+        self.writer = self.excel_handler.open_result_stream(output_path)
+        self._should_stop = should_stop
+
+        self.pipeline = Pipeline([
+            Stage('parse', self._parse, queue_size=self.queue_size),
+            Stage('dedupe', self._dedupe, queue_size=self.queue_size),
+            Stage('cache', self._probe_cache, queue_size=self.queue_size),
+            Stage('lookup', self._lookup, workers=self.lookup_workers, queue_size=self.queue_size),
+            Stage('sink', self._sink, queue_size=self.queue_size)
+        ])
+
+        report = None
+        if on_stats:
+            def report(stage_stats):
+                on_stats(stage_stats, dict(self.stats))
+
+        # 행정구역 색인은 미리 만들기 (실패하면 행마다 삼키지 않고 바로 오류)
+        get_default_index()
+
+        print(f"🚰 단계별 처리 시작: {input_path}")
+        try:
+            self.pipeline.run(self.excel_handler.iter_sheet_rows(input_path),
+                              on_stats=report, should_stop=self._stopped, drain_to='sink')
+        finally:
+            # 첫 행이 오류로 빠져서 결과를 못 받은 중복 행은 대기중으로 씀
+            for waiting in self._waiting.values():
+                for addr in waiting:
+                    self._write(addr)
+            self._waiting = {}
+            self._flush_store()
+            self.writer.close()
+            if self.negative_store:
+                try:
+                    self.negative_store.save()
+                except OSError as e:
+                    print(f"⚠️ 결과 없음 기록 저장 실패: {e}")
+
+        return self.stats
+
+    def get_stage_stats(self):
+        """지금 단계별 큐 상태 (실행 전이면 빈 목록)"""
+        return self.pipeline.get_stats() if self.pipeline else []
+
+    def _stopped(self):
+        """한도 도달 또는 사용자 멈춤 요청"""
+        return self._stop_event.is_set() or bool(self._should_stop and self._should_stop())
+
+    def _remember(self, key, result):
+        """주소 결과 기억 (넘치면 오래된 것부터 잊음)"""
+        self._known[key] = result
+        self._known.move_to_end(key)
+        if len(self._known) > KNOWN_RESULTS_SIZE:
+            self._known.popitem(last=False)
+
+    # ----- 단계들 -----
+
+    def _parse(self, values, emit):
+        """엑셀 한 행 → 주소 데이터 (순번은 읽은 순서대로)"""
+        self._next_id += 1
+        try:
+            addr = self.excel_handler.make_address(values, self._next_id)
+        except Exception as e:
+            print(f"   ⚠️ {self._next_id + 1}행 처리 중 오류: {e}")
+            return
+        if addr:
+            emit(addr)
+
+    def _dedupe(self, addr, emit):
+        """행정구역 확인에서 걸린 행은 바로 쓰기로, 같은 주소는 첫 행 결과를 기다리게"""
+        if addr.get('invalid_address'):
+            addr['status'] = '실패'
+            addr['error'] = f"주소 확인 필요: {addr['address_note']}"
+            addr['failure_reason'] = FAILURE_INVALID
+            with self._lock:
+                self.stats['invalid'] += 1
+            emit(addr, to='sink')
+            return
+
+        key = normalize_address_key(addr['address'])
+        addr['address_key'] = key
+        with self._lock:
+            if key in self._in_flight:
+                # 첫 행이 아직 처리 중 → 그 결과가 나오면 같이 씀
+                self.stats['duplicates'] += 1
+                self._waiting.setdefault(key, []).append(addr)
+                return
+            result = self._known.get(key)
+            if result is not None:
+                self.stats['duplicates'] += 1
+                self._known.move_to_end(key)
+            else:
+                self._in_flight.add(key)
+
+        if result is not None:
+            self._apply_result(addr, result)
+            addr['duplicate'] = True
+            emit(addr, to='sink')
+            return
+
+        emit(addr)
+
+    def _probe_cache(self, addr, emit):
+        """저장된 결과 / 결과 없음 기록이 있으면 검색 없이 바로 쓰기로"""
+        if self.results_store:
+            found = self.results_store.find(addr['address'])
+            if found:
+                addr['place_name'] = found['place_name']
+                addr['phone'] = found['phone']
+                addr['category'] = found['category']
+                addr['status'] = '성공'
+                addr['error'] = None
+                addr['prefilled'] = True
+                with self._lock:
+                    self.stats['cached'] += 1
+                emit(addr, to='sink')
+                return
+
+        if self.negative_store:
+            retry_after = self.negative_store.get_retry_after(addr['address'])
+            if retry_after:
+                addr['status'] = '실패'
+                addr['error'] = f"최근에 찾지 못한 주소예요 (재검색 가능일: {retry_after})"
+                addr['failure_reason'] = FAILURE_SKIPPED
+                with self._lock:
+                    self.stats['skipped'] += 1
+                emit(addr, to='sink')
+                return
+
+        emit(addr)
+
+    def _lookup(self, addr, emit):
+        """API 검색 (일시 오류는 이 자리에서 기다렸다가 재시도 → 뒤 단계도 자연스럽게 느려짐)"""
+        if self._stopped():
+            # 한도가 찼거나 멈춘 뒤에 들어온 행은 검색하지 않고 대기중으로 남김
+            emit(addr)
+            return
+
+        address = addr['address']
+        attempt = 0
+        while attempt < self.max_attempts:
+            attempt += 1
+            try:
+                contact_info = self.lookup_func(address)
+                self._unavailable_since = None
+                if self.negative_store:
+                    self.negative_store.remove(address)
+                addr['place_name'] = contact_info['place_name']
+                addr['phone'] = contact_info['phone']
+                addr['category'] = contact_info.get('category', '')
+                addr['confidence'] = contact_info.get('confidence_label', '')
+                addr['status'] = '성공'
+                addr['error'] = None
+                addr['failure_reason'] = None
+                break
+
+            except QuotaExhaustedError as e:
+                with self._lock:
+                    if not self.stats['paused']:
+                        self.stats['paused'] = str(e)
+                        print(f"⏸️ {e} → 남은 주소는 대기중으로 두고 멈춰요")
+                self._stop_event.set()
+                break
+
+            except ProviderUnavailableError as e:
+                # 요청을 보내지 않았으니 시도 횟수는 그대로 두고 회복을 기다림 (이 스레드가 멈추면 앞 단계도 멈춤)
+                attempt -= 1
+                with self._lock:
+                    if self._unavailable_since is None:
+                        self._unavailable_since = time.time()
+                        print(f"🔌 {e} → 회복될 때까지 기다려요")
+                    elif time.time() - self._unavailable_since > self.max_unavailable and not self.stats['paused']:
+                        self.stats['paused'] = str(e)
+                        print(f"⏸️ {self.max_unavailable // 60}분 넘게 응답이 없어서 남은 행은 대기중으로 두고 멈춰요")
+                if self.stats['paused']:
+                    self._stop_event.set()
+                    break
+                time.sleep(min(max(e.retry_after, 0.2), 1.0))
+                continue
+
+            except TransientAPIError as e:
+                if attempt < self.max_attempts:
+                    delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+                    with self._lock:
+                        self.stats['retried'] += 1
+                    print(f"   🔁 일시 오류, {delay:.1f}초 뒤 재시도 ({attempt}/{self.max_attempts}): {e}")
+                    time.sleep(delay)
+                    continue
+                addr['status'] = '실패'
+                addr['error'] = f"{e} ({attempt}회 시도)"
+                addr['failure_reason'] = FAILURE_TRANSIENT
+
+            except ContactNotFoundError as e:
+                self._unavailable_since = None
+                if self.negative_store:
+                    self.negative_store.add(address, str(e))
+                addr['status'] = '실패'
+                addr['error'] = str(e)
+                addr['failure_reason'] = FAILURE_NOT_FOUND
+                break
+
+            except Exception as e:
+                addr['status'] = '실패'
+                addr['error'] = str(e)
+                addr['failure_reason'] = FAILURE_ERROR
+                break
+
+        emit(addr)
+
+    def _sink(self, addr, emit):
+        """결과 파일에 쓰고, 이 결과를 기다리던 중복 행도 같이 씀"""
+        self._write(addr)
+
+        key = addr.get('address_key')
+        if key is None or addr.get('duplicate'):
+            return
+
+        with self._lock:
+            self._in_flight.discard(key)
+            if addr['status'] != '대기중':
+                # 대기중(한도 도달로 검색 못 함)은 기억하지 않아서 뒤에 오는 같은 주소도 다시 확인
+                self._remember(key, {field: addr[field] for field in RESULT_FIELDS if field in addr})
+            waiting = self._waiting.pop(key, [])
+
+        for duplicate in waiting:
+            self._apply_result(duplicate, addr)
+            self._write(duplicate)
+
+    def _write(self, addr):
+        """한 행 쓰기 + 통계 + 결과 저장소 묶음"""
+        self.writer.write(addr)
+
+        with self._lock:
+            if addr['status'] == '성공':
+                self.stats['success'] += 1
+                self.stats['processed'] += 1
+            elif addr['status'] == '실패':
+                self.stats['error'] += 1
+                self.stats['processed'] += 1
+
+        if self.results_store and addr['status'] in ('성공', '실패') and not addr.get('prefilled'):
+            self._store_batch.append(addr)
+            if len(self._store_batch) >= STORE_BATCH_SIZE:
+                self._flush_store()
+
+    def _flush_store(self):
+        """모아둔 결과를 결과 저장소에 넣기"""
+        if self.results_store and self._store_batch:
+            self.results_store.add_run(self._store_batch, source=self.writer.file_path)
+        self._store_batch = []
+
+    def _apply_result(self, addr, result):
+        """첫 행의 결과를 같은 주소의 다른 행에 복사"""
+        for field in RESULT_FIELDS:
+            if field in result:
+                addr[field] = result[field]
+
+    @staticmethod
+    def format_progress(stage_stats, stats):
+        """로그용 한 줄: 단계별 큐 상태 + 결과"""
+        return (f"{Pipeline.format_stats(stage_stats)}\n"
+                f"   → 완료 {stats['processed']}개 (성공 {stats['success']}, 실패 {stats['error']}, "
+                f"저장된 결과 {stats['cached']}, 중복 {stats['duplicates']})")
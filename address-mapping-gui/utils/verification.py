@@ -0,0 +1,146 @@
+# utils/verification.py
+# 찾은 연락처가 정말 그 주소의 것인지 신뢰도 매기기
+# - 정확한 좌표 매칭 + 번지까지 같으면 "높음" → 추가 호출 없음
+# - 근처 검색으로 찾은 결과처럼 약한 매칭만 추가 확인
+#   (네이버 교차 확인, 없으면 카카오 좁은 반경(100m) 재검색)
+# - 확인되면 신뢰도를 올리고, 아니면 "낮음"으로 엑셀에 표시
+
+import re
+from collections import Counter
+
+from utils.offline_geocoder import STREET_NUMBER_PATTERN, normalize_street_number
+from utils.api_errors import TransientAPIError, QuotaExhaustedError
+
+CONFIDENCE_LABELS = {'high': '높음', 'medium': '보통', 'low': '낮음'}
+
+HIGH_SCORE = 0.8
+LOW_SCORE = 0.5  # 이 점수보다 낮으면 추가 확인
+CONFIRM_BONUS = 0.3  # 다른 검색으로도 같은 전화번호가 나오면 더하는 점수
+TIGHT_RADIUS = 100  # 좁은 반경 재검색 (m)
+
+
+def get_street_number(address):
+    """주소 끝의 번지 ("온천동 871-95번지" → "871-95", 없으면 None)"""
+    parts = address.split()
+    if parts and STREET_NUMBER_PATTERN.match(parts[-1]):
+        return normalize_street_number(parts[-1])
+    return None
+
+
+def get_phone_digits(phone):
+    """전화번호 숫자만 ("051-123-4567" → "0511234567")"""
+    return re.sub(r'\D', '', phone or '')
+
+
+def get_confidence_tier(score):
+    """점수 → 'high' / 'medium' / 'low'"""
+    if score >= HIGH_SCORE:
+        return 'high'
+    if score >= LOW_SCORE:
+        return 'medium'
+    return 'low'
+
+
+def score_match(address, contact_info):
+    """
+    검색 결과의 신뢰도 점수 (0~1)
+    - 좌표 근처에서 주소가 비슷한 곳(exact_location)이면 기본 0.7, 근처 키워드 검색이면 0.3
+    - 찾은 곳 주소에 같은 동이 있으면 +0.1
+    - 번지까지 같으면 +0.2 (본번만 같으면 +0.1)
+    """
+    score = 0.7 if contact_info.get('match_type') == 'exact_location' else 0.3
+    found_address = contact_info.get('address') or ''
+
+    parts = address.split()
+    if len(parts) >= 3 and parts[2] in found_address:
+        score += 0.1
+
+    street_number = get_street_number(address)
+    found_number = get_street_number(found_address)
+    if street_number and found_number:
+        if street_number == found_number:
+            score += 0.2
+        elif street_number.split('-')[0] == found_number.split('-')[0]:
+            score += 0.1
+
+    return round(min(score, 1.0), 2)
+
+
+class MatchVerifier:
+    """약한 매칭만 추가 호출로 확인하는 검증 단계"""
+
+    def __init__(self, kakao_api, naver_api=None, threshold=LOW_SCORE):
+        """
+        kakao_api: 좁은 반경 재검색에 사용 (KakaoAPI)
+        naver_api: 있으면 먼저 네이버로 교차 확인 (NaverAPI)
+        threshold: 이 점수보다 낮은 결과만 추가 확인
+        """
+        self.kakao_api = kakao_api
+        self.naver_api = naver_api
+        self.threshold = threshold
+        self.stats = {'checked': 0, 'confirmed': 0, 'extra_calls': 0, 'tiers': Counter()}
+
+    def wrap(self, lookup_func):
+        """검색 함수에 검증 단계 붙이기 (LookupScheduler에 그대로 넘길 수 있음)"""
+        def lookup_and_verify(address):
+            return self.verify(address, lookup_func(address))
+        return lookup_and_verify
+
+    def verify(self, address, contact_info):
+        """contact_info에 'confidence'(점수), 'confidence_label'(높음/보통/낮음) 추가"""
+        score = score_match(address, contact_info)
+
+        if score < self.threshold:
+            self.stats['checked'] += 1
+            if self._confirm(address, contact_info):
+                self.stats['confirmed'] += 1
+                score = round(min(score + CONFIRM_BONUS, 1.0), 2)
+
+        tier = get_confidence_tier(score)
+        self.stats['tiers'][tier] += 1
+        contact_info['confidence'] = score
+        contact_info['confidence_label'] = CONFIDENCE_LABELS[tier]
+        return contact_info
+
+    def _confirm(self, address, contact_info):
+        """다른 검색으로도 같은 전화번호가 나오는지 확인"""
+        phone = get_phone_digits(contact_info.get('phone'))
+        place_name = contact_info.get('place_name') or ''
+        if not phone or not place_name:
+            return False
+
+        try:
+            if self.naver_api and self._confirm_with_naver(address, place_name, phone):
+                return True
+            return self._confirm_nearby(address, place_name, phone)
+        except (TransientAPIError, QuotaExhaustedError):
+            # 확인용 호출이 실패해도 찾은 결과는 그대로 두고 신뢰도만 낮게
+            return False
+
+    def _confirm_with_naver(self, address, place_name, phone):
+        """네이버에서 '동 + 업체명'으로 검색해서 같은 전화번호인지"""
+        parts = address.split()
+        area = parts[2] if len(parts) >= 3 else address
+        self.stats['extra_calls'] += 1
+        result = self.naver_api._search_by_query(f"{area} {place_name}")
+        return bool(result) and get_phone_digits(result.get('telephone')) == phone
+
+    def _confirm_nearby(self, address, place_name, phone):
+        """카카오 좁은 반경에서 업체명으로 다시 검색해서 같은 전화번호인지"""
+        calls_before = self.kakao_api.call_count
+        try:
+            coords = self.kakao_api.get_coordinates(address)
+            if not coords:
+                return False
+
+            places = self.kakao_api.search_nearby(coords, place_name, radius=TIGHT_RADIUS)
+            return any(get_phone_digits(place.get('phone')) == phone for place in places)
+        finally:
+            self.stats['extra_calls'] += self.kakao_api.call_count - calls_before
+
+    def format_stats(self):
+        """로그용 한 줄"""
+        tiers = self.stats['tiers']
+        return (f"🎯 신뢰도 높음 {tiers['high']}개 / 보통 {tiers['medium']}개 / 낮음 {tiers['low']}개 "
+                f"(약한 매칭 {self.stats['checked']}개 추가 확인, {self.stats['confirmed']}개 확인됨, "
+                f"추가 호출 {self.stats['extra_calls']}번)")
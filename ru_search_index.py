@@ -0,0 +1,272 @@
+# ru_search_index.py
+# 회선선번장 RU 검색용 파이썬 검색 서비스
+# - 엑셀을 한 번만 읽어서 필드별 글자 n-gram 역색인(inverted index)을 만들고
+# - 필드 지정 부분 문자열 검색 + 페이지 나누기를 몇 ms 안에 처리해요
+# - PWA(index.html)가 HTTP로 부르거나, 미리 만든 색인 파일을 받아서 쓸 수 있어요
+#
+# 사용법:
+#   python ru_search_index.py search 선번장.xlsx 온천동 --field RU_NAME
+#   python ru_search_index.py export 선번장.xlsx ru_index.json
+#   python ru_search_index.py serve 선번장.xlsx --port 8765
+
+import argparse
+import json
+import time
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pandas as pd
+
+# 색인을 만드는 필드 (PWA 필터 버튼과 같은 이름)
+INDEX_FIELDS = ['RU_NAME', 'RU_ID', 'DU_NAME', 'MUX', 'CH', 'CARD', 'PORT', 'serial']
+
+NGRAM_SIZE = 2
+
+
+def make_grams(text):
+    """값 → 글자 1-gram + 2-gram 집합 (1글자 검색도 색인으로 처리)"""
+    grams = set(text)
+    grams.update(text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1))
+    return grams
+
+
+def load_workbook_rows(file_path, sheet_name=0):
+    """선번장 엑셀 → (컬럼 리스트, 행 리스트) (PWA처럼 빈 행은 제외)"""
+    df = pd.read_excel(file_path, sheet_name=sheet_name, dtype=str)
+    df.columns = [str(column).strip() for column in df.columns]
+    df = df.dropna(how='all').fillna('')
+
+    columns = list(df.columns)
+    rows = [
+        [value.strip() for value in row]
+        for row in df.itertuples(index=False, name=None)
+    ]
+    return columns, rows
+
+
+class RUSearchIndex:
+    """선번장 n-gram 역색인"""
+
+    def __init__(self, columns, rows, fields=None):
+        self.columns = columns
+        self.rows = rows
+
+        # 엑셀 헤더 대소문자가 달라도 찾을 수 있게 (serial / SERIAL)
+        lower_columns = {column.lower(): i for i, column in enumerate(columns)}
+        self.field_positions = {}
+        for field in fields or INDEX_FIELDS:
+            if field.lower() in lower_columns:
+                self.field_positions[field] = lower_columns[field.lower()]
+
+        self.postings = {}  # {필드: {gram: array('I', [행 번호...])}}
+        self._lower_values = {}  # {필드: [소문자 값...]} (후보 확인용)
+        self._build()
+
+    @classmethod
+    def from_workbook(cls, file_path, sheet_name=0, fields=None):
+        """엑셀 파일로 색인 만들기"""
+        started = time.perf_counter()
+        columns, rows = load_workbook_rows(file_path, sheet_name)
+        index = cls(columns, rows, fields)
+        elapsed = time.perf_counter() - started
+        print(f"📇 {len(rows)}행 색인 완료 ({elapsed:.1f}초, 필드: {', '.join(index.field_positions)})")
+        return index
+
+    def _build(self):
+        """필드별 역색인 만들기 (행 번호는 오름차순으로 쌓임)"""
+        for field, position in self.field_positions.items():
+            postings = {}
+            values = []
+
+            for row_id, row in enumerate(self.rows):
+                value = row[position].lower()
+                values.append(value)
+                for gram in make_grams(value):
+                    posting = postings.get(gram)
+                    if posting is None:
+                        posting = postings[gram] = array('I')
+                    posting.append(row_id)
+
+            self.postings[field] = postings
+            self._lower_values[field] = values
+
+    def _search_field(self, field, query):
+        """필드 하나에서 검색 → 맞는 행 번호 리스트 (오름차순)"""
+        postings = self.postings[field]
+
+        # 2글자 이상이면 2-gram만 보면 돼요 (1-gram은 2-gram에 포함됨)
+        if len(query) >= NGRAM_SIZE:
+            grams = {query[i:i + NGRAM_SIZE] for i in range(len(query) - NGRAM_SIZE + 1)}
+        else:
+            grams = {query}
+
+        # 가장 짧은 목록 하나만 후보로 쓰고 나머지는 실제 값으로 확인
+        # (교집합을 만드는 것보다 부분 문자열 확인이 더 빨라요)
+        shortest = None
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                return []
+            if shortest is None or len(posting) < len(shortest):
+                shortest = posting
+
+        if len(query) <= NGRAM_SIZE:
+            return list(shortest)
+
+        values = self._lower_values[field]
+        return [row_id for row_id in shortest if query in values[row_id]]
+
+    def search(self, query, field='all', page=1, page_size=50):
+        """
+        부분 문자열 검색 (대소문자 무시)
+        field: 'all' 이면 색인된 모든 필드, 아니면 필드 이름
+        반환: {'total', 'page', 'page_size', 'columns', 'items', 'elapsed_ms'}
+        """
+        started = time.perf_counter()
+        query = query.lower().strip()
+
+        if not query:
+            matched = []
+        elif field == 'all':
+            found = set()
+            for name in self.field_positions:
+                found.update(self._search_field(name, query))
+            matched = sorted(found)
+        elif field in self.field_positions:
+            matched = self._search_field(field, query)
+        else:
+            raise ValueError(f"색인되지 않은 필드예요: {field}")
+
+        page = max(1, int(page))
+        start = (page - 1) * page_size
+        items = [
+            dict(zip(self.columns, self.rows[row_id]))
+            for row_id in matched[start:start + page_size]
+        ]
+
+        return {
+            'total': len(matched),
+            'page': page,
+            'page_size': page_size,
+            'columns': self.columns,
+            'items': items,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    def export(self, file_path):
+        """
+        PWA가 바로 불러 쓸 수 있는 색인 파일(JSON) 저장
+        행 번호 목록은 앞 번호와의 차이로 저장해서 크기를 줄여요
+        """
+        postings = {}
+        for field, field_postings in self.postings.items():
+            encoded = {}
+            for gram, posting in field_postings.items():
+                previous = 0
+                deltas = []
+                for row_id in posting:
+                    deltas.append(row_id - previous)
+                    previous = row_id
+                encoded[gram] = deltas
+            postings[field] = encoded
+
+        data = {
+            'version': 1,
+            'ngram': NGRAM_SIZE,
+            'columns': self.columns,
+            'fields': self.field_positions,
+            'rows': self.rows,
+            'postings': postings
+        }
+
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+        print(f"💾 색인 파일 저장 완료: {file_path}")
+
+
+def make_handler(index):
+    """검색 요청을 처리하는 HTTP 핸들러 클래스 만들기"""
+
+    class SearchHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != '/search':
+                self._send_json(404, {'error': 'not found'})
+                return
+
+            params = parse_qs(url.query)
+            try:
+                result = index.search(
+                    params.get('q', [''])[0],
+                    field=params.get('field', ['all'])[0],
+                    page=int(params.get('page', ['1'])[0]),
+                    page_size=min(500, int(params.get('size', ['50'])[0]))
+                )
+                self._send_json(200, result)
+            except ValueError as e:
+                self._send_json(400, {'error': str(e)})
+
+        def _send_json(self, status, data):
+            body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            # PWA(다른 주소)에서 부를 수 있게
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return SearchHandler
+
+
+def serve(index, host='127.0.0.1', port=8765):
+    """검색 서버 실행 (GET /search?q=...&field=RU_NAME&page=1&size=50)"""
+    server = ThreadingHTTPServer((host, port), make_handler(index))
+    print(f"🌐 RU 검색 서버 실행 중: http://{host}:{port}/search?q=검색어")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 검색 서버를 종료해요")
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="회선선번장 RU 검색 색인")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    search_parser = subparsers.add_parser('search', help="명령줄에서 검색")
+    search_parser.add_argument('workbook')
+    search_parser.add_argument('query')
+    search_parser.add_argument('--field', default='all')
+    search_parser.add_argument('--page', type=int, default=1)
+
+    export_parser = subparsers.add_parser('export', help="PWA용 색인 파일 만들기")
+    export_parser.add_argument('workbook')
+    export_parser.add_argument('output')
+
+    serve_parser = subparsers.add_parser('serve', help="검색 서버 실행")
+    serve_parser.add_argument('workbook')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+
+    args = parser.parse_args()
+    index = RUSearchIndex.from_workbook(args.workbook)
+
+    if args.command == 'search':
+        result = index.search(args.query, field=args.field, page=args.page)
+        print(f"🔍 {result['total']}건 ({result['elapsed_ms']}ms)")
+        for item in result['items']:
+            print("   " + " | ".join(f"{key}={value}" for key, value in item.items() if value))
+    elif args.command == 'export':
+        index.export(args.output)
+    else:
+        serve(index, args.host, args.port)
+
+if __name__ == "__main__":
+    main()
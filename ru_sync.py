@@ -0,0 +1,414 @@
+# ru_sync.py
+# 회선선번장 데이터를 작게, 바뀐 부분만 받아가도록 만드는 내보내기/동기화 도구
+# - 엑셀 → 버전이 붙은 컬럼형 스냅샷 (반복되는 DU/MUX 값은 사전(dictionary)으로 압축)
+# - 버전 사이의 행 단위 변경분(delta) 저장
+# - ETag로 "바뀐 게 없으면 304" 응답하는 로컬 서버 (테스트용 대역 서버로 충분)
+#
+# 사용법:
+#   python ru_sync.py publish 선번장.xlsx            # 새 버전 만들기 (바뀐 게 없으면 그대로)
+#   python ru_sync.py serve --port 8766              # GET /manifest, /snapshot, /delta?since=버전
+#   python ru_sync.py pull http://127.0.0.1:8766     # 파이썬 클라이언트로 받아보기
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import urllib.error
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from ru_search_index import load_workbook_rows
+
+DEFAULT_STORE_DIR = "ru_sync_data"
+DEFAULT_KEY_COLUMN = "RU_ID"
+
+# 고유값이 행 수의 이 비율보다 적으면 사전 압축
+DICTIONARY_RATIO = 0.5
+
+
+def make_row_keys(columns, rows, key_column=DEFAULT_KEY_COLUMN):
+    """
+    행마다 고유 키 만들기
+    키 컬럼(RU_ID) 값이 모두 있고 겹치지 않으면 그 값을, 아니면 행 내용 해시를 사용
+    """
+    if key_column in columns:
+        position = columns.index(key_column)
+        keys = [row[position] for row in rows]
+        if all(keys) and len(set(keys)) == len(keys):
+            return keys
+
+    keys = []
+    seen = {}
+    for row in rows:
+        key = hashlib.sha1("\x1f".join(row).encode('utf-8')).hexdigest()[:16]
+        # 완전히 같은 행이 여러 개면 순번 붙이기
+        count = seen.get(key, 0)
+        seen[key] = count + 1
+        keys.append(key if count == 0 else f"{key}#{count}")
+    return keys
+
+
+def encode_columns(columns, rows):
+    """행 리스트 → 컬럼형 데이터 (반복 값이 많은 컬럼은 사전 + 코드)"""
+    data = {}
+    for position, column in enumerate(columns):
+        values = [row[position] for row in rows]
+        unique = list(dict.fromkeys(values))
+
+        if rows and len(unique) <= len(rows) * DICTIONARY_RATIO:
+            codes = {value: code for code, value in enumerate(unique)}
+            data[column] = {'dict': unique, 'codes': [codes[value] for value in values]}
+        else:
+            data[column] = {'values': values}
+    return data
+
+
+def decode_columns(columns, data, row_count):
+    """컬럼형 데이터 → 행 리스트"""
+    decoded = []
+    for column in columns:
+        encoded = data[column]
+        if 'dict' in encoded:
+            dictionary = encoded['dict']
+            decoded.append([dictionary[code] for code in encoded['codes']])
+        else:
+            decoded.append(encoded['values'])
+    return [[values[i] for values in decoded] for i in range(row_count)]
+
+
+def write_json_gz(file_path, data):
+    """gzip으로 압축한 JSON 저장"""
+    temp_path = file_path + ".tmp"
+    with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temp_path, file_path)
+
+
+def read_json_gz(file_path):
+    """gzip JSON 읽기"""
+    with gzip.open(file_path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class RUSyncStore:
+    """버전별 스냅샷/변경분 저장소 (최신 스냅샷 + 모든 연속 변경분 보관)"""
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR):
+        self.store_dir = store_dir
+        os.makedirs(os.path.join(store_dir, 'deltas'), exist_ok=True)
+        self.manifest_path = os.path.join(store_dir, 'manifest.json')
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        """버전 정보 읽기"""
+        if not os.path.exists(self.manifest_path):
+            return {'latest': 0, 'etag': None, 'history': []}
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_manifest(self):
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.manifest_path)
+
+    @property
+    def snapshot_path(self):
+        return os.path.join(self.store_dir, 'snapshot.json.gz')
+
+    def delta_path(self, version):
+        """version-1 → version 변경분 파일 경로"""
+        return os.path.join(self.store_dir, 'deltas', f'delta-{version}.json.gz')
+
+    def load_snapshot(self):
+        """최신 스냅샷 (없으면 None)"""
+        if not self.manifest['latest']:
+            return None
+        return read_json_gz(self.snapshot_path)
+
+    def publish(self, columns, rows, key_column=DEFAULT_KEY_COLUMN):
+        """
+        새 데이터를 새 버전으로 저장 (바뀐 게 없으면 기존 버전 그대로)
+        반환: 변경 요약 dict
+        """
+        keys = make_row_keys(columns, rows, key_column)
+        new_rows = dict(zip(keys, rows))
+
+        previous = self.load_snapshot()
+        added, changed, removed = [], [], []
+
+        if previous and previous['columns'] == columns:
+            old_rows = dict(zip(previous['keys'],
+                                decode_columns(columns, previous['data'], len(previous['keys']))))
+            for key, row in new_rows.items():
+                if key not in old_rows:
+                    added.append(key)
+                elif old_rows[key] != row:
+                    changed.append(key)
+            removed = [key for key in old_rows if key not in new_rows]
+
+            if not (added or changed or removed):
+                print(f"✅ 바뀐 행이 없어요 (버전 {self.manifest['latest']} 유지)")
+                return {'version': self.manifest['latest'], 'added': 0, 'changed': 0, 'removed': 0}
+        elif previous:
+            # 컬럼 구성이 바뀌면 변경분 대신 새 스냅샷만 (클라이언트는 전체를 다시 받음)
+            print("⚠️ 컬럼 구성이 바뀌어서 전체 스냅샷을 새로 만들어요")
+            self.manifest['history'].append({'version': self.manifest['latest'], 'reset': True})
+
+        version = self.manifest['latest'] + 1
+        snapshot = {
+            'format': 'ru-snapshot',
+            'version': version,
+            'key_column': key_column,
+            'columns': columns,
+            'keys': keys,
+            'data': encode_columns(columns, rows)
+        }
+        write_json_gz(self.snapshot_path, snapshot)
+
+        if previous and previous['columns'] == columns:
+            write_json_gz(self.delta_path(version), {
+                'from': version - 1,
+                'to': version,
+                'upserts': [[key, new_rows[key]] for key in added + changed],
+                'removed': removed
+            })
+
+        with open(self.snapshot_path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:12]
+
+        self.manifest['latest'] = version
+        self.manifest['etag'] = f'"{version}-{digest}"'
+        self.manifest['columns'] = columns
+        self.manifest['history'].append({
+            'version': version,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'rows': len(rows),
+            'added': len(added),
+            'changed': len(changed),
+            'removed': len(removed)
+        })
+        self._save_manifest()
+
+        print(f"📦 버전 {version} 저장: {len(rows)}행 (추가 {len(added)}, 변경 {len(changed)}, 삭제 {len(removed)})")
+        return {'version': version, 'added': len(added), 'changed': len(changed), 'removed': len(removed)}
+
+    def build_delta(self, since):
+        """
+        since 버전 → 최신 버전 변경분 (연속 변경분을 합쳐서)
+        중간에 컬럼 구성이 바뀌었거나 기록이 없으면 None (전체 스냅샷을 받아야 함)
+        """
+        latest = self.manifest['latest']
+        if since < 1 or since > latest:
+            return None
+
+        resets = {entry['version'] for entry in self.manifest['history'] if entry.get('reset')}
+        merged = {}
+        for version in range(since + 1, latest + 1):
+            if version - 1 in resets or not os.path.exists(self.delta_path(version)):
+                return None
+
+            delta = read_json_gz(self.delta_path(version))
+            for key, row in delta['upserts']:
+                merged[key] = row
+            for key in delta['removed']:
+                merged[key] = None
+
+        return {
+            'format': 'ru-delta',
+            'from': since,
+            'to': latest,
+            'columns': self.manifest['columns'],
+            'upserts': [[key, row] for key, row in merged.items() if row is not None],
+            'removed': [key for key, row in merged.items() if row is None]
+        }
+
+
+def make_handler(store):
+    """동기화 HTTP 핸들러 클래스 만들기"""
+
+    class SyncHandler(BaseHTTPRequestHandler):
+        def do_OPTIONS(self):
+            self.send_response(204)
+            self._send_cors_headers()
+            self.end_headers()
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            store.manifest = store._load_manifest()
+            latest = store.manifest['latest']
+
+            if url.path == '/manifest':
+                self._send_json(200, {'latest': latest, 'etag': store.manifest['etag'],
+                                      'history': store.manifest['history'][-20:]})
+                return
+
+            if not latest:
+                self._send_json(404, {'error': '아직 게시된 버전이 없어요'})
+                return
+
+            if url.path == '/snapshot':
+                etag = store.manifest['etag']
+                if self.headers.get('If-None-Match') == etag:
+                    self._send_not_modified(etag)
+                    return
+                self._send_json(200, store.load_snapshot(), etag)
+                return
+
+            if url.path == '/delta':
+                try:
+                    since = int(parse_qs(url.query).get('since', ['0'])[0])
+                except ValueError:
+                    since = 0
+
+                etag = f'"{since}-{latest}"'
+                if since == latest:
+                    self._send_not_modified(etag)
+                    return
+
+                delta = store.build_delta(since)
+                if delta is None:
+                    # 너무 오래된 버전 → 전체 스냅샷을 받으라고 알림
+                    self._send_json(410, {'error': 'snapshot required', 'latest': latest})
+                    return
+                self._send_json(200, delta, etag)
+                return
+
+            self._send_json(404, {'error': 'not found'})
+
+        def _send_cors_headers(self):
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Allow-Headers', 'If-None-Match')
+            self.send_header('Access-Control-Expose-Headers', 'ETag')
+
+        def _send_not_modified(self, etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self._send_cors_headers()
+            self.end_headers()
+
+        def _send_json(self, status, data, etag=None):
+            body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            use_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+            if use_gzip:
+                body = gzip.compress(body)
+
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-cache')
+            if use_gzip:
+                self.send_header('Content-Encoding', 'gzip')
+            if etag:
+                self.send_header('ETag', etag)
+            self._send_cors_headers()
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return SyncHandler
+
+
+def serve(store, host='127.0.0.1', port=8766):
+    """동기화 서버 실행"""
+    server = ThreadingHTTPServer((host, port), make_handler(store))
+    print(f"🌐 선번장 동기화 서버 실행 중: http://{host}:{port} (최신 버전 {store.manifest['latest']})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 동기화 서버를 종료해요")
+    finally:
+        server.server_close()
+
+
+class RUSyncClient:
+    """동기화 서버에서 바뀐 부분만 받아오는 파이썬 클라이언트 (PWA와 같은 방식)"""
+
+    def __init__(self, base_url, cache_path="ru_sync_cache.json.gz"):
+        self.base_url = base_url.rstrip('/')
+        self.cache_path = cache_path
+
+    def _get(self, path, etag=None):
+        """GET 요청 → (상태 코드, JSON 또는 None)"""
+        request = urllib.request.Request(self.base_url + path, headers={'Accept-Encoding': 'gzip'})
+        if etag:
+            request.add_header('If-None-Match', etag)
+
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                body = response.read()
+                if response.headers.get('Content-Encoding') == 'gzip':
+                    body = gzip.decompress(body)
+                return response.status, json.loads(body.decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+    def sync(self):
+        """
+        로컬 캐시를 최신으로 맞추기
+        반환: (컬럼 리스트, {키: 행}, 받은 방식 'cached' / 'delta' / 'snapshot')
+        """
+        cache = read_json_gz(self.cache_path) if os.path.exists(self.cache_path) else None
+
+        if cache:
+            status, delta = self._get(f"/delta?since={cache['version']}")
+            if status == 304:
+                return cache['columns'], cache['rows'], 'cached'
+            if status == 200 and delta['columns'] == cache['columns']:
+                for key, row in delta['upserts']:
+                    cache['rows'][key] = row
+                for key in delta['removed']:
+                    cache['rows'].pop(key, None)
+                cache['version'] = delta['to']
+                write_json_gz(self.cache_path, cache)
+                return cache['columns'], cache['rows'], 'delta'
+
+        status, snapshot = self._get("/snapshot")
+        if status != 200:
+            raise Exception(f"스냅샷을 받을 수 없어요 (HTTP {status})")
+
+        rows = decode_columns(snapshot['columns'], snapshot['data'], len(snapshot['keys']))
+        cache = {
+            'version': snapshot['version'],
+            'columns': snapshot['columns'],
+            'rows': dict(zip(snapshot['keys'], rows))
+        }
+        write_json_gz(self.cache_path, cache)
+        return cache['columns'], cache['rows'], 'snapshot'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="회선선번장 버전/변경분 동기화")
+    parser.add_argument('--store', default=DEFAULT_STORE_DIR, help="버전 저장 폴더")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    publish_parser = subparsers.add_parser('publish', help="엑셀로 새 버전 만들기")
+    publish_parser.add_argument('workbook')
+    publish_parser.add_argument('--key', default=DEFAULT_KEY_COLUMN, help="행 고유 키 컬럼")
+
+    serve_parser = subparsers.add_parser('serve', help="동기화 서버 실행")
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8766)
+
+    pull_parser = subparsers.add_parser('pull', help="서버에서 받아오기 (테스트용)")
+    pull_parser.add_argument('url')
+    pull_parser.add_argument('--cache', default="ru_sync_cache.json.gz")
+
+    args = parser.parse_args()
+
+    if args.command == 'publish':
+        columns, rows = load_workbook_rows(args.workbook)
+        RUSyncStore(args.store).publish(columns, rows, args.key)
+    elif args.command == 'serve':
+        serve(RUSyncStore(args.store), args.host, args.port)
+    else:
+        columns, rows, mode = RUSyncClient(args.url, args.cache).sync()
+        print(f"📥 {len(rows)}행 ({mode})")
+
+if __name__ == "__main__":
+    main()